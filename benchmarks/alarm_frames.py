@@ -0,0 +1,133 @@
+"""Frame times of the FinalTimerApp alarm animation, old path against new.
+
+The old path is the 50 ms QTimer step that read the overlay alpha back
+out of styleSheet() and set a new stylesheet every frame. It is kept
+here, and only here, for comparison. The new path drives the
+BrightnessOverlay.alpha and RotatableLabel.rotation properties, and
+both are painted directly. Each frame advances the animation by 50 ms
+and then processes events, so the re-polish and repaint are included.
+The property path is run twice: once drawing the label text on every
+frame, and once rotating RotatableLabel's cached pixmap. The label's
+own paint time comes from its debug counters.
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/alarm_frames.py
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication, QWidget
+
+from final_timer import FinalTimerApp, RotatableLabel, ALARM_FRAME_MS as FRAME_MS
+
+
+class StylesheetAlarm:
+    """FinalTimerApp.animate_alarm as it used to be, without the beep."""
+
+    def __init__(self, window):
+        self.window = window
+        self.overlay = QWidget(window)
+        self.overlay.setStyleSheet("background-color: rgba(255, 255, 255, 0);")
+        self.overlay.resize(window.size())
+        self.overlay.show()
+        self.brightness_direction = 1
+        self.angle_direction = 1
+
+    def step(self):
+        current_alpha = self.overlay.styleSheet().split(',')[3].replace(');', '').strip()
+        alpha = int(current_alpha)
+        if alpha >= 80: self.brightness_direction = -1
+        if alpha <= 0: self.brightness_direction = 1
+        alpha += 30 * self.brightness_direction
+        self.overlay.setStyleSheet(f"background-color: rgba(255, 255, 255, {alpha});")
+
+        angle = self.window.time_label.rotation_angle
+        if angle > 15: self.angle_direction = -1
+        if angle < -15: self.angle_direction = 1
+        angle += 9 * self.angle_direction
+        self.window.time_label.setRotation(angle)
+
+    def stop(self):
+        self.overlay.deleteLater()
+        self.window.time_label.setRotation(0)
+
+
+class PropertyAlarm:
+    """The current animation, with the frame timer replaced by a fixed 50 ms step."""
+
+    def __init__(self, window):
+        self.window = window
+        window.trigger_alarm()
+        window.alarm_frame_timer.stop()
+        self.elapsed = 0
+
+    def step(self):
+        self.elapsed += FRAME_MS
+        for animation in self.window.alarm_animations:
+            animation.setCurrentTime(self.elapsed)
+
+    def stop(self):
+        self.window.dismiss_alarm()
+
+
+def measure(alarm, frames):
+    app = QApplication.instance()
+    app.processEvents()
+    label = alarm.window.time_label
+    label.reset_paint_stats()
+    times = []
+    for _ in range(frames):
+        started = time.perf_counter_ns()
+        alarm.step()
+        app.processEvents()
+        times.append(time.perf_counter_ns() - started)
+    label_stats = label.paint_stats()
+    alarm.stop()
+    app.processEvents()
+    times.sort()
+    return {
+        'label_paint_mean_ms': label_stats['paint_mean_ms'],
+        'label_cache_misses': label_stats['cache_misses'],
+        'frames': frames,
+        'mean_ms': sum(times) / len(times) / 1e6,
+        'p50_ms': times[len(times) // 2] / 1e6,
+        'p95_ms': times[int(len(times) * 0.95)] / 1e6,
+        'max_ms': times[-1] / 1e6,
+    }
+
+
+def run(frames=400):
+    window = FinalTimerApp()
+    window.show()
+    window.set_preset_time(5)
+    window.setup_alarm_state()
+    QApplication.processEvents()
+    RotatableLabel.cache_text = False
+    result = {
+        'stylesheet': measure(StylesheetAlarm(window), frames),
+        'property_uncached': measure(PropertyAlarm(window), frames),
+    }
+    RotatableLabel.cache_text = True
+    result['property'] = measure(PropertyAlarm(window), frames)
+    result['speedup'] = result['stylesheet']['mean_ms'] / result['property']['mean_ms']
+    result['label_speedup'] = (result['property_uncached']['label_paint_mean_ms']
+                               / result['property']['label_paint_mean_ms'])
+    window.close()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=400)
+    args = parser.parse_args(argv)
+    app = QApplication.instance() or QApplication(sys.argv[:1])  # widgets need a live application
+    print(json.dumps(run(args.frames), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""Compressed files in Notepad: streaming open and recompressing save.
+
+Generates --size-mb of log text, compresses it with each available codec
+(gzip always, zstd when zstandard is installed) and reports per codec:
+
+  open_mb_per_s    Notepad.open_paths until the tab has finished loading,
+                   in MB of decompressed text per second
+  save_mb_per_s    Notepad._save_to_path(wait=True), recompressing
+  load_peak_ratio  Python memory held at the peak of ChunkedFileLoader,
+                   over the size of the decoded text it handed out
+  save_peak_mb     Python memory allocated at once by AtomicFileWriter on
+                   top of the text snapshot it was given
+  ratio            decompressed / compressed size
+
+"passed" is false when loading held more than --max-load-ratio times the
+text or saving allocated more than --max-save-mb, i.e. when either one
+stopped streaming.
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/compressed_io.py --size-mb 64
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+
+from notepad import Notepad, ChunkedFileLoader, AtomicFileWriter, writer_pool
+from notepad_compress import open_compressed
+from notepad_encoding import DEFAULT_FORMAT
+from notepad_io import generate_file, wait_until
+
+MB = 1024 * 1024
+SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+
+
+def available_codecs():
+    codecs = ['gzip']
+    try:
+        import zstandard  # noqa: F401
+        codecs.append('zstd')
+    except ImportError:
+        pass
+    return codecs
+
+
+def compress_file(source, path, compression):
+    with open(source, 'rb') as src, open(path, 'wb') as f:
+        out = open_compressed(f, compression)
+        shutil.copyfileobj(src, out, MB)
+        out.close()
+
+
+def load_peak(path):
+    """(peak bytes, decoded text bytes) for one load on this thread, keeping every chunk like the editor does."""
+    chunks = []
+    loader = ChunkedFileLoader(path)
+    loader.signals.chunk.connect(lambda text: (chunks.append(text), loader.chunk_consumed()))
+    tracemalloc.start()
+    loader.run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, sum(sys.getsizeof(chunk) for chunk in chunks)
+
+
+def save_peak(path, text, fmt):
+    tracemalloc.start()
+    job = AtomicFileWriter(path, text, fmt)
+    job.run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    if job.error is not None:
+        raise OSError(job.error)
+    return peak
+
+
+def measure(directory, source, compression):
+    path = os.path.join(directory, "bench.log" + SUFFIXES[compression])
+    compress_file(source, path, compression)
+    size = os.path.getsize(source) / MB
+    result = {'ratio': os.path.getsize(source) / os.path.getsize(path)}
+
+    window = Notepad()
+    window.show()
+    started = time.perf_counter()
+    window.open_paths([path])
+    editor = window.tab_widget.currentWidget()
+    wait_until(lambda: editor.property("loader") is None)
+    result['open_mb_per_s'] = size / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    window._save_to_path(path, editor, wait=True)
+    result['save_mb_per_s'] = size / (time.perf_counter() - started)
+    QApplication.processEvents()
+    window.hide()
+    window.deleteLater()
+    QApplication.processEvents()
+
+    peak, text_bytes = load_peak(path)
+    result['load_peak_ratio'] = peak / text_bytes
+    with open(source, encoding='utf-8') as f:
+        text = f.read()
+    fmt = DEFAULT_FORMAT._replace(newline='\n', compression=compression)
+    result['save_peak_mb'] = save_peak(os.path.join(directory, "saved" + SUFFIXES[compression]), text, fmt) / MB
+    return result
+
+
+def run(size_mb=32, max_load_ratio=1.5, max_save_mb=16):
+    directory = tempfile.mkdtemp(prefix="notepad-bench-")
+    try:
+        source = os.path.join(directory, "bench.log")
+        generate_file(source, size_mb * MB)
+        results = {compression: measure(directory, source, compression) for compression in available_codecs()}
+    finally:
+        writer_pool().waitForDone()
+        shutil.rmtree(directory, ignore_errors=True)
+    results['size_mb'] = size_mb
+    results['passed'] = all(result['load_peak_ratio'] <= max_load_ratio and result['save_peak_mb'] <= max_save_mb
+                            for result in results.values() if isinstance(result, dict))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size-mb', type=int, default=32)
+    parser.add_argument('--max-load-ratio', type=float, default=1.5)
+    parser.add_argument('--max-save-mb', type=float, default=16)
+    args = parser.parse_args(argv)
+    app = QApplication.instance() or QApplication(sys.argv[:1])  # widgets need a live application
+    result = run(args.size_mb, args.max_load_ratio, args.max_save_mb)
+    print(json.dumps(result, indent=2))
+    return 0 if result['passed'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
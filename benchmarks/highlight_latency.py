@@ -0,0 +1,149 @@
+"""Keystroke latency in a 1M-line log, with and without highlighting.
+
+Puts --lines lines of the notepad_io synthetic log into an editor tab of
+a shown Notepad window, names it .log so it gets the log highlighter (or
+turns Notepad.syntax_highlighting off), scrolls to the middle and types
+--keys keystrokes, an Enter every 40. Each keystroke is timed from the
+key event to the end of the repaint it causes. Both modes are measured
+--repeats times, alternating, in a fresh window each time. Reports per
+mode, over all repeats:
+
+  attach_ms     giving the tab its .log path, which attaches the highlighter
+  mean_ms       keystroke latency
+  median_ms
+  p95_ms
+  paint_mean_ms one editor repaint while typing
+  highlighted   blocks the highlighter has formatted by the end
+  caught_up     whether the typed lines were highlighted again once typing
+                paused for ViewportHighlighter.TYPING_PAUSE_MS
+
+"passed" is false when highlighting makes the median keystroke more than
+--tolerance (fraction) slower than plain, or the typed lines stayed plain
+after the pause. Means of single runs move by a millisecond or more
+between runs (a stray slow repaint is enough), hence the medians.
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/highlight_latency.py
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import Qt, QEvent
+from PyQt5.QtGui import QTextCursor
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication
+
+from notepad import Notepad
+from notepad_highlight import HIGHLIGHTED, ViewportHighlighter
+
+
+def make_text(lines):
+    levels = ['INFO', 'INFO', 'DEBUG', 'WARN', 'INFO', 'ERROR']
+    return ''.join(f"2024-05-{n % 28 + 1:02d} 12:{n % 60:02d}:07.{n % 1000:03d} {levels[n % 6]} worker-{n % 8} "
+                   f"요청 처리 완료 id={n:07d} elapsed={n * 3 % 997}ms path=\"/api/v1/items/{n % 500}\"\n"
+                   for n in range(lines))
+
+
+def measure(text, highlighting, keys):
+    app = QApplication.instance()
+    window = Notepad()
+    window.syntax_highlighting = highlighting
+    window.resize(1000, 700)
+    window.show()
+    editor = window.add_new_tab(content=text)
+    app.processEvents()
+
+    started = time.perf_counter()
+    window.set_file_path(editor, os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench.log"))
+    app.processEvents()
+    attach_ms = (time.perf_counter() - started) * 1000
+
+    cursor = QTextCursor(editor.document().findBlockByNumber(editor.document().blockCount() // 2))
+    editor.setTextCursor(cursor)
+    editor.centerCursor()
+    app.processEvents()
+
+    editor.init_stats()
+    samples = []
+    for n in range(keys):
+        key = Qt.Key_Return if n % 40 == 39 else Qt.Key_A + n % 26
+        started = time.perf_counter()
+        QTest.keyClick(editor, key)
+        app.processEvents()
+        samples.append((time.perf_counter() - started) * 1000)
+
+    # The line being typed is highlighted again once typing pauses
+    deadline = time.perf_counter() + ViewportHighlighter.TYPING_PAUSE_MS / 1000 + 0.5
+    while time.perf_counter() < deadline:
+        app.processEvents()
+        time.sleep(0.005)
+    highlighter = editor.property("highlighter")
+    caught_up = editor.textCursor().block().previous().userState() == HIGHLIGHTED if highlighter else None
+
+    result = {
+        'attach_ms': attach_ms,
+        'samples': samples,
+        'paint_ms': editor.paint_ns / 1e6,
+        'paint_count': editor.paint_count,
+        'highlighted': highlighter.highlighted_blocks if highlighter is not None else 0,
+        'caught_up': caught_up,
+    }
+    # Skip the save prompts of closeEvent; nothing here is worth keeping
+    editor.document().setModified(False)
+    window.hide()
+    window.deleteLater()
+    # processEvents() leaves deferred deletes to the event loop, which never runs here;
+    # without this every repeat keeps its window and its copy of the text
+    app.sendPostedEvents(None, QEvent.DeferredDelete)
+    return result
+
+
+def summary(runs):
+    samples = sorted(sample for run in runs for sample in run['samples'])
+    return {
+        'attach_ms': statistics.median(run['attach_ms'] for run in runs),
+        'mean_ms': sum(samples) / len(samples),
+        'median_ms': statistics.median(samples),
+        'p95_ms': samples[int(len(samples) * 0.95)],
+        'paint_mean_ms': sum(run['paint_ms'] for run in runs) / max(sum(run['paint_count'] for run in runs), 1),
+        'highlighted': runs[-1]['highlighted'],
+    }
+
+
+def run(lines=1000000, keys=400, tolerance=0.25, repeats=5):
+    text = make_text(lines)
+    plain, highlighted = [], []
+    for _ in range(repeats):
+        plain.append(measure(text, False, keys))
+        highlighted.append(measure(text, True, keys))
+    caught_up = all(run['caught_up'] for run in highlighted)
+    plain, highlighted = summary(plain), summary(highlighted)
+    highlighted['caught_up'] = caught_up
+    return {
+        'lines': lines,
+        'plain': plain,
+        'highlighted': highlighted,
+        'passed': highlighted['median_ms'] <= plain['median_ms'] * (1 + tolerance) and highlighted['caught_up'],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, default=1000000)
+    parser.add_argument('--keys', type=int, default=400)
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args(argv)
+    app = QApplication.instance() or QApplication(sys.argv[:1])  # widgets need a live application
+    result = run(args.lines, args.keys, args.tolerance, args.repeats)
+    print(json.dumps(result, indent=2))
+    return 0 if result['passed'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
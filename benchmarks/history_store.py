@@ -0,0 +1,102 @@
+"""ModernTimer history store: batched writes, TOTAL lookups and CSV export.
+
+Records --years of generated history (--runs-per-day runs, each with
+--laps laps) through timer_history.TimerHistory and reports:
+
+  record_per_s     runs queued and committed by the writer thread, per second
+  record_call_us   one TimerHistory.record() call on the GUI thread
+  today_total_us   TimerHistory.today_seconds(), called once per timer tick
+  range_total_ms   total_seconds() over the whole range, from the aggregates
+  export_rows_per_s
+  export_peak_kb   Python memory allocated at once while exporting
+
+"passed" is false when the export held more than --max-export-kb at once,
+i.e. when it stopped streaming.
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/history_store.py --years 3
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QCoreApplication
+
+from timer_history import TimerHistory, connect, total_seconds, export_csv, day_of
+
+DAY_SECONDS = 24 * 3600
+
+
+def run(years=3, runs_per_day=100, laps=4, max_export_kb=1024):
+    directory = tempfile.mkdtemp(prefix="timer-bench-")
+    try:
+        path = os.path.join(directory, "history.sqlite3")
+        history = TimerHistory(path)
+        labels = ['', '공부', '운동', '독서']
+        first = time.time() - years * 365 * DAY_SECONDS
+        runs = years * 365 * runs_per_day
+
+        started = time.perf_counter()
+        for n in range(runs):
+            started_at = first + n * DAY_SECONDS / runs_per_day
+            seconds = 60 + n % 1800
+            history.record(labels[n % len(labels)], started_at, seconds,
+                           [seconds * (k + 1) / (laps + 1) for k in range(laps)], started_at + seconds)
+        queued = time.perf_counter() - started
+        history.close()
+        record_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in range(1000):
+            history.today_seconds()
+        today_total_us = (time.perf_counter() - started) * 1000
+
+        conn = connect(path)
+        started = time.perf_counter()
+        total = total_seconds(conn, day_of(first), day_of(time.time()))
+        range_total_ms = (time.perf_counter() - started) * 1000
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        rows = export_csv(conn, os.path.join(directory, "export.csv"))
+        export_s = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        conn.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return {
+        'runs': runs,
+        'record_per_s': runs / record_s,
+        'record_call_us': queued / runs * 1e6,
+        'today_total_us': today_total_us,
+        'range_total_ms': range_total_ms,
+        'range_total_hours': total / 3600,
+        'export_rows': rows,
+        'export_rows_per_s': rows / export_s,
+        'export_peak_kb': peak / 1024,
+        'passed': peak / 1024 <= max_export_kb,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--years', type=int, default=3)
+    parser.add_argument('--runs-per-day', type=int, default=100)
+    parser.add_argument('--laps', type=int, default=4)
+    parser.add_argument('--max-export-kb', type=float, default=1024)
+    args = parser.parse_args(argv)
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])  # signals of the writer thread
+    result = run(args.years, args.runs_per_day, args.laps, args.max_export_kb)
+    print(json.dumps(result, indent=2))
+    return 0 if result['passed'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
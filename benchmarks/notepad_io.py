@@ -0,0 +1,137 @@
+"""Notepad file throughput: add_new_tab, open and save on generated files.
+
+Files of each size are generated once into a temporary directory. Each
+one is a synthetic log: mostly ASCII with some Korean, about 90 bytes a
+line. For every size this reports MB/s for:
+
+  add_new_tab  putting already-decoded text into a new editor tab
+  open         Notepad.open_paths (what open_file calls after its dialog)
+               until the tab has finished loading; files at or above
+               Notepad.viewer_threshold open in the viewer, so this is the
+               time until their line index is complete
+  save         Notepad._save_to_path(wait=True), the atomic write
+
+Sizes above --max-editor-mb skip add_new_tab and save, which would need
+the whole text in memory several times over.
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/notepad_io.py --sizes 1,16,64
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+
+from notepad import Notepad, is_viewer, writer_pool
+
+MB = 1024 * 1024
+DEFAULT_SIZES_MB = [1, 16, 64]
+FULL_SIZES_MB = [1, 16, 64, 256, 1024]
+
+
+def generate_file(path, size):
+    lines = [f"2024-05-{day:02d} 12:{minute:02d}:07.{minute * 7 % 1000:03d} INFO  worker-{minute % 8} "
+             f"요청 처리 완료 id={day * 1000 + minute:07d} elapsed={minute * 3 % 997}ms\n"
+             for day in range(1, 29) for minute in range(60)]
+    block = ''.join(lines).encode('utf-8')
+    with open(path, 'wb') as f:
+        written = 0
+        while written + len(block) <= size:
+            f.write(block)
+            written += len(block)
+        # Cut the tail on a line boundary so the file stays valid UTF-8
+        tail = block[:size - written]
+        f.write(tail[:tail.rfind(b'\n') + 1])
+
+
+def wait_until(condition, timeout=600):
+    app = QApplication.instance()
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError("benchmark step did not finish")
+        app.processEvents()
+        time.sleep(0.001)
+
+
+def measure_size(directory, size_mb, max_editor_mb):
+    path = os.path.join(directory, f"bench-{size_mb}mb.log")
+    if not os.path.exists(path):
+        generate_file(path, size_mb * MB)
+    size = os.path.getsize(path) / MB
+    result = {'file_mb': size}
+
+    window = Notepad()
+    window.show()
+
+    started = time.perf_counter()
+    window.open_paths([path])
+    widget = window.tab_widget.currentWidget()
+    if is_viewer(widget):
+        wait_until(lambda: widget.index.complete)
+        result['open_mode'] = 'viewer'
+    else:
+        wait_until(lambda: widget.property("loader") is None)
+        result['open_mode'] = 'editor'
+    result['open_mb_per_s'] = size / (time.perf_counter() - started)
+
+    if size_mb <= max_editor_mb:
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        started = time.perf_counter()
+        editor = window.add_new_tab(content=text)
+        QApplication.processEvents()
+        result['add_new_tab_mb_per_s'] = size / (time.perf_counter() - started)
+        del text
+
+        save_path = os.path.join(directory, f"saved-{size_mb}mb.log")
+        started = time.perf_counter()
+        window._save_to_path(save_path, editor, wait=True)
+        result['save_mb_per_s'] = size / (time.perf_counter() - started)
+        QApplication.processEvents()
+        os.remove(save_path)
+
+    # Skip the save prompts of closeEvent; nothing here is worth keeping
+    for i in range(window.tab_widget.count()):
+        if is_viewer(window.tab_widget.widget(i)):
+            window.tab_widget.widget(i).close_file()
+    window.hide()
+    window.deleteLater()
+    QApplication.processEvents()
+    return result
+
+
+def run(sizes_mb=DEFAULT_SIZES_MB, max_editor_mb=256, directory=None):
+    owned = directory is None
+    directory = directory or tempfile.mkdtemp(prefix="notepad-bench-")
+    try:
+        results = {f"{size_mb}MB": measure_size(directory, size_mb, max_editor_mb) for size_mb in sizes_mb}
+    finally:
+        writer_pool().waitForDone()
+        if owned:
+            shutil.rmtree(directory, ignore_errors=True)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES_MB)),
+                        help="comma-separated file sizes in MB (default: %(default)s)")
+    parser.add_argument('--full', action='store_true', help="sizes from 1 MB to 1 GB")
+    parser.add_argument('--max-editor-mb', type=int, default=256)
+    parser.add_argument('--dir', help="keep generated files here between runs")
+    args = parser.parse_args(argv)
+    sizes = FULL_SIZES_MB if args.full else [int(size) for size in args.sizes.split(',')]
+    app = QApplication.instance() or QApplication(sys.argv[:1])  # widgets need a live application
+    print(json.dumps(run(sizes, args.max_editor_mb, args.dir), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
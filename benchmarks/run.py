@@ -0,0 +1,195 @@
+"""Run the benchmark suites, write the results as JSON, and gate on a baseline.
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/run.py --output baseline.json
+    QT_QPA_PLATFORM=offscreen python benchmarks/run.py --compare baseline.json
+
+Suites:
+  notepad_io         add_new_tab / open / save throughput on generated files
+  alarm_frames       alarm animation and RotatableLabel.paintEvent frame times
+  timer_drift        TimingEngine drift over a simulated hour under load
+  session_restore    time until a restored 50-tab Notepad session is usable
+  highlight_latency  keystroke latency in a 1M-line log, highlighted and plain
+  history_store      ModernTimer history: batched writes, TOTAL lookups, CSV export
+  undo_memory        undo memory and latency, UndoHistory against Qt's own stack
+  compressed_io      gzip/zstd open and save throughput and peak memory
+  theme_switch       ModernTimer state switches, theme layer against per-widget stylesheets
+
+With --compare the run fails (exit status 1) when a gated metric is worse
+than the baseline by more than --threshold, as a fraction of the baseline.
+A suite reporting "passed": false also fails the run. Differences smaller
+than a metric's noise floor are never counted as regressions. --input
+compares a saved result file instead of running the suites again.
+"""
+import os
+import sys
+import json
+import time
+import fnmatch
+import argparse
+import platform
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SUITES = ['notepad_io', 'alarm_frames', 'timer_drift', 'session_restore', 'highlight_latency',
+          'history_store', 'undo_memory', 'compressed_io',
+          'theme_switch']
+
+HIGHER, LOWER = 1, -1
+
+# (metric pattern, better direction, noise floor in the metric's unit)
+GATES = [
+    ('notepad_io.*.open_mb_per_s', HIGHER, 0.5),
+    ('notepad_io.*.add_new_tab_mb_per_s', HIGHER, 0.5),
+    ('notepad_io.*.save_mb_per_s', HIGHER, 0.5),
+    ('alarm_frames.*.mean_ms', LOWER, 0.05),
+    ('alarm_frames.*.p95_ms', LOWER, 0.1),
+    ('alarm_frames.*.label_paint_mean_ms', LOWER, 0.05),
+    ('timer_drift.engine_drift_ms', LOWER, 1.0),
+    ('timer_drift.engine_display_error_s', LOWER, 0),
+    ('session_restore.restore_ms', LOWER, 20),
+    ('session_restore.usable_ms', LOWER, 50),
+    ('highlight_latency.highlighted.median_ms', LOWER, 0.3),
+    ('history_store.record_per_s', HIGHER, 1000),
+    ('history_store.today_total_us', LOWER, 1),
+    ('history_store.export_rows_per_s', HIGHER, 2000),
+    ('undo_memory.history.rss_growth_mb', LOWER, 4),
+    ('undo_memory.history.edit_ms', LOWER, 5),
+    ('undo_memory.history.key_ms', LOWER, 0.1),
+    ('compressed_io.*.open_mb_per_s', HIGHER, 0.5),
+    ('compressed_io.*.save_mb_per_s', HIGHER, 0.5),
+    ('compressed_io.*.load_peak_ratio', LOWER, 0.05),
+    ('theme_switch.new.switch_us', LOWER, 10),
+    ('theme_switch.new.theme_switch_ms', LOWER, 5),
+]
+
+
+def run_suites(names, quick):
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv[:1])  # must outlive the suites
+
+    suites = {}
+    for name in names:
+        started = time.perf_counter()
+        if name == 'notepad_io':
+            import notepad_io
+            suites[name] = notepad_io.run([1, 16] if quick else notepad_io.DEFAULT_SIZES_MB)
+        elif name == 'alarm_frames':
+            import alarm_frames
+            suites[name] = alarm_frames.run(100 if quick else 400)
+        elif name == 'timer_drift':
+            import timer_drift
+            suites[name] = timer_drift.run(duration=600 if quick else 3600)
+        elif name == 'session_restore':
+            import session_restore
+            suites[name] = session_restore.run(tabs=10 if quick else 50)
+        elif name == 'highlight_latency':
+            import highlight_latency
+            suites[name] = highlight_latency.run(lines=200000 if quick else 1000000)
+        elif name == 'history_store':
+            import history_store
+            suites[name] = history_store.run(years=1 if quick else 3)
+        elif name == 'undo_memory':
+            import undo_memory
+            suites[name] = undo_memory.run(size_mb=10 if quick else 40, edits=10 if quick else 20)
+        elif name == 'compressed_io':
+            import compressed_io
+            suites[name] = compressed_io.run(size_mb=8 if quick else 32)
+        elif name == 'theme_switch':
+            import theme_switch
+            suites[name] = theme_switch.run(timers=20 if quick else 50)
+        print(f"{name}: {time.perf_counter() - started:.1f} s", file=sys.stderr)
+    return suites
+
+
+def flatten(tree, prefix=''):
+    metrics = {}
+    for key, value in tree.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            metrics.update(flatten(value, name + '.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            metrics[name] = value
+    return metrics
+
+
+def gate_for(metric):
+    for pattern, direction, floor in GATES:
+        if fnmatch.fnmatchcase(metric, pattern):
+            return direction, floor
+    return None
+
+
+def compare(current, baseline, threshold):
+    """Returns a list of (metric, baseline, current, relative change) regressions."""
+    regressions = []
+    for metric, value in sorted(current['metrics'].items()):
+        gate = gate_for(metric)
+        old = baseline['metrics'].get(metric)
+        if gate is None or old is None:
+            continue
+        direction, floor = gate
+        worse_by = (old - value) if direction == HIGHER else (value - old)
+        if worse_by <= floor:
+            continue
+        relative = worse_by / abs(old) if old else float('inf')
+        if relative > threshold:
+            regressions.append((metric, old, value, relative))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('suites', nargs='*', metavar='SUITE', help="default: all of " + ', '.join(SUITES))
+    parser.add_argument('--quick', action='store_true', help="smaller files, fewer frames, shorter soak")
+    parser.add_argument('--output', help="write the results here as well as to stdout")
+    parser.add_argument('--input', help="compare this saved result instead of running")
+    parser.add_argument('--compare', metavar='BASELINE', help="fail on regressions against this result file")
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help="allowed relative regression (default: %(default)s)")
+    args = parser.parse_args(argv)
+    unknown = set(args.suites) - set(SUITES)
+    if unknown:
+        parser.error(f"unknown suite: {', '.join(sorted(unknown))}")
+
+    if args.input:
+        with open(args.input, encoding='utf-8') as f:
+            current = json.load(f)
+    else:
+        from PyQt5.QtCore import QT_VERSION_STR
+        suites = run_suites(args.suites or SUITES, args.quick)
+        current = {
+            'meta': {
+                'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'qt': QT_VERSION_STR,
+                'platform': platform.platform(),
+                'qpa': os.environ.get('QT_QPA_PLATFORM', ''),
+                'quick': args.quick,
+            },
+            'suites': suites,
+            'metrics': flatten(suites),
+        }
+        text = json.dumps(current, indent=2)
+        print(text)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(text + '\n')
+
+    failed = [name for name, suite in current['suites'].items() if suite.get('passed') is False]
+    for name in failed:
+        print(f"FAIL {name}: suite reported passed=false", file=sys.stderr)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        for metric, old, new, relative in regressions:
+            print(f"REGRESSION {metric}: {old:.4g} -> {new:.4g} ({relative:+.1%} worse)", file=sys.stderr)
+        if not regressions:
+            print(f"no regressions beyond {args.threshold:.0%} against {args.compare}", file=sys.stderr)
+        failed += regressions
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""Notepad session restore: time until a restored window is usable.
+
+Writes a session of --tabs files (each --file-kb, generated with the
+notepad_io log generator) and restores it into a new window. Reports:
+
+  restore_ms     Notepad.restore_session returning, with every tab in
+                 the tab bar
+  usable_ms      the current tab having finished loading
+  background_ms  the background prefetch having stopped, and how many
+                 tabs it loaded before the memory budget stopped it
+
+"passed" is false when usable_ms is above --max-usable-ms.
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/session_restore.py --tabs 50
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+
+from notepad import Notepad
+from notepad_editor import EditorMixin
+from notepad_session import save_session, load_session
+from notepad_io import generate_file, wait_until
+
+
+def run(tabs=50, file_kb=1024, max_usable_ms=1000, directory=None):
+    owned = directory is None
+    directory = directory or tempfile.mkdtemp(prefix="notepad-bench-")
+    try:
+        saved = []
+        for number in range(tabs):
+            path = os.path.join(directory, f"session-{number}.log")
+            if not os.path.exists(path):
+                generate_file(path, file_kb * 1024)
+            saved.append({'path': path, 'cursor': 1000, 'scroll': 10})
+        session_path = os.path.join(directory, "session.json")
+        save_session(session_path, [{'geometry': None, 'current': tabs // 2, 'tabs': saved}])
+
+        window = Notepad()
+        window.show()
+        started = time.perf_counter()
+        window.restore_session(load_session(session_path)[0])
+        restore_ms = (time.perf_counter() - started) * 1000
+        current = window.tab_widget.currentWidget()
+        wait_until(lambda: current.property("loader") is None)
+        usable_ms = (time.perf_counter() - started) * 1000
+
+        def background_done():
+            widgets = [window.tab_widget.widget(i) for i in range(window.tab_widget.count())]
+            return not window._prefetch and all(widget.property("loader") is None for widget in widgets)
+        wait_until(background_done)
+        background_ms = (time.perf_counter() - started) * 1000
+        loaded = sum(isinstance(window.tab_widget.widget(i), EditorMixin) for i in range(window.tab_widget.count()))
+
+        window.hide()
+        window.deleteLater()
+        QApplication.processEvents()
+    finally:
+        if owned:
+            shutil.rmtree(directory, ignore_errors=True)
+    return {
+        'tabs': tabs,
+        'file_kb': file_kb,
+        'restore_ms': restore_ms,
+        'usable_ms': usable_ms,
+        'background_ms': background_ms,
+        'background_loaded': loaded,
+        'passed': usable_ms <= max_usable_ms,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tabs', type=int, default=50)
+    parser.add_argument('--file-kb', type=int, default=1024)
+    parser.add_argument('--max-usable-ms', type=float, default=1000)
+    parser.add_argument('--dir', help="keep generated files here between runs")
+    args = parser.parse_args(argv)
+    app = QApplication.instance() or QApplication(sys.argv[:1])  # widgets need a live application
+    result = run(args.tabs, args.file_kb, args.max_usable_ms, args.dir)
+    print(json.dumps(result, indent=2))
+    return 0 if result['passed'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
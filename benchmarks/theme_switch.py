@@ -0,0 +1,154 @@
+"""ModernTimer state switches: per-widget stylesheets against the theme layer.
+
+Shows --timers ModernTimer windows at once and flips the start button of
+every one of them between running and paused --rounds times, processing
+events after each round so the re-polish and repaint are included. Both
+paths are measured --repeats times, alternating, and the medians kept.
+
+The old path is what toggle_timer used to do: a window-wide stylesheet on
+each timer and a freshly built stylesheet string on the button at every
+switch. It is kept here, and only here, for comparison. The new path is
+toggle_timer itself: one application stylesheet from timer_theme and a
+dynamic property flipped with set_state. Reports per path:
+
+  switch_us      one button state switch: the median round over the timers
+  round_ms       one round, all timers switched and repainted (median)
+
+and for the new path theme_switch_ms, switching all timers between the
+light and dark themes.
+
+"passed" is false when the new path is more than --tolerance (fraction)
+plus --floor-us slower per switch than the old one. Rounds of a few
+milliseconds vary by about a tenth between runs, hence the margin.
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/theme_switch.py --timers 50
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+
+from new_timer import ModernTimer
+import timer_theme
+
+BUTTON_CSS = "background-color: {}; color: white; font-size: 16px; border-radius: 5px; padding: 10px;"
+
+
+class StylesheetToggle:
+    """ModernTimer.toggle_timer as it used to be, on a timer dressed the old way."""
+
+    def __init__(self, window):
+        self.window = window
+        window.setStyleSheet("background-color: #fff;")
+        window.start_pause_btn.setStyleSheet(BUTTON_CSS.format('#4CAF50'))
+        window.lap_btn.setStyleSheet(BUTTON_CSS.format('#607d8b'))
+        window.reset_btn.setStyleSheet(BUTTON_CSS.format('#f44336'))
+
+    def toggle(self):
+        window = self.window
+        if not window.is_running:
+            window.timer.start()
+            window.is_running = True
+            window.start_pause_btn.setText('일시정지')
+            window.start_pause_btn.setStyleSheet(BUTTON_CSS.format('#ff9800'))
+        else:
+            window.timer.pause()
+            window.is_running = False
+            window.start_pause_btn.setText('계속')
+            window.start_pause_btn.setStyleSheet(BUTTON_CSS.format('#4CAF50'))
+
+
+def show_timers(count):
+    windows = []
+    for n in range(count):
+        window = ModernTimer()
+        window.move(20 * (n % 20), 20 * (n // 20))
+        window.show()
+        windows.append(window)
+    QApplication.processEvents()
+    return windows
+
+
+def close_timers(windows):
+    for window in windows:
+        window.timer.reset()
+        window.hide()
+        window.deleteLater()
+    QApplication.processEvents()
+
+
+def measure_rounds(toggles, rounds):
+    """Milliseconds of each round."""
+    app = QApplication.instance()
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for toggle in toggles:
+            toggle()
+        app.processEvents()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def summary(samples, timers):
+    round_ms = statistics.median(samples)
+    return {'switch_us': round_ms * 1000 / timers, 'round_ms': round_ms}
+
+
+def run(timers=50, rounds=40, repeats=3, tolerance=0.25, floor_us=20):
+    app = QApplication.instance()
+    previous = app.styleSheet()
+    old_samples, new_samples, theme_samples = [], [], []
+    try:
+        for _ in range(repeats):
+            windows = show_timers(timers)
+            # The old path never had an application stylesheet
+            app.setStyleSheet('')
+            old_samples += measure_rounds([StylesheetToggle(window).toggle for window in windows], rounds)
+            close_timers(windows)
+
+            windows = show_timers(timers)
+            new_samples += measure_rounds([window.toggle_timer for window in windows], rounds)
+            for name in ['dark', 'light'] * max(1, rounds // 8):
+                started = time.perf_counter()
+                timer_theme.apply_theme(name)
+                app.processEvents()
+                theme_samples.append((time.perf_counter() - started) * 1000)
+            close_timers(windows)
+    finally:
+        # Later suites share this application; leave it as it was
+        app.setStyleSheet(previous)
+    old = summary(old_samples, timers)
+    new = summary(new_samples, timers)
+    new['theme_switch_ms'] = statistics.median(theme_samples)
+    return {
+        'timers': timers,
+        'old': old,
+        'new': new,
+        'speedup': old['switch_us'] / new['switch_us'],
+        'passed': new['switch_us'] <= old['switch_us'] * (1 + tolerance) + floor_us,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--timers', type=int, default=50)
+    parser.add_argument('--rounds', type=int, default=40)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--floor-us', type=float, default=20)
+    args = parser.parse_args(argv)
+    app = QApplication.instance() or QApplication(sys.argv[:1])  # widgets need a live application
+    result = run(args.timers, args.rounds, args.repeats, args.tolerance, args.floor_us)
+    print(json.dumps(result, indent=2))
+    return 0 if result['passed'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""Soak test for timer_core.TimingEngine drift under event-loop load.
+
+By default one simulated hour runs in a few seconds: a fake clock jumps
+from tick to tick, and every timeout is delivered late by a random
+amount of synthetic load (mostly a few ms, sometimes hundreds of ms,
+occasionally a multi-second stall like a sleep/resume). --realtime N
+instead runs N real seconds on a real event loop kept busy by a
+CPU-burning timer, and checks the engine against an independent clock.
+
+The engine passes when its elapsed time is within --max-drift-ms of
+the reference at the end of the run. A naive counter that adds one
+second per timeout, the way the timers used to work, is run alongside
+for comparison.
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/timer_drift.py
+    python benchmarks/timer_drift.py --realtime 120
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QCoreApplication, QTimer, Qt
+
+from timer_core import TimingEngine, NS_PER_MS, NS_PER_SEC
+
+
+def load_delay_ns(rng):
+    """How late the event loop gets round to a due timer."""
+    roll = rng.random()
+    if roll < 0.80:
+        return int(rng.uniform(0, 5) * NS_PER_MS)
+    if roll < 0.99:
+        return int(rng.uniform(5, 200) * NS_PER_MS)
+    return int(rng.uniform(1000, 3000) * NS_PER_MS)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def simulate(duration_s, seed):
+    rng = random.Random(seed)
+    clock = FakeClock()
+    engine = TimingEngine(clock=clock)
+    engine.set_stopwatch()
+    engine.start()
+    end = duration_s * NS_PER_SEC
+    latencies = []
+    while clock.now < end:
+        due = clock.now - clock.now % NS_PER_MS + -(-engine.ns_until_next_tick() // NS_PER_MS) * NS_PER_MS
+        clock.now = due + load_delay_ns(rng)
+        latencies.append(clock.now - due)
+        engine.on_timeout()
+
+    # A repeating 1000 ms QTimer counting timeouts: Qt drops timeouts that are already overdue
+    rng = random.Random(seed)
+    now, due, count = 0, NS_PER_SEC, 0
+    while now < end:
+        now = due + load_delay_ns(rng)
+        count += 1
+        due += NS_PER_SEC
+        if due < now:
+            due = now + NS_PER_SEC
+
+    return {
+        'reference_ms': clock.now / NS_PER_MS,
+        'engine_ms': engine.elapsed_ms(),
+        'engine_display_error_s': engine.display_seconds() - clock.now // NS_PER_SEC,
+        'naive_drift_ms': now / NS_PER_MS - count * 1000,
+        'ticks': len(latencies),
+        'coalesced_ticks': engine.coalesced_ticks,
+        'tick_latency_p99_ms': sorted(latencies)[int(len(latencies) * 0.99)] / NS_PER_MS,
+        'tick_latency_max_ms': max(latencies) / NS_PER_MS,
+    }
+
+
+def run_realtime(duration_s, seed):
+    app = QCoreApplication.instance()
+    rng = random.Random(seed)
+    engine = TimingEngine()
+    engine.set_stopwatch()
+    naive = {'count': 0}
+    naive_timer = QTimer()
+    naive_timer.setTimerType(Qt.PreciseTimer)
+    naive_timer.timeout.connect(lambda: naive.__setitem__('count', naive['count'] + 1))
+    latencies = []
+
+    def on_tick():
+        latencies.append(engine.elapsed_ns() % NS_PER_SEC)
+
+    def burn():
+        busy_until = time.perf_counter_ns() + load_delay_ns(rng)
+        while time.perf_counter_ns() < busy_until:
+            pass
+
+    engine.tick.connect(on_tick)
+    load_timer = QTimer()
+    load_timer.timeout.connect(burn)
+    load_timer.start(7)
+
+    started = time.perf_counter_ns()
+    engine.start()
+    naive_timer.start(1000)
+    QTimer.singleShot(duration_s * 1000, app.quit)
+    app.exec_()
+    reference_ns = time.perf_counter_ns() - started
+    engine_ns = engine.elapsed_ns()
+
+    return {
+        'reference_ms': reference_ns / NS_PER_MS,
+        'engine_ms': engine_ns / NS_PER_MS,
+        'engine_display_error_s': engine.display_seconds() - reference_ns // NS_PER_SEC,
+        'naive_drift_ms': reference_ns / NS_PER_MS - naive['count'] * 1000,
+        'ticks': len(latencies),
+        'coalesced_ticks': engine.coalesced_ticks,
+        'tick_latency_p99_ms': sorted(latencies)[int(len(latencies) * 0.99)] / NS_PER_MS if latencies else None,
+        'tick_latency_max_ms': max(latencies) / NS_PER_MS if latencies else None,
+    }
+
+
+def run(duration=3600, seed=1, realtime=None, max_drift_ms=10.0):
+    if realtime:
+        result = run_realtime(realtime, seed)
+    else:
+        result = simulate(duration, seed)
+    result['mode'] = 'realtime' if realtime else 'simulated'
+    result['engine_drift_ms'] = abs(result['engine_ms'] - result['reference_ms'])
+    result['passed'] = result['engine_drift_ms'] < max_drift_ms and result['engine_display_error_s'] == 0
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--duration', type=int, default=3600, help="simulated seconds (default: one hour)")
+    parser.add_argument('--realtime', type=int, metavar='SECONDS', help="run on a real event loop instead")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--max-drift-ms', type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])  # timers need a live application
+    result = run(args.duration, args.seed, args.realtime, args.max_drift_ms)
+    print(json.dumps(result, indent=2))
+    return 0 if result['passed'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""Undo memory and latency: UndoHistory against QTextDocument's own undo stack.
+
+Loads --size-mb of generated log text into an editor, then deletes --edits
+blocks of --edit-mb each (less if that would take more than half the
+document; select and press Delete), types --keys keys in the middle, and
+undoes everything. Reports per mode:
+
+  undo_memory_mb  what the history holds in memory (UndoHistory only)
+  spilled_mb      compressed steps in its spill file (UndoHistory only)
+  rss_growth_mb   process RSS growth over the edits (Linux only, else null)
+  edit_ms         one block deletion
+  key_ms          one keystroke, median of KEY_ROUNDS rounds of --keys/KEY_ROUNDS
+  undo_ms         undoing one step, on average
+
+"passed" is false when the history holds more than its --budget-mb.
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/undo_memory.py
+"""
+import os
+import sys
+import json
+import time
+import statistics
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QTextCursor
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication
+
+from notepad_editor import PlainTextEditor
+from notepad_undo import UndoHistory, UndoBudget
+
+MB = 1024 * 1024
+# A single run of keystrokes swings by +-30% between runs; the median of a few does not
+KEY_ROUNDS = 5
+
+
+def make_text(size):
+    line = "2024-05-01 12:00:07.123 INFO worker-3 요청 처리 완료 id={:07d} path=\"/api/v1/items\"\n"
+    lines = []
+    total = 0
+    while total < size:
+        lines.append(line.format(len(lines)))
+        total += len(lines[-1])
+    return ''.join(lines)
+
+
+def rss():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def measure(text, history, edits, edit_chars, keys, budget):
+    app = QApplication.instance()
+    editor = PlainTextEditor()
+    editor.resize(800, 600)
+    editor.show()
+    if history:
+        editor.undo_history = UndoHistory(editor, budget, 8 * budget, UndoBudget(budget))
+    editor.set_text(text)
+    app.processEvents()
+    doc = editor.document()
+
+    before = rss()
+    samples = []
+    for n in range(edits):
+        cursor = editor.textCursor()
+        # Each deletion shrinks the document; stay inside what is left
+        start = min(n * 1000, doc.characterCount() - 1 - edit_chars)
+        cursor.setPosition(start)
+        cursor.setPosition(start + edit_chars, QTextCursor.KeepAnchor)
+        editor.setTextCursor(cursor)
+        started = time.perf_counter()
+        QTest.keyClick(editor, Qt.Key_Delete)
+        samples.append((time.perf_counter() - started) * 1000)
+    after = rss()
+
+    cursor = QTextCursor(doc.findBlockByNumber(doc.blockCount() // 2))
+    editor.setTextCursor(cursor)
+    rounds = []
+    per_round = max(keys // KEY_ROUNDS, 1)
+    for _ in range(KEY_ROUNDS):
+        started = time.perf_counter()
+        for n in range(per_round):
+            QTest.keyClick(editor, Qt.Key_A + n % 26)
+        rounds.append((time.perf_counter() - started) * 1000 / per_round)
+
+    stats = editor.undo_history.stats() if history else None
+    steps = 0
+    started = time.perf_counter()
+    while (editor.undo_history.can_undo() if history else doc.isUndoAvailable()):
+        editor.undo()
+        steps += 1
+    undo_ms = (time.perf_counter() - started) * 1000 / max(steps, 1)
+
+    result = {
+        'undo_memory_mb': stats['memory'] / MB if stats else None,
+        'spilled_mb': stats['spilled_bytes'] / MB if stats else None,
+        'rss_growth_mb': (after - before) / MB if before is not None and after is not None else None,
+        'edit_ms': sum(samples) / len(samples),
+        'key_ms': statistics.median(rounds),
+        'undo_ms': undo_ms,
+        'undo_steps': steps,
+        'restored': doc.toPlainText() == text,
+    }
+    editor.hide()
+    editor.deleteLater()
+    app.processEvents()
+    return result
+
+
+def run(size_mb=40, edits=20, edit_mb=1, keys=300, budget_mb=8):
+    text = make_text(size_mb * MB)
+    # The deletions take at most half the document, however small it is
+    edit_chars = min(edit_mb * MB, len(text) // (2 * edits))
+    budget = budget_mb * MB
+    qt = measure(text, False, edits, edit_chars, keys, budget)
+    history = measure(text, True, edits, edit_chars, keys, budget)
+    return {
+        'size_mb': size_mb,
+        'removed_mb': edits * edit_chars / MB,
+        'qt': qt,
+        'history': history,
+        'passed': history['restored'] and history['undo_memory_mb'] <= budget_mb,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size-mb', type=int, default=40)
+    parser.add_argument('--edits', type=int, default=20)
+    parser.add_argument('--edit-mb', type=int, default=1)
+    parser.add_argument('--keys', type=int, default=300)
+    parser.add_argument('--budget-mb', type=int, default=8)
+    args = parser.parse_args(argv)
+    app = QApplication.instance() or QApplication(sys.argv[:1])  # widgets need a live application
+    result = run(args.size_mb, args.edits, args.edit_mb, args.keys, args.budget_mb)
+    print(json.dumps(result, indent=2))
+    return 0 if result['passed'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,36 +1,142 @@
 
 import sys
+import time
+import startup_profile
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QLabel, QPushButton, QSpacerItem, QSizePolicy, QGraphicsOpacityEffect)
-from PyQt5.QtCore import QTimer, QTime, Qt, QPropertyAnimation
-from PyQt5.QtGui import QFont, QPainter, QColor
+                             QLabel, QPushButton, QSpacerItem, QSizePolicy,
+                             QListView, QLineEdit, QSpinBox, QAbstractItemView)
+from PyQt5.QtCore import (QTimer, QTime, Qt, QAbstractListModel, QModelIndex, QEvent,
+                          QPropertyAnimation, QElapsedTimer, pyqtProperty)
+from PyQt5.QtGui import QFont, QPainter, QColor, QPixmap
+
+from timer_core import TimingEngine, DeadlineScheduler, VisibilityWatcher, NS_PER_SEC, NS_PER_MS
+
+# 알람 애니메이션 프레임 간격 (초당 20프레임)
+ALARM_FRAME_MS = 50
+# 창이 보이지 않을 때는 애니메이션 없이 이 간격으로 비프음만 울림
+ALARM_BEEP_MS = 200
+
 
 class RotatableLabel(QLabel):
-    """회전 애니메이션을 위한 커스텀 QLabel"""
+    """회전 애니메이션을 위한 커스텀 QLabel
+
+    글자는 한 번만 QPixmap에 그려 두고, 회전 프레임에서는 그 이미지만 돌려서
+    그립니다. 캐시는 글자, 글꼴, 크기, 정렬, 색, 화면 배율(device pixel ratio)이
+    하나라도 바뀌면 다시 만듭니다. paint_count/paint_ns/cache_misses는
+    프레임당 그리기 시간을 재기 위한 디버그 카운터입니다.
+    """
+    # False로 두면 예전처럼 매번 글자를 직접 그림 (벤치마크 비교용)
+    cache_text = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.rotation_angle = 0
+        self._text_pixmap = None
+        self._text_pixmap_key = None
+        self.reset_paint_stats()
 
     def setRotation(self, angle):
         self.rotation_angle = angle
         self.update()
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
+    # QPropertyAnimation이 직접 움직일 수 있도록 속성으로 노출
+    rotation = pyqtProperty(float, lambda self: self.rotation_angle, setRotation)
+
+    # --- 디버그 카운터 ---
+    def reset_paint_stats(self):
+        self.paint_count = 0
+        self.paint_ns = 0
+        self.cache_misses = 0
+
+    def paint_stats(self):
+        return {
+            'paint_count': self.paint_count,
+            'paint_mean_ms': self.paint_ns / self.paint_count / 1e6 if self.paint_count else 0.0,
+            'cache_misses': self.cache_misses,
+        }
+
+    # --- 글자 캐시 ---
+    def text_pixmap(self):
+        ratio = self.devicePixelRatioF()
+        color = self.palette().color(self.foregroundRole())
+        key = (self.text(), self.font().key(), self.width(), self.height(), ratio,
+               int(self.alignment()), color.rgba())
+        if key != self._text_pixmap_key:
+            pixmap = QPixmap(round(self.width() * ratio), round(self.height() * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            self.draw_text(painter)
+            painter.end()
+            self._text_pixmap = pixmap
+            self._text_pixmap_key = key
+            self.cache_misses += 1
+        return self._text_pixmap
+
+    def draw_text(self, painter):
         painter.setRenderHint(QPainter.Antialiasing)
-        
-        # 중앙을 기준으로 회전
-        transform = painter.transform()
-        transform.translate(self.width() / 2, self.height() / 2)
-        transform.rotate(self.rotation_angle)
-        transform.translate(-self.width() / 2, -self.height() / 2)
-        painter.setTransform(transform)
-        
-        # 부모 클래스의 paintEvent 호출 대신 직접 텍스트 그리기
         painter.setFont(self.font())
         painter.setPen(self.palette().color(self.foregroundRole()))
         painter.drawText(self.rect(), self.alignment(), self.text())
 
+    def resizeEvent(self, event):
+        # 예전 크기의 이미지는 다시 쓸 일이 없으니 바로 놓아줌
+        self._text_pixmap = self._text_pixmap_key = None
+        super().resizeEvent(event)
+
+    def changeEvent(self, event):
+        if event.type() in (QEvent.FontChange, QEvent.PaletteChange, QEvent.StyleChange):
+            self._text_pixmap = self._text_pixmap_key = None
+        super().changeEvent(event)
+
+    def paintEvent(self, event):
+        started = time.perf_counter_ns()
+        painter = QPainter(self)
+
+        # 중앙을 기준으로 회전
+        if self.rotation_angle:
+            painter.setRenderHint(QPainter.SmoothPixmapTransform)
+            transform = painter.transform()
+            transform.translate(self.width() / 2, self.height() / 2)
+            transform.rotate(self.rotation_angle)
+            transform.translate(-self.width() / 2, -self.height() / 2)
+            painter.setTransform(transform)
+
+        # 부모 클래스의 paintEvent 호출 대신 직접 그리기
+        if self.cache_text:
+            painter.drawPixmap(0, 0, self.text_pixmap())
+        else:
+            self.draw_text(painter)
+        painter.end()
+        self.paint_ns += time.perf_counter_ns() - started
+        self.paint_count += 1
+
+
+class BrightnessOverlay(QWidget):
+    """알람 때 화면을 번쩍이게 하는 반투명 흰색 막
+
+    알파 값은 속성으로 들고 있다가 paintEvent에서 바로 칠하므로,
+    스타일시트를 다시 해석하거나 위젯을 다시 polish할 일이 없습니다.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._alpha = 0
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+
+    def getAlpha(self):
+        return self._alpha
+
+    def setAlpha(self, alpha):
+        self._alpha = alpha
+        self.update()
+
+    alpha = pyqtProperty(int, getAlpha, setAlpha)
+
+    def paintEvent(self, event):
+        if self._alpha:
+            QPainter(self).fillRect(event.rect(), QColor(255, 255, 255, self._alpha))
+
+
 class FinalTimerApp(QWidget):
     def __init__(self):
         super().__init__()
@@ -41,17 +147,19 @@ class FinalTimerApp(QWidget):
         self.countdown_time = QTime(0, 0, 0)
         self.is_running = False
         
-        # 타이머
-        self.main_timer = QTimer(self)
-        self.main_timer.timeout.connect(self.update_countdown)
+        # 타이머: 남은 시간은 단조 시계로 계산하고, 틱은 화면 갱신에만 사용
+        self.countdown = TimingEngine(self)
+        self.countdown.tick.connect(self.update_countdown)
+        self.countdown.finished.connect(self.trigger_alarm)
+        self.alarm_active = False
         
-        self.alarm_animation_timer = QTimer(self)
-        self.alarm_animation_timer.timeout.connect(self.animate_alarm)
-        self.alarm_angle_direction = 1
-        self.alarm_brightness_direction = 1
-
         self.initUI()
         self.setup_initial_state()
+        self.init_alarm_animation()
+
+        # 최소화되거나 가려지면 매초 틱과 알람 애니메이션을 멈춤
+        self.visibility = VisibilityWatcher(self)
+        self.visibility.changed.connect(self.on_visibility_changed)
 
     def initUI(self):
         # --- 레이아웃 ---
@@ -63,6 +171,9 @@ class FinalTimerApp(QWidget):
         self.time_label = RotatableLabel("00:00:00")
         self.time_label.setAlignment(Qt.AlignCenter)
         self.time_label.setFont(QFont('Arial', 60, QFont.Bold))
+        # 가장 긴 글자에 맞춰 크기를 고정하면 setText가 레이아웃을 다시 계산하지 않고
+        # 레이블 영역만 다시 그림
+        self.time_label.setFixedSize(self.time_label.sizeHint())
 
         # 2. 시간 프리셋 버튼
         self.presets_hbox = QHBoxLayout()
@@ -85,8 +196,7 @@ class FinalTimerApp(QWidget):
         self.alarm_ok_btn = QPushButton('확인')
 
         # 5. 밝기 애니메이션을 위한 오버레이
-        self.brightness_overlay = QWidget(self)
-        self.brightness_overlay.setStyleSheet(f"background-color: rgba(255, 255, 255, 0);")
+        self.brightness_overlay = BrightnessOverlay(self)
         self.brightness_overlay.hide()
 
         # --- 위젯 배치 ---
@@ -108,6 +218,40 @@ class FinalTimerApp(QWidget):
         self.delete_btn.clicked.connect(self.reset_timer)
         self.alarm_ok_btn.clicked.connect(self.dismiss_alarm)
 
+    def init_alarm_animation(self):
+        """밝기와 회전을 속성 애니메이션으로 무한 반복 (예전 50ms 단계 애니메이션과 같은 주기)
+
+        Qt 기본 애니메이션 타이머는 초당 60프레임으로 돌기 때문에, 애니메이션은
+        멈춘 상태로 두고 50ms 프레임 타이머가 경과 시간에 맞춰 위치만 옮깁니다.
+        """
+        # 밝기: 0 -> 90 -> 0, 300ms
+        self.alarm_alpha_animation = QPropertyAnimation(self.brightness_overlay, b'alpha', self)
+        self.alarm_alpha_animation.setDuration(300)
+        self.alarm_alpha_animation.setKeyValueAt(0, 0)
+        self.alarm_alpha_animation.setKeyValueAt(0.5, 90)
+        self.alarm_alpha_animation.setKeyValueAt(1, 0)
+        self.alarm_alpha_animation.setLoopCount(-1)
+
+        # 회전: 0 -> 18 -> -18 -> 0, 400ms
+        self.alarm_angle_animation = QPropertyAnimation(self.time_label, b'rotation', self)
+        self.alarm_angle_animation.setDuration(400)
+        self.alarm_angle_animation.setKeyValueAt(0, 0.0)
+        self.alarm_angle_animation.setKeyValueAt(0.25, 18.0)
+        self.alarm_angle_animation.setKeyValueAt(0.75, -18.0)
+        self.alarm_angle_animation.setKeyValueAt(1, 0.0)
+        self.alarm_angle_animation.setLoopCount(-1)
+        self.alarm_angle_animation.valueChanged.connect(self.on_alarm_angle_changed)
+        self.alarm_angle_sign = 0
+
+        self.alarm_animations = [self.alarm_alpha_animation, self.alarm_angle_animation]
+        self.alarm_clock = QElapsedTimer()
+        self.alarm_frame_timer = QTimer(self)
+        self.alarm_frame_timer.setInterval(ALARM_FRAME_MS)
+        self.alarm_frame_timer.timeout.connect(self.advance_alarm_frame)
+        self.alarm_beep_timer = QTimer(self)
+        self.alarm_beep_timer.setInterval(ALARM_BEEP_MS)
+        self.alarm_beep_timer.timeout.connect(QApplication.beep)
+
     def resizeEvent(self, event):
         """창 크기가 변경될 때 오버레이 크기도 조절"""
         self.brightness_overlay.resize(self.size())
@@ -145,77 +289,303 @@ class FinalTimerApp(QWidget):
     def set_preset_time(self, minutes):
         if not self.is_running:
             self.countdown_time = QTime(0, minutes, 0)
+            self.countdown.set_countdown(minutes * 60 * 1000)
             self.time_label.setText(self.countdown_time.toString("mm:ss"))
 
     def start_timer(self):
         if self.countdown_time > QTime(0, 0, 0):
             self.is_running = True
-            self.main_timer.start(1000)
+            self.countdown.start()
             self.setup_running_state()
 
     def toggle_pause(self):
         if self.is_running:
-            self.main_timer.stop()
+            self.countdown.pause()
             self.is_running = False
             self.pause_continue_btn.setText('계속')
         else:
-            self.main_timer.start(1000)
+            self.countdown.start()
             self.is_running = True
             self.pause_continue_btn.setText('일시정지')
 
     def reset_timer(self):
-        self.main_timer.stop()
+        self.countdown.set_countdown(0)
         self.is_running = False
         self.setup_initial_state()
 
     def update_countdown(self):
-        self.countdown_time = self.countdown_time.addSecs(-1)
+        # 틱이 늦거나 합쳐져도 표시는 항상 실제 남은 시간
+        self.countdown_time = QTime(0, 0, 0).addSecs(self.countdown.display_seconds())
         self.time_label.setText(self.countdown_time.toString("mm:ss"))
-        if self.countdown_time == QTime(0, 0, 0):
-            self.trigger_alarm()
 
     def trigger_alarm(self):
-        self.main_timer.stop()
         self.is_running = False
         self.setup_alarm_state()
         QApplication.beep()
         self.brightness_overlay.show()
-        self.alarm_animation_timer.start(50) # 50ms 간격으로 애니메이션
+        self.alarm_angle_sign = 0
+        for animation in self.alarm_animations:
+            animation.start()
+            animation.pause()
+        self.alarm_clock.start()
+        self.alarm_active = True
+        self.update_alarm_timers()
+
+    def update_alarm_timers(self):
+        """보일 때는 애니메이션 프레임을, 안 보일 때는 비프음만 돌림"""
+        visible = self.visibility.visible
+        if self.alarm_active and visible:
+            self.alarm_beep_timer.stop()
+            self.alarm_frame_timer.start()
+        elif self.alarm_active:
+            self.alarm_frame_timer.stop()
+            self.alarm_beep_timer.start()
+        else:
+            self.alarm_frame_timer.stop()
+            self.alarm_beep_timer.stop()
+
+    def on_visibility_changed(self, visible):
+        # 다시 보이면 엔진이 바로 틱을 내서 지난 시간을 정확히 따라잡음
+        self.countdown.set_ticks_suspended(not visible)
+        self.update_alarm_timers()
+
+    def advance_alarm_frame(self):
+        elapsed = self.alarm_clock.elapsed()
+        for animation in self.alarm_animations:
+            animation.setCurrentTime(elapsed)
+
+    def on_alarm_angle_changed(self, angle):
+        # 비프음 반복: 레이블이 가운데를 지날 때마다 (한 주기에 두 번)
+        sign = (angle > 0) - (angle < 0)
+        if sign and sign != self.alarm_angle_sign:
+            if self.alarm_angle_sign:
+                QApplication.beep()
+            self.alarm_angle_sign = sign
+
+    def dismiss_alarm(self):
+        self.alarm_active = False
+        self.update_alarm_timers()
+        for animation in self.alarm_animations:
+            animation.stop()
+        self.brightness_overlay.setAlpha(0)
+        self.brightness_overlay.hide()
+        self.time_label.setRotation(0)
+        self.reset_timer()
+
+
+# --- 여러 개의 카운트다운 ---
+class Countdown:
+    """이름 붙은 카운트다운 하나. 실행 중이면 deadline_ns, 멈춰 있으면 remaining_ns가 기준"""
+    __slots__ = ('name', 'duration_ns', 'remaining_ns', 'deadline_ns', 'expired')
+
+    def __init__(self, name, duration_ns):
+        self.name = name
+        self.duration_ns = duration_ns
+        self.remaining_ns = duration_ns
+        self.deadline_ns = None
+        self.expired = False
+
+    @property
+    def is_running(self):
+        return self.deadline_ns is not None
+
+    def remaining(self, now):
+        if self.deadline_ns is None:
+            return self.remaining_ns
+        return max(0, self.deadline_ns - now)
+
+
+class CountdownModel(QAbstractListModel):
+    """남은 시간은 저장하지 않고 그릴 때 계산하므로, 매초 갱신할 데이터가 없음"""
+
+    def __init__(self, scheduler, parent=None):
+        super().__init__(parent)
+        self.scheduler = scheduler
+        self.countdowns = []
+        self.scheduler.expired.connect(self.on_expired)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.countdowns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        countdown = self.countdowns[index.row()]
+        if role == Qt.DisplayRole:
+            seconds = -(-countdown.remaining(self.scheduler.clock()) // NS_PER_SEC)
+            minutes, seconds = divmod(seconds, 60)
+            state = '알람' if countdown.expired else ('' if countdown.is_running else '정지')
+            return f"{minutes:02d}:{seconds:02d}  {countdown.name}  {state}"
+        if role == Qt.BackgroundRole and countdown.expired:
+            return QColor('#ffcdd2')
+        if role == Qt.ForegroundRole and not countdown.is_running and not countdown.expired:
+            return QColor('#888')
+        return None
+
+    def add(self, name, duration_ns, count=1):
+        first = len(self.countdowns)
+        self.beginInsertRows(QModelIndex(), first, first + count - 1)
+        for i in range(count):
+            label = name if count == 1 else f"{name} {i + 1}"
+            self.countdowns.append(Countdown(label, duration_ns))
+        self.endInsertRows()
+
+    def remove(self, rows):
+        for row in sorted(rows, reverse=True):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            countdown = self.countdowns.pop(row)
+            self.scheduler.cancel(countdown)
+            self.endRemoveRows()
+
+    def rows_changed(self, rows):
+        # 한 번의 dataChanged로 묶어서 뷰가 여러 번 갱신되지 않게 함
+        if rows:
+            self.dataChanged.emit(self.index(min(rows)), self.index(max(rows)))
+
+    def toggle(self, rows):
+        now = self.scheduler.clock()
+        for row in rows:
+            countdown = self.countdowns[row]
+            if countdown.expired:
+                # 알람 확인: 처음 시간으로 되돌림
+                countdown.expired = False
+                countdown.remaining_ns = countdown.duration_ns
+            elif countdown.is_running:
+                countdown.remaining_ns = countdown.remaining(now)
+                countdown.deadline_ns = None
+                self.scheduler.cancel(countdown)
+            else:
+                countdown.deadline_ns = now + countdown.remaining_ns
+                self.scheduler.schedule(countdown, countdown.deadline_ns)
+        self.rows_changed(rows)
+
+    def on_expired(self, countdowns):
+        for countdown in countdowns:
+            countdown.remaining_ns = 0
+            countdown.deadline_ns = None
+            countdown.expired = True
+        expired = set(countdowns)
+        self.rows_changed([row for row, countdown in enumerate(self.countdowns) if countdown in expired])
+        QApplication.beep()
 
-    def animate_alarm(self):
-        # 1. 밝기 애니메이션
-        current_alpha = self.brightness_overlay.styleSheet().split(',')[3].replace(');','').strip()
-        alpha = int(current_alpha)
 
-        if alpha >= 80: self.alarm_brightness_direction = -1
-        if alpha <= 0: self.alarm_brightness_direction = 1
+class MultiTimerApp(QWidget):
+    """수백 개의 카운트다운을 QTimer 두 개로 돌리는 목록 화면
 
-        # 속도를 약 3배 증가시킵니다. (10 -> 30)
-        alpha += 30 * self.alarm_brightness_direction
-        self.brightness_overlay.setStyleSheet(f"background-color: rgba(255, 255, 255, {alpha});")
+    만료는 DeadlineScheduler의 QTimer 하나가 처리하고, 화면 갱신용 QTimer는
+    보이는 행들 가운데 다음으로 초가 바뀌는 시각에만 깨어나 뷰포트를 다시 그립니다.
+    보이지 않는 행은 계산도, 그리기도 하지 않습니다.
+    """
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle('Final Timer - 여러 타이머')
+        self.setGeometry(100, 100, 380, 640)
 
-        # 2. 회전 애니메이션
-        angle = self.time_label.rotation_angle
-        if angle > 15: self.alarm_angle_direction = -1
-        if angle < -15: self.alarm_angle_direction = 1
+        self.scheduler = DeadlineScheduler(self)
+        self.model = CountdownModel(self.scheduler, self)
+        self.model.dataChanged.connect(self.schedule_repaint)
 
-        # 속도를 3배 증가시킵니다. (3 -> 9)
-        angle += 9 * self.alarm_angle_direction
-        self.time_label.setRotation(angle)
+        self.repaint_timer = QTimer(self)
+        self.repaint_timer.setSingleShot(True)
+        self.repaint_timer.setTimerType(Qt.PreciseTimer)
+        self.repaint_timer.timeout.connect(self.repaint_visible_rows)
 
-        # 3. 비프음 반복 (중앙 근처에서 울리도록 조건 변경)
-        if abs(angle) < 9:
-            QApplication.beep()
+        self.initUI()
 
-    def dismiss_alarm(self):
-        self.alarm_animation_timer.stop()
-        self.brightness_overlay.hide()
-        self.time_label.setRotation(0)
-        self.reset_timer()
+        # 화면에 안 보이는 동안에는 다시 그리기를 예약하지 않음 (만료 처리는 계속)
+        self.visibility = VisibilityWatcher(self)
+        self.visibility.changed.connect(self.schedule_repaint)
+
+    def initUI(self):
+        vbox = QVBoxLayout(self)
+
+        # --- 추가 ---
+        add_hbox = QHBoxLayout()
+        self.name_edit = QLineEdit('타이머')
+        self.minutes_spin = QSpinBox()
+        self.minutes_spin.setRange(1, 24 * 60)
+        self.minutes_spin.setValue(5)
+        self.minutes_spin.setSuffix('분')
+        self.count_spin = QSpinBox()
+        self.count_spin.setRange(1, 1000)
+        self.count_spin.setSuffix('개')
+        add_btn = QPushButton('추가')
+        add_btn.clicked.connect(self.add_countdowns)
+        add_hbox.addWidget(self.name_edit)
+        add_hbox.addWidget(self.minutes_spin)
+        add_hbox.addWidget(self.count_spin)
+        add_hbox.addWidget(add_btn)
+        vbox.addLayout(add_hbox)
+
+        # --- 목록 ---
+        self.list_view = QListView()
+        self.list_view.setModel(self.model)
+        # 모든 행 높이가 같다고 알려서 스크롤/배치 계산을 보이는 부분으로 한정
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.list_view.setFont(QFont('Consolas', 12))
+        self.list_view.doubleClicked.connect(lambda index: self.model.toggle([index.row()]))
+        self.list_view.verticalScrollBar().valueChanged.connect(self.schedule_repaint)
+        vbox.addWidget(self.list_view)
+
+        # --- 제어 ---
+        controls_hbox = QHBoxLayout()
+        toggle_btn = QPushButton('시작/정지')
+        toggle_btn.clicked.connect(lambda: self.model.toggle(self.selected_rows()))
+        delete_btn = QPushButton('삭제')
+        delete_btn.clicked.connect(lambda: self.model.remove(self.selected_rows()))
+        controls_hbox.addWidget(toggle_btn)
+        controls_hbox.addWidget(delete_btn)
+        vbox.addLayout(controls_hbox)
+
+    def selected_rows(self):
+        return sorted(index.row() for index in self.list_view.selectionModel().selectedIndexes())
+
+    def add_countdowns(self):
+        self.model.add(self.name_edit.text() or '타이머', self.minutes_spin.value() * 60 * NS_PER_SEC,
+                       self.count_spin.value())
+
+    def visible_rows(self):
+        viewport = self.list_view.viewport()
+        first = self.list_view.indexAt(viewport.rect().topLeft())
+        if not first.isValid():
+            return range(0)
+        last = self.list_view.indexAt(viewport.rect().bottomLeft())
+        last_row = last.row() if last.isValid() else self.model.rowCount() - 1
+        return range(first.row(), last_row + 1)
+
+    def repaint_visible_rows(self):
+        self.list_view.viewport().update()
+        self.schedule_repaint()
+
+    def schedule_repaint(self, *args):
+        """보이는 실행 중인 행 중 가장 먼저 초가 바뀌는 시각에 맞춰 다시 그리기 예약"""
+        if not self.visibility.visible:
+            self.repaint_timer.stop()
+            return
+        now = self.scheduler.clock()
+        wait_ns = None
+        for row in self.visible_rows():
+            countdown = self.model.countdowns[row]
+            if countdown.is_running:
+                until_change = countdown.remaining(now) % NS_PER_SEC or NS_PER_SEC
+                wait_ns = until_change if wait_ns is None else min(wait_ns, until_change)
+        if wait_ns is None:
+            self.repaint_timer.stop()
+        else:
+            self.repaint_timer.start(-(-wait_ns // NS_PER_MS))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.schedule_repaint()
 
 
 if __name__ == '__main__':
+    # --profile-startup 또는 STARTUP_PROFILE 환경 변수로 시작 시간 측정
+    startup_profile.mark('imports')
     app = QApplication(sys.argv)
-    ex = FinalTimerApp()
+    startup_profile.mark('qapplication')
+    # --multi: 여러 개의 이름 붙은 카운트다운을 한 화면에서
+    ex = MultiTimerApp() if '--multi' in sys.argv[1:] else FinalTimerApp()
+    startup_profile.mark('init_ui')
+    startup_profile.watch_first_paint(ex)
     ex.show()
     sys.exit(app.exec_())
@@ -1,20 +1,42 @@
+import os
 import sys
-from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QSpacerItem, QSizePolicy
-from PyQt5.QtCore import QTimer, QTime, QDate, Qt
+import time
+import startup_profile
+from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QSpacerItem,
+                             QSizePolicy, QLineEdit, QAction, QFileDialog, QMessageBox)
+from PyQt5.QtCore import QTime, QDate, Qt, QTimer, QStandardPaths
 from PyQt5.QtGui import QFont
 
+from timer_core import TimingEngine, VisibilityWatcher, NS_PER_SEC
+from timer_theme import apply_theme, current_theme, set_state
+
+# 기록 저장소(timer_history, sqlite3)는 첫 화면이 뜬 뒤에 불러옴
+
 class ModernTimer(QWidget):
-    def __init__(self):
+    def __init__(self, theme=None):
         super().__init__()
+        # 스타일시트는 애플리케이션에 한 번만 걸리고, 상태는 동적 속성으로 바꿈 (timer_theme)
+        apply_theme(theme or current_theme())
+        self.setAttribute(Qt.WA_StyledBackground, True)
         self.setWindowTitle('타이머')
         self.setGeometry(100, 100, 360, 600) # 스마트폰과 유사한 비율로 설정
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_time)
+        # 경과 시간은 단조 시계로 계산하고, 틱은 화면 갱신에만 사용
+        self.timer = TimingEngine(self)
+        self.timer.set_stopwatch()
+        self.timer.tick.connect(self.update_time)
         self.time = QTime(0, 0, 0)
         self.is_running = False
+        self.history = None         # TimerHistory, open_history() 전에는 기록하지 않음
+        self.run_started_at = None  # 이번 기록을 처음 시작한 유닉스 시각
+        self.run_label = ''
+        self.laps = []              # 시작부터 각 랩까지의 경과 시간(초)
 
         self.initUI()
 
+        # 최소화되거나 가려지면 매초 틱을 멈추고, 다시 보이면 바로 따라잡음
+        self.visibility = VisibilityWatcher(self)
+        self.visibility.changed.connect(lambda visible: self.timer.set_ticks_suspended(not visible))
+
     def initUI(self):
         # 전체 레이아웃
         main_vbox = QVBoxLayout()
@@ -26,23 +48,32 @@ class ModernTimer(QWidget):
         # 날짜 표시
         date_str = QDate.currentDate().toString('yyyy.MM.dd. ddd')
         date_label = QLabel(date_str)
+        date_label.setObjectName('date')
         date_label.setAlignment(Qt.AlignCenter)
         date_label.setFont(QFont('Arial', 14))
-        date_label.setStyleSheet("color: #888;")
         main_vbox.addWidget(date_label)
 
         # 타이머 시간 표시
         self.time_label = QLabel(self.time.toString('HH:mm:ss'))
+        self.time_label.setObjectName('time')
         self.time_label.setAlignment(Qt.AlignCenter)
         self.time_label.setFont(QFont('Arial', 60, QFont.Bold))
-        main_vbox.addWidget(self.time_label)
-
-        # 총 시간 표시 (UI 모방)
-        total_label = QLabel('TOTAL\n00H 00M') # 예시 텍스트
-        total_label.setAlignment(Qt.AlignCenter)
-        total_label.setFont(QFont('Arial', 12))
-        total_label.setStyleSheet("color: #aaa;")
-        main_vbox.addWidget(total_label)
+        # 크기를 고정하면 매초 setText가 레이아웃을 건드리지 않고 레이블 영역만 다시 그림
+        self.time_label.setFixedSize(self.time_label.sizeHint())
+        main_vbox.addWidget(self.time_label, alignment=Qt.AlignHCenter)
+
+        # 오늘 총 시간: 저장된 기록의 합계 + 진행 중인 기록
+        self.total_label = QLabel(self.total_text(0))
+        self.total_label.setObjectName('total')
+        self.total_label.setAlignment(Qt.AlignCenter)
+        self.total_label.setFont(QFont('Arial', 12))
+        main_vbox.addWidget(self.total_label)
+
+        # 기록에 붙일 라벨 (라벨별 합계와 내보내기에 쓰임)
+        self.label_edit = QLineEdit()
+        self.label_edit.setPlaceholderText('라벨 (선택)')
+        self.label_edit.setAlignment(Qt.AlignCenter)
+        main_vbox.addWidget(self.label_edit)
 
         # 중앙 공간
         main_vbox.addSpacerItem(QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding))
@@ -50,72 +81,128 @@ class ModernTimer(QWidget):
         # 버튼 레이아웃
         btn_hbox = QHBoxLayout()
         self.start_pause_btn = QPushButton('시작')
+        self.lap_btn = QPushButton('랩')
         self.reset_btn = QPushButton('초기화')
 
-        # 버튼 스타일링
-        self.start_pause_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4CAF50;
-                color: white;
-                font-size: 16px;
-                border-radius: 5px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background-color: #45a049;
-            }
-        """)
-        self.reset_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #f44336;
-                color: white;
-                font-size: 16px;
-                border-radius: 5px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background-color: #da190b;
-            }
-        """)
-
+        # 버튼 스타일링: 색은 테마 스타일시트가 role과 running 속성을 보고 정함
+        self.start_pause_btn.setProperty('role', 'start')
+        self.lap_btn.setProperty('role', 'lap')
+        self.reset_btn.setProperty('role', 'reset')
+        self.start_pause_btn.setProperty('running', False)
 
         self.start_pause_btn.clicked.connect(self.toggle_timer)
+        self.lap_btn.clicked.connect(self.lap)
         self.reset_btn.clicked.connect(self.reset_timer)
 
         btn_hbox.addWidget(self.start_pause_btn)
+        btn_hbox.addWidget(self.lap_btn)
         btn_hbox.addWidget(self.reset_btn)
 
+        # 오른쪽 클릭 메뉴
+        export_action = QAction('기록을 CSV로 내보내기...', self)
+        export_action.triggered.connect(self.export_history)
+        self.addAction(export_action)
+        self.dark_action = QAction('어두운 테마', self, checkable=True)
+        self.dark_action.setChecked(current_theme() == 'dark')
+        self.dark_action.toggled.connect(lambda dark: apply_theme('dark' if dark else 'light'))
+        self.addAction(self.dark_action)
+        self.setContextMenuPolicy(Qt.ActionsContextMenu)
+
         main_vbox.addLayout(btn_hbox)
 
         self.setLayout(main_vbox)
-        self.setStyleSheet("background-color: #fff;")
-        self.show()
 
     def toggle_timer(self):
         if not self.is_running:
-            self.timer.start(1000) # 1초마다 갱신
+            if self.run_started_at is None:
+                self.run_started_at = time.time()
+                self.run_label = self.label_edit.text().strip()
+                self.laps = []
+            self.timer.start() # 초가 바뀔 때마다 갱신
             self.is_running = True
             self.start_pause_btn.setText('일시정지')
-            self.start_pause_btn.setStyleSheet("background-color: #ff9800; color: white; font-size: 16px; border-radius: 5px; padding: 10px;") # 주황색
+            set_state(self.start_pause_btn, 'running', True) # 주황색
         else:
-            self.timer.stop()
+            self.timer.pause()
             self.is_running = False
             self.start_pause_btn.setText('계속')
-            self.start_pause_btn.setStyleSheet("background-color: #4CAF50; color: white; font-size: 16px; border-radius: 5px; padding: 10px;") # 녹색
+            set_state(self.start_pause_btn, 'running', False) # 녹색
+
+    def lap(self):
+        if self.is_running:
+            self.laps.append(self.timer.elapsed_ns() / NS_PER_SEC)
 
     def reset_timer(self):
-        self.timer.stop()
+        self.finish_run()
+        self.timer.reset()
         self.is_running = False
         self.time.setHMS(0,0,0)
         self.time_label.setText(self.time.toString('HH:mm:ss'))
         self.start_pause_btn.setText('시작')
-        self.start_pause_btn.setStyleSheet("background-color: #4CAF50; color: white; font-size: 16px; border-radius: 5px; padding: 10px;") # 녹색
+        set_state(self.start_pause_btn, 'running', False) # 녹색
 
     def update_time(self):
-        self.time = self.time.addSecs(1)
+        self.time = QTime(0, 0, 0).addSecs(self.timer.display_seconds())
         self.time_label.setText(self.time.toString('HH:mm:ss'))
+        self.update_total()
+
+    # --- 기록 ---
+    def open_history(self, path):
+        from timer_history import TimerHistory
+        self.history = TimerHistory(path, self)
+        self.history.exported.connect(lambda out_path, rows: QMessageBox.information(
+            self, '내보내기', f'{rows}줄을 내보냈습니다.\n{out_path}'))
+        self.history.failed.connect(self.on_history_failed)
+        self.update_total()
+
+    def on_history_failed(self, message):
+        # 저장하지 못한 기록은 합계에서 빠졌으므로 멈춰 있어도 바로 다시 그림
+        self.update_total()
+        QMessageBox.warning(self, '기록', message)
+
+    def finish_run(self):
+        """진행 중인 기록을 저장소에 넘기고 새 기록을 받을 준비"""
+        seconds = self.timer.elapsed_ns() / NS_PER_SEC
+        if self.history is not None and self.run_started_at is not None and seconds > 0:
+            self.history.record(self.run_label, self.run_started_at, seconds, self.laps)
+        self.run_started_at = None
+        self.laps = []
+
+    @staticmethod
+    def total_text(seconds):
+        minutes = int(seconds) // 60
+        return f'TOTAL\n{minutes // 60:02d}H {minutes % 60:02d}M'
+
+    def update_total(self):
+        # 저장된 합계는 메모리에 있으므로 매초 불러도 DB를 읽지 않음
+        seconds = self.history.today_seconds() if self.history is not None else 0
+        if self.run_started_at is not None:
+            seconds += self.timer.elapsed_ns() / NS_PER_SEC
+        self.total_label.setText(self.total_text(seconds))
+
+    def export_history(self):
+        if self.history is None:
+            return
+        path, _ = QFileDialog.getSaveFileName(self, '기록 내보내기', 'timer_history.csv', 'CSV (*.csv)')
+        if path:
+            self.history.export_csv(path)
+
+    def closeEvent(self, event):
+        self.finish_run()
+        if self.history is not None:
+            self.history.close()
+        super().closeEvent(event)
 
 if __name__ == '__main__':
+    # --profile-startup 또는 STARTUP_PROFILE 환경 변수로 시작 시간 측정
+    startup_profile.mark('imports')
     app = QApplication(sys.argv)
+    startup_profile.mark('qapplication')
     ex = ModernTimer()
+    startup_profile.mark('init_ui')
+    startup_profile.watch_first_paint(ex)
+    ex.show()
+    data_dir = QStandardPaths.writableLocation(QStandardPaths.AppLocalDataLocation)
+    os.makedirs(data_dir, exist_ok=True)
+    QTimer.singleShot(0, lambda: ex.open_history(os.path.join(data_dir, 'history.sqlite3')))
     sys.exit(app.exec_())
\ No newline at end of file
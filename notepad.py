@@ -1,17 +1,370 @@
 import sys
 import os
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QTextEdit, QAction, QFileDialog,
-                             QMessageBox, QTabWidget)
-from PyQt5.QtGui import QFont
+import startup_profile
+
+if __name__ == '__main__' and not startup_profile.enabled:
+    # A running instance takes our files over IPC; skip loading the GUI stack entirely
+    from notepad_ipc import forward_to_running_instance
+    if forward_to_running_instance([arg for arg in sys.argv[1:] if not arg.startswith('-')]):
+        sys.exit(0)
+
+import shutil
+import tempfile
+import weakref
+import threading
+from collections import deque
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QAction, QFileDialog,
+                             QMessageBox, QTabWidget, QInputDialog, QWidget, QLabel, QVBoxLayout)
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, QStandardPaths, QTimer, QByteArray, pyqtSignal
+from PyQt5.QtGui import QFont, QTextCursor
+
+from notepad_editor import EditorMixin, PlainTextEditor
+from notepad_journal import AutosaveJournal, find_orphaned_journals, recover_tabs, discard_journals
+from notepad_ipc import InstanceServer, forward_to_running_instance
+from notepad_session import load_session, save_session
+from notepad_watch import FileWatcher, snapshot_file, disk_state, read_appended
+from notepad_undo import UndoHistory, UndoBudget
+from notepad_encoding import (DEFAULT_FORMAT, SNIFF_BYTES, StreamDecoder, sniff_format, fallback_formats,
+                              encode_chunks, is_ascii_compatible, codec_name, describe, encoding_name,
+                              SAVE_ENCODINGS)
+from notepad_compress import (MAGIC_BYTES, sniff_compression, suffix_compression, open_decompressed,
+                              open_compressed, decompressed_size, DEFAULT_LEVELS)
+
+# The viewer, find/replace and highlighting modules are imported on first use, off the startup path
 
 # To handle multiple windows
 notepad_instances = []
 
+# Crash-recovery journal shared by all windows, created at startup
+autosave_journal = None
+
+# Where the open windows are recorded on exit, set at startup
+session_path = None
+
+# Collects each window's session state while quit_application() closes them all
+_quit_session = None
+
+# Bumped on every tab activation; gives editors a global LRU order
+_activation_clock = 0
+
+# mkstemp creates 0600 files; new files should get the usual umask-based mode instead
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# One lock per file being saved, so two writers (two tabs on one file, or a
+# waiting save next to a background one) never write the same target at once
+_path_locks = weakref.WeakValueDictionary()
+_path_locks_guard = threading.Lock()
+
+_writer_pool = None
+_file_watcher = None
+_undo_budget = None
+
+
+def writer_pool():
+    """Thread pool shared by every tab of every window for background saves."""
+    global _writer_pool
+    if _writer_pool is None:
+        _writer_pool = QThreadPool()
+        _writer_pool.setMaxThreadCount(2)
+    return _writer_pool
+
+
+def path_lock(path):
+    """The lock held while writing to `path`, shared by every writer of that file."""
+    key = os.path.normcase(os.path.realpath(path))
+    with _path_locks_guard:
+        lock = _path_locks.get(key)
+        if lock is None:
+            lock = _path_locks[key] = threading.Lock()
+        return lock
+
+
+def file_watcher():
+    """Watches the files of all editor tabs; see on_files_changed."""
+    global _file_watcher
+    if _file_watcher is None:
+        _file_watcher = FileWatcher()
+        _file_watcher.changed.connect(on_files_changed)
+    return _file_watcher
+
+
+def undo_budget():
+    """Undo memory cap shared by every tab of every window."""
+    global _undo_budget
+    if _undo_budget is None:
+        _undo_budget = UndoBudget(Notepad.undo_memory_cap)
+    return _undo_budget
+
+
+def is_viewer(widget):
+    # Until notepad_viewer has been imported no tab can be a viewer
+    viewer_module = sys.modules.get('notepad_viewer')
+    return viewer_module is not None and isinstance(widget, viewer_module.LargeFileViewer)
+
+
+class LoaderSignals(QObject):
+    format_detected = pyqtSignal(object)
+    restarted = pyqtSignal(object)
+    chunk = pyqtSignal(str)
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal()
+    failed = pyqtSignal(str)
+
+
+class ChunkedFileLoader(QRunnable):
+    """Reads a file on a worker thread and hands it to the GUI in chunks.
+
+    The encoding is sniffed from the first chunk. If the file turns out not
+    to decode with it further in, the load restarts with the next candidate.
+    """
+    CHUNK_SIZE = 256 * 1024  # bytes per chunk
+    MAX_PENDING = 4          # chunks read ahead of the GUI thread
+
+    def __init__(self, path):
+        super().__init__()
+        # The tab keeps a reference; the pool must not delete the runnable under us
+        self.setAutoDelete(False)
+        self.path = path
+        self.disk_state = None  # What was read, set before `finished`
+        self.signals = LoaderSignals()
+        self._cancelled = threading.Event()
+        self._slots = threading.Semaphore(self.MAX_PENDING)
+
+    def cancel(self):
+        self._cancelled.set()
+        self._slots.release()  # Wake the worker if it is waiting for the GUI
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def chunk_consumed(self):
+        self._slots.release()
+
+    def run(self):
+        try:
+            total = os.path.getsize(self.path)
+            with open(self.path, 'rb') as raw:
+                compression = sniff_compression(raw.read(MAGIC_BYTES))
+                f = self._open(raw, compression)
+                head = f.read(self.CHUNK_SIZE)
+                fmt, bom_length = sniff_format(head, complete=len(head) < self.CHUNK_SIZE)
+                fmt = fmt._replace(compression=compression)
+                self.signals.format_detected.emit(fmt)
+                fallbacks = fallback_formats(fmt)
+                while True:
+                    try:
+                        self._stream(f, raw, head[bom_length:], fmt, total)
+                        # A decompressor may stop short of the end of what it read
+                        raw.seek(0, os.SEEK_END)
+                        self.disk_state = snapshot_file(raw)
+                        break
+                    except UnicodeDecodeError:
+                        if self._cancelled.is_set():
+                            return
+                        fmt = fallbacks.pop(0)
+                        f = self._open(raw, compression)
+                        head = f.read(self.CHUNK_SIZE)
+                        self.signals.restarted.emit(fmt)
+        except Exception as e:
+            if not self._cancelled.is_set():
+                self.signals.failed.emit(str(e))
+            return
+        if not self._cancelled.is_set():
+            self.signals.finished.emit()
+
+    @staticmethod
+    def _open(raw, compression):
+        """The file from the start, decompressed on the fly if it is compressed."""
+        raw.seek(0)
+        return open_decompressed(raw, compression) if compression else raw
+
+    def _stream(self, f, raw, data, fmt, total):
+        decoder = StreamDecoder(fmt)
+        while True:
+            # Back-pressure: never queue more than MAX_PENDING chunks
+            self._slots.acquire()
+            if self._cancelled.is_set():
+                return
+            text = decoder.decode(data, final=not data)
+            if text:
+                self.signals.chunk.emit(text)
+            else:
+                self._slots.release()
+            # Progress through the file on disk, which for compressed files is not where `f` is
+            self.signals.progress.emit(raw.tell(), total)
+            if not data:
+                return
+            data = f.read(self.CHUNK_SIZE)
+
+
+class WriterSignals(QObject):
+    finished = pyqtSignal()
+    failed = pyqtSignal(str)
+
+
+class AtomicFileWriter(QRunnable):
+    """Writes a text snapshot to a temp file, fsyncs it and renames it over the target.
+
+    If the format says the file is compressed, the text is compressed on
+    the way out, chunk by chunk, at `level` (None: the codec's default).
+    """
+
+    def __init__(self, path, text, text_format=DEFAULT_FORMAT, level=None):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.path = path
+        self.text = text
+        self.text_format = text_format
+        self.level = level
+        self.error = None
+        self.unencodable = None     # First character the encoding could not hold, if that is why it failed
+        self.retried = False        # Set by the window once it saved the text again in another encoding
+        self.signals = WriterSignals()
+        self._done = threading.Event()
+
+    def wait(self):
+        self._done.wait()
+
+    def run(self):
+        try:
+            with path_lock(self.path):
+                self._write()
+        except UnicodeEncodeError as e:
+            self.unencodable = e.object[e.start]
+            self.error = str(e)
+        except Exception as e:
+            self.error = str(e)
+        self.text = None  # Drop the snapshot as soon as it is on disk
+        self._done.set()
+        if self.error is None:
+            self.signals.finished.emit()
+        else:
+            self.signals.failed.emit(self.error)
+
+    def _write(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(self.path)}.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                compression = self.text_format.compression
+                out = open_compressed(f, compression, self.level, os.path.basename(self.path)) if compression else f
+                for data in encode_chunks(self.text, self.text_format):
+                    out.write(data)
+                if out is not f:
+                    out.close()
+                f.flush()
+                os.fsync(f.fileno())
+            try:
+                shutil.copymode(self.path, tmp_path)
+            except FileNotFoundError:
+                os.chmod(tmp_path, 0o666 & ~_UMASK)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        if hasattr(os, 'O_DIRECTORY'):
+            # Make the rename itself durable (POSIX only)
+            dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+
+class TabState:
+    """What an editor tab's label and the window title are built from.
+
+    Kept per editor (the "tab_state" property) so a refresh never has to
+    read the label back out of the tab bar.
+    """
+    __slots__ = ('path', 'display_name', 'modified', 'saving', 'progress', 'label')
+
+    def __init__(self, path=None):
+        self.set_path(path)
+        self.modified = False
+        self.saving = False
+        self.progress = None    # Load progress in percent while loading
+        self.label = None       # Text last written to the tab bar
+
+    def set_path(self, path):
+        self.path = path
+        self.display_name = "제목 없음" if path is None else os.path.basename(path)
+
+    def tab_label(self):
+        label = self.display_name
+        if self.progress is not None:
+            label += f" ({self.progress}%)"
+        if self.saving:
+            label += " (저장 중)"
+        if self.modified:
+            label += "*"
+        return label
+
+
+class TabPlaceholder(QWidget):
+    """Stands in for a file tab that has not been loaded yet, or was evicted."""
+
+    def __init__(self, path, view_state=None, loaded_mtime=None, zoom=0):
+        super().__init__()
+        self.path = path
+        self.view_state = view_state        # (cursor position, scroll value) to restore
+        self.loaded_mtime = loaded_mtime    # mtime of the file when it was last loaded
+        self.zoom = zoom                    # Zoom level to reapply, see Notepad.zoom_level
+        self.setProperty("file_path", path)
+        vbox = QVBoxLayout(self)
+        label = QLabel("불러오는 중...")
+        label.setAlignment(Qt.AlignCenter)
+        vbox.addWidget(label)
+
+
 class Notepad(QMainWindow):
+    # Files at least this large open in the read-only, memory-mapped viewer
+    viewer_threshold = 256 * 1024 * 1024
+    # Any widget implementing notepad_editor.EditorMixin
+    editor_class = PlainTextEditor
+    # Unmodified background tabs are evicted (LRU first) while all windows together exceed this
+    tab_memory_budget = 512 * 1024 * 1024
+    # Files that grow by more than this between two checks are reloaded instead of appended to
+    max_append_bytes = 4 * 1024 * 1024
+    # Levels gzip and zstd files are recompressed with on save; a copy, so changing it leaves the codec defaults alone
+    compression_levels = dict(DEFAULT_LEVELS)
+    # Files with a known extension (see notepad_highlight) get highlighting in their visible part
+    syntax_highlighting = True
+    # Undo history kept in memory per tab and for all tabs together; older steps
+    # are compressed to disk, and past undo_spill_budget (per tab) forgotten
+    undo_memory_budget = 64 * 1024 * 1024
+    undo_memory_cap = 256 * 1024 * 1024
+    undo_spill_budget = 512 * 1024 * 1024
+    # Zoom levels are font points added to default_font
+    min_zoom, max_zoom = -8, 40
+    # Zoom steps arriving faster than this (a held Ctrl+=) are applied together
+    zoom_interval_ms = 100
+
     def __init__(self):
         super().__init__()
         # Store the initial font to allow zoom reset
         self.default_font = QFont("Consolas", 11)
+        self.find_dialog = None
+        self.results_dock = None
+        # Tab labels and the title are refreshed at most once per event-loop iteration
+        self._dirty_tabs = set()
+        self._title_dirty = False
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.timeout.connect(self._flush_refresh)
+        # Restored background tabs still waiting to be loaded, in tab order
+        self._prefetch = deque()
+        # Zoom steps not applied yet go to one editor, see zoom_by
+        self._zoom_editor = None
+        self._zoom_target = 0
+        self._zoom_timer = QTimer(self)
+        self._zoom_timer.setSingleShot(True)
+        self._zoom_timer.setInterval(self.zoom_interval_ms)
+        self._zoom_timer.timeout.connect(self._on_zoom_timeout)
         self.initUI()
 
     def initUI(self):
@@ -25,6 +378,10 @@ class Notepad(QMainWindow):
         self.tab_widget.tabCloseRequested.connect(self.close_tab)
         self.setCentralWidget(self.tab_widget)
 
+        # --- Status Bar ---
+        self.format_label = QLabel()
+        self.statusBar().addPermanentWidget(self.format_label)
+
         # --- Initial Tab ---
         self.add_new_tab()
 
@@ -34,6 +391,8 @@ class Notepad(QMainWindow):
         # --- Menu Bar ---
         self.create_menu_bar()
 
+        # Placeholders load on first activation
+        self.tab_widget.currentChanged.connect(self.on_current_tab_changed)
         # Connect signal for window title updates
         self.tab_widget.currentChanged.connect(self.update_window_title)
         self.update_window_title() # Set initial title
@@ -45,16 +404,26 @@ class Notepad(QMainWindow):
         self.open_action = QAction("열기(&O)...", self, shortcut="Ctrl+O", triggered=self.open_file)
         self.save_action = QAction("저장(&S)", self, shortcut="Ctrl+S", triggered=self.save_file)
         self.save_as_action = QAction("다른 이름으로 저장(&A)...", shortcut="Ctrl+Shift+S", triggered=self.save_file_as)
-        self.exit_action = QAction("종료", self, shortcut="Ctrl+Q", triggered=self.close)
+        self.exit_action = QAction("종료", self, shortcut="Ctrl+Q", triggered=quit_application)
 
         # --- Edit Actions ---
         self.undo_action = QAction("실행 취소(&U)", self, shortcut="Ctrl+Z")
         self.undo_action.triggered.connect(lambda: self.get_current_editor() and self.get_current_editor().undo())
+        self.redo_action = QAction("다시 실행(&Y)", self, shortcut="Ctrl+Y")
+        self.redo_action.triggered.connect(lambda: self.get_current_editor() and self.get_current_editor().redo())
+        self.find_action = QAction("찾기(&F)...", self, shortcut="Ctrl+F", triggered=lambda: self.show_find_dialog())
+        self.find_next_action = QAction("다음 찾기(&N)", self, shortcut="F3", triggered=lambda: self.find_next())
+        self.find_prev_action = QAction("이전 찾기(&V)", self, shortcut="Shift+F3", triggered=lambda: self.find_next(backward=True))
+        self.replace_action = QAction("바꾸기(&R)...", self, shortcut="Ctrl+H", triggered=lambda: self.show_find_dialog(replace=True))
+        self.goto_line_action = QAction("줄로 이동(&G)...", self, shortcut="Ctrl+G", triggered=self.goto_line)
 
         # --- View Actions ---
-        self.zoom_in_action = QAction("확대", self, shortcut="Ctrl+=", triggered=self.zoom_in)
-        self.zoom_out_action = QAction("축소", self, shortcut="Ctrl+-", triggered=self.zoom_out)
+        self.zoom_in_action = QAction("확대", self, shortcut="Ctrl+=", triggered=lambda: self.zoom_by(2))
+        self.zoom_out_action = QAction("축소", self, shortcut="Ctrl+-", triggered=lambda: self.zoom_by(-2))
         self.restore_zoom_action = QAction("확대/축소 배율 기본값으로 복원", self, shortcut="Ctrl+0", triggered=self.restore_zoom)
+        self.editor_stats_action = QAction("편집기 통계", self, triggered=self.show_editor_stats)
+        self.undo_stats_action = QAction("실행 취소 메모리", self, triggered=self.show_undo_stats)
+        self.follow_tail_action = QAction("끝 따라가기(&T)", self, checkable=True, toggled=self.set_follow_tail)
 
     def create_menu_bar(self):
         menu_bar = self.menuBar()
@@ -72,6 +441,13 @@ class Notepad(QMainWindow):
         # Edit Menu
         edit_menu = menu_bar.addMenu("편집(&E)")
         edit_menu.addAction(self.undo_action)
+        edit_menu.addAction(self.redo_action)
+        edit_menu.addSeparator()
+        edit_menu.addAction(self.find_action)
+        edit_menu.addAction(self.find_next_action)
+        edit_menu.addAction(self.find_prev_action)
+        edit_menu.addAction(self.replace_action)
+        edit_menu.addAction(self.goto_line_action)
 
         # View Menu
         view_menu = menu_bar.addMenu("보기(&V)")
@@ -79,41 +455,123 @@ class Notepad(QMainWindow):
         zoom_menu.addAction(self.zoom_in_action)
         zoom_menu.addAction(self.zoom_out_action)
         zoom_menu.addAction(self.restore_zoom_action)
+        view_menu.addAction(self.follow_tail_action)
+        view_menu.addSeparator()
+        view_menu.addAction(self.editor_stats_action)
+        view_menu.addAction(self.undo_stats_action)
 
     def get_current_editor(self):
         if self.tab_widget.count() == 0:
             return None
-        return self.tab_widget.currentWidget()
+        widget = self.tab_widget.currentWidget()
+        # Viewer tabs and placeholders have no editable document
+        if not isinstance(widget, EditorMixin):
+            return None
+        return widget
 
-    def on_modification_changed(self, is_modified):
-        current_index = self.tab_widget.currentIndex()
-        if current_index == -1:
+    def on_modification_changed(self, editor, is_modified):
+        # Chunks appended while loading are not edits
+        if editor.property("loader") is not None:
             return
-        
-        tab_text = self.tab_widget.tabText(current_index)
-        # Remove existing asterisk if present
-        if tab_text.endswith('*'):
-            tab_text = tab_text[:-1]
+        state = editor.property("tab_state")
+        if state.modified != is_modified:
+            state.modified = is_modified
+            self.schedule_refresh(editor)
 
-        if is_modified:
-            self.tab_widget.setTabText(current_index, tab_text + '*')
-        else:
-            self.tab_widget.setTabText(current_index, tab_text)
-        
-        self.update_window_title()
+    # --- Tab labels and title ---
+    def schedule_refresh(self, editor=None):
+        """Queue a label refresh for `editor` (None: just the title) for the next event-loop pass."""
+        if editor is not None:
+            self._dirty_tabs.add(editor)
+        self._title_dirty = True
+        if not self._refresh_timer.isActive():
+            self._refresh_timer.start(0)
 
-    def add_new_tab(self, file_path=None, content=''):
-        editor = QTextEdit()
+    def _flush_refresh(self):
+        dirty, self._dirty_tabs = self._dirty_tabs, set()
+        for editor in dirty:
+            index = self.tab_widget.indexOf(editor)
+            if index == -1:
+                continue
+            state = editor.property("tab_state")
+            label = state.tab_label()
+            # setTabText relayouts the tab bar even for identical text
+            if label != state.label:
+                state.label = label
+                self.tab_widget.setTabText(index, label)
+        if self._title_dirty:
+            self._title_dirty = False
+            self.update_window_title()
+
+    def set_file_path(self, editor, path):
+        editor.setProperty("file_path", path)
+        editor.property("tab_state").set_path(path)
+        self.schedule_refresh(editor)
+        self._update_highlighter(editor)
+
+    def _update_highlighter(self, editor):
+        """Attach the highlighter for the editor's file type, or remove it if there is none."""
+        path = editor.property("file_path")
+        highlighter = editor.property("highlighter")
+        language = None
+        if self.syntax_highlighting and path is not None:
+            from notepad_highlight import language_for_path
+            language = language_for_path(path)
+        if highlighter is not None:
+            if highlighter.language is language:
+                return
+            highlighter.detach()
+            highlighter = None
+        if language is not None:
+            from notepad_highlight import ViewportHighlighter
+            highlighter = ViewportHighlighter(editor, language)
+        editor.setProperty("highlighter", highlighter)
+
+    def _init_editor(self, file_path):
+        editor = self.editor_class()
         editor.setFont(self.default_font)
         editor.setProperty("file_path", file_path)
-        editor.setPlainText(content)
-        editor.document().modificationChanged.connect(self.on_modification_changed)
-        
-        tab_name = "제목 없음" if file_path is None else os.path.basename(file_path)
-        index = self.tab_widget.addTab(editor, tab_name)
-        self.tab_widget.setCurrentIndex(index)
-        # on_modification_changed(False) will be called automatically, removing the '*'
+        editor.setProperty("tab_state", TabState(file_path))
+        editor.document().modificationChanged.connect(lambda modified: self.on_modification_changed(editor, modified))
+        # Counts edits so a finished save can tell whether the document moved on
+        editor.setProperty("edit_seq", 0)
+        editor.document().contentsChanged.connect(lambda: editor.setProperty("edit_seq", editor.property("edit_seq") + 1))
+        editor.undo_history = UndoHistory(editor, self.undo_memory_budget, self.undo_spill_budget, undo_budget())
+        self._update_highlighter(editor)
+        return editor
+
+    def add_new_tab(self, file_path=None, content=''):
+        editor = self._init_editor(file_path)
+        editor.setProperty("text_format", DEFAULT_FORMAT)
+        editor.set_text(content)
         editor.document().setModified(False)
+        if autosave_journal:
+            autosave_journal.attach(editor, self, text=content or None)
+
+        state = editor.property("tab_state")
+        state.label = state.tab_label()
+        index = self.tab_widget.addTab(editor, state.label)
+        self.tab_widget.setCurrentIndex(index)
+        return editor
+
+    def restore_recovered_tabs(self, tabs):
+        """Reopen (path, text) pairs from the journal; text is None for unmodified files."""
+        initial_editor = self.get_current_editor()
+        for path, text in tabs:
+            if text is not None:
+                editor = self.add_new_tab(file_path=path, content=text)
+                editor.document().setModified(True)
+            elif path is not None:
+                self.open_paths([path])
+        self._drop_initial_tab(initial_editor)
+
+    def _drop_initial_tab(self, initial_editor):
+        """Remove the untitled tab a new window starts with, if it was left untouched."""
+        if self.tab_widget.count() > 1 and self.tab_widget.indexOf(initial_editor) != -1 \
+                and not initial_editor.property("file_path") and not initial_editor.document().isModified():
+            self.tab_widget.removeTab(self.tab_widget.indexOf(initial_editor))
+            if autosave_journal:
+                autosave_journal.detach(initial_editor)
 
     def new_window(self):
         new_win = Notepad()
@@ -127,90 +585,683 @@ class Notepad(QMainWindow):
              if not self.maybe_save():
                  return
 
-        paths, _ = QFileDialog.getOpenFileNames(self, "열기", "", "텍스트 문서 (*.txt);;모든 파일 (*.*)")
+        paths, _ = QFileDialog.getOpenFileNames(self, "열기", "",
+                                                "텍스트 문서 (*.txt);;압축 파일 (*.gz *.zst);;모든 파일 (*.*)")
         if paths:
-            for path in paths:
-                try:
-                    with open(path, 'r', encoding='utf-8') as f:
-                        text = f.read()
-                except Exception as e:
-                    QMessageBox.warning(self, "오류", f"'{os.path.basename(path)}' 파일을 열 수 없습니다: {e}")
+            self.open_paths(paths)
+
+    def open_paths(self, paths):
+        last_placeholder = None
+        for path in paths:
+            # Check if an empty, unmodified tab is available
+            current_editor = self.get_current_editor()
+            is_new_and_empty = current_editor and not current_editor.property("file_path") and not current_editor.toPlainText() and not current_editor.document().isModified()
+
+            if self._file_size(path) >= self.viewer_threshold and self.add_viewer_tab(path):
+                continue
+            elif is_new_and_empty and len(paths) == 1:
+                # Use the current empty tab only if opening a single file
+                editor = current_editor
+                self.set_file_path(editor, path)
+            else:
+                # Otherwise, open in a new tab that loads once it is shown
+                last_placeholder = self.add_placeholder_tab(path)
+                continue
+            self._start_loading(editor, path)
+        if last_placeholder is not None:
+            self.tab_widget.setCurrentWidget(last_placeholder)
+
+    # --- Lazy tabs ---
+    def add_placeholder_tab(self, path, view_state=None, loaded_mtime=None, index=-1, zoom=0):
+        placeholder = TabPlaceholder(path, view_state, loaded_mtime, zoom)
+        index = self.tab_widget.insertTab(index, placeholder, os.path.basename(path))
+        if autosave_journal:
+            autosave_journal.attach_placeholder(placeholder, self)
+        return placeholder
+
+    def on_current_tab_changed(self, index):
+        global _activation_clock
+        widget = self.tab_widget.widget(index)
+        if isinstance(widget, TabPlaceholder):
+            widget = self.materialize_tab(widget)
+        if isinstance(widget, EditorMixin):
+            _activation_clock += 1
+            widget.setProperty("last_active", _activation_clock)
+            self.enforce_memory_budget()
+        self.follow_tail_action.blockSignals(True)
+        self.follow_tail_action.setChecked(bool(widget is not None and widget.property("follow_tail")))
+        self.follow_tail_action.setEnabled(isinstance(widget, EditorMixin))
+        self.follow_tail_action.blockSignals(False)
+
+    def _swap_tab_widget(self, old, new):
+        index = self.tab_widget.indexOf(old)
+        label = self.tab_widget.tabText(index)
+        was_current = self.tab_widget.currentIndex() == index
+        # Swapping must not look like the user switching tabs
+        self.tab_widget.blockSignals(True)
+        self.tab_widget.insertTab(index, new, label)
+        self.tab_widget.removeTab(index + 1)
+        if was_current:
+            self.tab_widget.setCurrentIndex(index)
+        self.tab_widget.blockSignals(False)
+        if autosave_journal:
+            autosave_journal.detach(old)
+        old.deleteLater()
+
+    def materialize_tab(self, placeholder, focus=True):
+        editor = self._init_editor(placeholder.path)
+        editor.setProperty("view_state", placeholder.view_state)
+        if placeholder.zoom:
+            self.set_zoom(editor, placeholder.zoom)
+        if placeholder.loaded_mtime is not None and placeholder.loaded_mtime != self._file_mtime(placeholder.path):
+            self.statusBar().showMessage(f"'{os.path.basename(placeholder.path)}' 파일이 디스크에서 변경되어 다시 불러왔습니다.", 5000)
+        self._swap_tab_widget(placeholder, editor)
+        self._start_loading(editor, placeholder.path)
+        if focus:
+            editor.setFocus()
+        return editor
+
+    def evict_tab(self, editor):
+        """Drop an unmodified editor back to a placeholder; it reloads from disk when revisited."""
+        cursor = editor.textCursor().position()
+        scroll = editor.verticalScrollBar().value()
+        placeholder = TabPlaceholder(editor.property("file_path"), (cursor, scroll), editor.property("loaded_mtime"),
+                                     self.zoom_level(editor))
+        self._swap_tab_widget(editor, placeholder)
+        if autosave_journal:
+            autosave_journal.attach_placeholder(placeholder, self)
+
+    def _file_mtime(self, path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def enforce_memory_budget(self):
+        editors = []
+        total = 0
+        for window in notepad_instances or [self]:
+            current = window.tab_widget.currentWidget()
+            for i in range(window.tab_widget.count()):
+                editor = window.tab_widget.widget(i)
+                if not isinstance(editor, EditorMixin):
                     continue
-                
-                # Check if an empty, unmodified tab is available
-                current_editor = self.get_current_editor()
-                is_new_and_empty = current_editor and not current_editor.property("file_path") and not current_editor.toPlainText() and not current_editor.document().isModified()
-
-                if is_new_and_empty and len(paths) == 1:
-                    # Use the current empty tab only if opening a single file
-                    current_index = self.tab_widget.currentIndex()
-                    current_editor.setPlainText(text)
-                    current_editor.setProperty("file_path", path)
-                    self.tab_widget.setTabText(current_index, os.path.basename(path))
-                    current_editor.document().setModified(False)
+                total += editor.memory_estimate()
+                evictable = (editor is not current and editor.property("file_path")
+                             and not editor.document().isModified()
+                             and editor.property("loader") is None and editor.property("save_job") is None)
+                if evictable:
+                    editors.append((editor.property("last_active") or 0, window, editor))
+        editors.sort(key=lambda entry: entry[0])
+        for _, window, editor in editors:
+            if total <= self.tab_memory_budget:
+                break
+            total -= editor.memory_estimate()
+            window.evict_tab(editor)
+
+    def _file_size(self, path):
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0  # Let the loader report the real error
+
+    # --- Session ---
+    def session_tab(self, widget):
+        """What restore_session needs to reopen a tab, or None for a tab without a file."""
+        if is_viewer(widget):
+            return {'path': widget.path}
+        path = widget.property("file_path")
+        if path is None:
+            return None
+        if isinstance(widget, TabPlaceholder):
+            view_state, zoom = widget.view_state, widget.zoom
+        else:
+            view_state = widget.property("view_state") if widget.property("loader") is not None \
+                else (widget.textCursor().position(), widget.verticalScrollBar().value())
+            zoom = self.zoom_level(widget)
+        tab = {'path': path}
+        if view_state:
+            tab['cursor'], tab['scroll'] = view_state
+        if zoom:
+            tab['zoom'] = zoom
+        return tab
+
+    def session_state(self, current_widget=None):
+        current_widget = current_widget or self.tab_widget.currentWidget()
+        tabs = []
+        current = 0
+        for i in range(self.tab_widget.count()):
+            widget = self.tab_widget.widget(i)
+            tab = self.session_tab(widget)
+            if tab is None:
+                continue
+            if widget is current_widget:
+                current = len(tabs)
+            tabs.append(tab)
+        geometry = bytes(self.saveGeometry().toBase64()).decode('ascii')
+        return {'geometry': geometry, 'current': current, 'tabs': tabs}
+
+    def restore_session(self, state):
+        """Reopen a saved window. Only the current tab loads right away; the rest follow in the background."""
+        if state.get('geometry'):
+            self.restoreGeometry(QByteArray.fromBase64(state['geometry'].encode('ascii')))
+        initial_editor = self.get_current_editor()
+        restored = {}
+        for number, tab in enumerate(state['tabs']):
+            path = tab['path']
+            if not os.path.isfile(path):
+                continue
+            widget = self.add_viewer_tab(path) if self._file_size(path) >= self.viewer_threshold else None
+            if widget is None:
+                view_state = (tab['cursor'], tab['scroll']) if 'cursor' in tab else None
+                widget = self.add_placeholder_tab(path, view_state, zoom=tab.get('zoom', 0))
+            if widget is not None:
+                restored[number] = widget
+        if not restored:
+            return
+        # Activating the current tab materializes it, before the initial tab goes away
+        current = restored.get(state.get('current'), next(iter(restored.values())))
+        self.tab_widget.setCurrentWidget(current)
+        self._drop_initial_tab(initial_editor)
+        self._prefetch.extend(widget for widget in restored.values() if isinstance(widget, TabPlaceholder))
+        QTimer.singleShot(0, self._prefetch_next)
+
+    def _prefetch_next(self):
+        """Load the next restored background tab: one at a time, and only while it fits the memory budget."""
+        while self._prefetch and self.tab_widget.indexOf(self._prefetch[0]) == -1:
+            self._prefetch.popleft()  # Activated by the user meanwhile, or closed
+        if not self._prefetch:
+            return
+        loaded = 0
+        for window in notepad_instances or [self]:
+            for i in range(window.tab_widget.count()):
+                editor = window.tab_widget.widget(i)
+                if not isinstance(editor, EditorMixin):
+                    continue
+                if window is self and editor.property("loader") is not None:
+                    return  # Called again once that load ends
+                loaded += editor.memory_estimate()
+        placeholder = self._prefetch[0]
+        if loaded + self._estimate_memory(placeholder.path) > self.tab_memory_budget:
+            # Anything loaded beyond the budget would just be evicted again
+            self._prefetch.clear()
+            return
+        self._prefetch.popleft()
+        self.materialize_tab(placeholder, focus=False)
+
+    def _estimate_memory(self, path):
+        """Guess what EditorMixin.memory_estimate will say once `path` is loaded, from its size and first lines."""
+        size = self._file_size(path)
+        try:
+            with open(path, 'rb') as f:
+                sample = f.read(SNIFF_BYTES)
+                compression = sniff_compression(sample)
+                if compression:
+                    # Less than on disk means the guess is off, see decompressed_size
+                    size = max(decompressed_size(f, compression, size) or 0, size)
+                    f.seek(0)
+                    sample = open_decompressed(f, compression).read(SNIFF_BYTES)
+        except Exception:
+            # Unreadable or corrupt; the load will report it
+            return size * 2
+        blocks = size * (sample.count(b'\n') + 1) // max(len(sample), 1)
+        return size * 2 + blocks * self.editor_class.BLOCK_OVERHEAD
+
+    # --- Large file viewer ---
+    def add_viewer_tab(self, path):
+        """Open a viewer tab; returns None if the file has to go to an editor instead."""
+        try:
+            with open(path, 'rb') as f:
+                head = f.read(SNIFF_BYTES)
+            # The viewer maps the file as it is on disk; compressed files are streamed into an editor
+            if sniff_compression(head):
+                return None
+            fmt, _ = sniff_format(head)
+            # The line index looks for b'\n', which UTF-16/32 text does not have
+            if not is_ascii_compatible(fmt.encoding):
+                return None
+            from notepad_viewer import LargeFileViewer
+            viewer = LargeFileViewer(path, self.default_font, codec_name(fmt.encoding))
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "오류", f"'{os.path.basename(path)}' 파일을 열 수 없습니다: {e}")
+            return None
+        viewer.setProperty("text_format", fmt)
+        viewer.edit_requested.connect(lambda: self.switch_viewer_to_editor(viewer))
+        index = self.tab_widget.addTab(viewer, os.path.basename(path))
+        self.tab_widget.setCurrentIndex(index)
+        return viewer
+
+    def switch_viewer_to_editor(self, viewer):
+        index = self.tab_widget.indexOf(viewer)
+        if index == -1:
+            return
+        size_mb = self._file_size(viewer.path) / (1024 * 1024)
+        ret = QMessageBox.question(self, "메모장",
+                                   f"이 파일은 읽기 전용 보기 모드로 열려 있습니다.\n"
+                                   f"편집하려면 파일 전체({size_mb:,.0f} MB)를 편집기로 불러와야 합니다. 계속하시겠습니까?",
+                                   QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        if ret != QMessageBox.Yes:
+            return
+        path = viewer.path
+        self.tab_widget.removeTab(index)
+        viewer.close_file()
+        viewer.deleteLater()
+        editor = self.add_new_tab(file_path=path)
+        self.tab_widget.tabBar().moveTab(self.tab_widget.indexOf(editor), index)
+        self._start_loading(editor, path)
+
+    # --- Find / replace ---
+    def show_find_dialog(self, replace=False):
+        if self.find_dialog is None:
+            from notepad_search import FindReplaceDialog
+            self.find_dialog = FindReplaceDialog(self)
+            self.find_dialog.find_in_all_tabs_requested.connect(self.find_in_all_tabs)
+        self.find_dialog.show_for(replace)
+
+    def find_next(self, backward=False):
+        if self.find_dialog is None or not self.find_dialog.find_edit.text():
+            self.show_find_dialog()
+        else:
+            self.find_dialog.find_next(backward)
+
+    def find_in_all_tabs(self, options):
+        targets = []
+        skipped = []
+        for window_number, window in enumerate(notepad_instances, 1):
+            for i in range(window.tab_widget.count()):
+                widget = window.tab_widget.widget(i)
+                if is_viewer(widget) or isinstance(widget, TabPlaceholder):
+                    label = os.path.basename(widget.path)
+                else:
+                    label = widget.property("tab_state").display_name
+                if len(notepad_instances) > 1:
+                    label = f"[{window_number}] {label}"
+                if is_viewer(widget):
+                    # Too large to hold as text, which is why it is in the viewer
+                    skipped.append((label, "읽기 전용 보기"))
                 else:
-                    # Otherwise, open in a new tab
-                    self.add_new_tab(file_path=path, content=text)
+                    # Not loaded yet, evicted, or still loading: the file on disk is what the tab will show
+                    on_disk = isinstance(widget, TabPlaceholder) or widget.property("loader") is not None
+                    targets.append((window, widget, label, widget.property("file_path"), on_disk))
+        if self.results_dock is None:
+            from notepad_search import SearchResultsDock
+            self.results_dock = SearchResultsDock(self)
+            self.addDockWidget(Qt.BottomDockWidgetArea, self.results_dock)
+        self.results_dock.search(targets, options, skipped)
+
+    def goto_line(self):
+        widget = self.tab_widget.currentWidget()
+        if widget is None:
+            return
+        if is_viewer(widget):
+            maximum = widget.index.line_count
+        else:
+            maximum = widget.document().blockCount()
+        line, ok = QInputDialog.getInt(self, "줄로 이동", "줄 번호:", 1, 1, maximum)
+        if not ok:
+            return
+        if is_viewer(widget):
+            widget.goto_line(line)
+        else:
+            cursor = QTextCursor(widget.document().findBlockByNumber(line - 1))
+            widget.setTextCursor(cursor)
+            widget.ensureCursorVisible()
+
+    # --- Outside changes ---
+    def check_file(self, editor):
+        """Catch up with changes made to an editor's file by other programs.
+
+        Appended bytes are decoded and appended to the document; a file
+        that was rewritten or truncated is reloaded. Tabs with unsaved
+        edits are never touched, the status bar just says so.
+        """
+        path = editor.property("file_path")
+        state = editor.property("disk_state")
+        # A running load or save re-reads the state when it lands
+        if state is None or editor.property("loader") is not None or editor.property("save_job") is not None:
+            return
+        if editor.document().isModified():
+            if self._file_mtime(path) != state.mtime:
+                self.statusBar().showMessage(f"'{os.path.basename(path)}' 파일이 디스크에서 변경되었습니다.", 5000)
+            return
+        # Bytes appended to a compressed file are no text by themselves; any growth reloads it
+        compressed = editor.property("text_format").compression
+        appended = read_appended(path, state, 0 if compressed else self.max_append_bytes)
+        if appended is not None:
+            data, state = appended
+            decoder = editor.property("tail_decoder") or StreamDecoder(editor.property("text_format"))
+            try:
+                text = decoder.decode(data)
+            except UnicodeDecodeError:
+                appended = None  # Not in the detected encoding any more; let the loader work it out
+        if appended is None:
+            if not os.path.exists(path):
+                editor.setProperty("disk_state", None)
+                self.statusBar().showMessage(f"'{os.path.basename(path)}' 파일이 디스크에서 삭제되었습니다.", 5000)
+                return
+            if not editor.property("follow_tail"):
+                cursor = editor.textCursor().position()
+                editor.setProperty("view_state", (cursor, editor.verticalScrollBar().value()))
+            self._start_loading(editor, path)
+            return
+        editor.setProperty("disk_state", state)
+        editor.setProperty("tail_decoder", decoder)
+        editor.setProperty("loaded_mtime", state.mtime)
+        if text:
+            self._append_from_disk(editor, text)
+
+    def _append_from_disk(self, editor, text):
+        scroll_bar = editor.verticalScrollBar()
+        scroll = scroll_bar.value()
+        doc = editor.document()
+        if autosave_journal:
+            autosave_journal.detach(editor)
+        # Like a load, the new text is not an edit the user could undo; being
+        # an append, it leaves the undo history valid
+        editor.append_text(text)
+        doc.setModified(False)
+        if autosave_journal:
+            autosave_journal.attach(editor, self)
+        if editor.property("follow_tail"):
+            self._scroll_to_end(editor)
+        else:
+            scroll_bar.setValue(scroll)
 
-    def save_file(self):
+    def _scroll_to_end(self, editor):
+        editor.moveCursor(QTextCursor.End)
+        editor.verticalScrollBar().setValue(editor.verticalScrollBar().maximum())
+
+    def set_follow_tail(self, follow):
         editor = self.get_current_editor()
-        if not editor:
+        if editor is None:
+            return
+        editor.setProperty("follow_tail", follow)
+        if follow and editor.property("loader") is None:
+            self._scroll_to_end(editor)
+
+    # --- Streaming load ---
+    def _start_loading(self, editor, path):
+        if autosave_journal:
+            autosave_journal.detach(editor)
+        loader = ChunkedFileLoader(path)
+        editor.setProperty("loader", loader)
+        editor.setProperty("disk_state", None)
+        editor.setReadOnly(True)
+        doc = editor.document()
+        # Also clears the undo history; the chunks appended after it are not edits
+        doc.clear()
+
+        loader.signals.format_detected.connect(lambda fmt: editor.setProperty("text_format", fmt))
+        loader.signals.restarted.connect(lambda fmt: self._restart_loading(editor, loader, fmt))
+        loader.signals.chunk.connect(lambda text: self._append_chunk(editor, loader, text))
+        loader.signals.progress.connect(lambda done, total: self._show_load_progress(editor, done, total))
+        loader.signals.finished.connect(lambda: self._finish_loading(editor, loader))
+        loader.signals.failed.connect(lambda message: self._fail_loading(editor, loader, message))
+        self._show_load_progress(editor, 0, 0)
+        QThreadPool.globalInstance().start(loader)
+
+    def _append_chunk(self, editor, loader, text):
+        if loader.is_cancelled():
+            return
+        editor.append_text(text)
+        loader.chunk_consumed()
+
+    def _restart_loading(self, editor, loader, fmt):
+        if loader.is_cancelled():
+            return
+        # The sniffed encoding failed further into the file; start over with the next guess
+        editor.setProperty("text_format", fmt)
+        editor.document().clear()
+
+    def _show_load_progress(self, editor, done, total):
+        state = editor.property("tab_state")
+        percent = done * 100 // total if total else 0
+        if state.progress != percent:
+            state.progress = percent
+            self.schedule_refresh(editor)
+
+    def when_loaded(self, editor, callback):
+        """Call `callback(editor)` once the editor's text is loaded: now, or when its load finishes.
+
+        Registered here on the GUI thread rather than on the loader's own
+        signal, which a small file may have emitted already.
+        """
+        if editor.property("loader") is None:
+            callback(editor)
+        else:
+            editor.setProperty("after_load", (editor.property("after_load") or ()) + (callback,))
+
+    def _end_loading(self, editor):
+        editor.setProperty("loader", None)
+        editor.setReadOnly(False)
+        doc = editor.document()
+        doc.setModified(False)
+        state = editor.property("tab_state")
+        state.modified = False
+        state.progress = None
+        self.schedule_refresh(editor)
+        if self._prefetch:
+            QTimer.singleShot(0, self._prefetch_next)
+
+    def _finish_loading(self, editor, loader):
+        if loader.is_cancelled():
+            return
+        self._end_loading(editor)
+        if autosave_journal:
+            autosave_journal.attach(editor, self)
+        editor.setProperty("loaded_mtime", loader.disk_state.mtime)
+        editor.setProperty("disk_state", loader.disk_state)
+        editor.setProperty("tail_decoder", None)
+        file_watcher().watch(loader.path)
+        view_state = editor.property("view_state")
+        if view_state:
+            cursor = editor.textCursor()
+            cursor.setPosition(min(view_state[0], editor.document().characterCount() - 1))
+            editor.setTextCursor(cursor)
+            editor.verticalScrollBar().setValue(view_state[1])
+            editor.setProperty("view_state", None)
+        elif editor.property("follow_tail"):
+            self._scroll_to_end(editor)
+        else:
+            editor.moveCursor(QTextCursor.Start)
+        callbacks = editor.property("after_load") or ()
+        editor.setProperty("after_load", None)
+        for callback in callbacks:
+            callback(editor)
+        self.enforce_memory_budget()
+        # The file may have changed between the last read and now
+        self.check_file(editor)
+        if editor.property("text_format").lossy:
+            QMessageBox.warning(self, "메모장",
+                                f"'{os.path.basename(loader.path)}' 파일의 인코딩을 알 수 없어 일부 문자를 대체 문자로 표시했습니다.\n"
+                                f"저장하면 원본 내용이 바뀔 수 있습니다.")
+
+    def _fail_loading(self, editor, loader, message):
+        if loader.is_cancelled():
+            return
+        self._end_loading(editor)
+        editor.setProperty("after_load", None)
+        QMessageBox.warning(self, "오류", f"'{os.path.basename(loader.path)}' 파일을 열 수 없습니다: {message}")
+        index = self.tab_widget.indexOf(editor)
+        if index == -1:
+            return
+        if self.tab_widget.count() > 1:
+            self.tab_widget.removeTab(index)
+        else:
+            # Keep the window usable with an empty, untitled tab
+            editor.clear()
+            self.set_file_path(editor, None)
+            editor.setProperty("text_format", DEFAULT_FORMAT)
+            editor.document().setModified(False)
+            if autosave_journal:
+                autosave_journal.attach(editor, self)
+
+    def _cancel_loading(self, editor):
+        loader = editor.property("loader")
+        if loader is not None:
+            loader.cancel()
+            editor.setProperty("loader", None)
+            editor.setProperty("after_load", None)
+            return True
+        return False
+
+    def save_file(self, *, wait=False):
+        editor = self.get_current_editor()
+        if not editor or editor.property("loader") is not None:
             return False
             
         path = editor.property("file_path")
         if path is None:
-            return self.save_file_as()
+            return self.save_file_as(wait=wait)
         else:
-            return self._save_to_path(path)
+            return self._save_to_path(path, wait=wait)
 
-    def save_file_as(self):
+    def save_file_as(self, *, wait=False):
         editor = self.get_current_editor()
-        if not editor:
+        if not editor or editor.property("loader") is not None:
             return False
 
         path, _ = QFileDialog.getSaveFileName(self, "다른 이름으로 저장", "제목 없음.txt", "텍스트 문서 (*.txt);;모든 파일 (*.*)")
         if path:
-            return self._save_to_path(path)
+            return self._save_to_path(path, wait=wait)
         return False
 
-    def _save_to_path(self, path):
-        editor = self.get_current_editor()
+    def _save_to_path(self, path, editor=None, wait=False):
+        """Save in the background; with wait=True the write happens before returning."""
+        editor = editor or self.get_current_editor()
         if not editor:
             return False
-            
-        try:
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(editor.toPlainText())
-        except Exception as e:
-            QMessageBox.warning(self, "오류", f"파일을 저장할 수 없습니다: {e}")
-            return False
+
+        job = editor.property("save_job")
+        if job is not None:
+            if not wait:
+                # Writes to one tab never overlap; save again once this one lands
+                editor.setProperty("save_again", path)
+                return True
+            if editor.property("save_again") == path:
+                # The write below supersedes the queued one
+                editor.setProperty("save_again", None)
+            # Finishing a job may start the queued save; wait for that one too
+            self._wait_for_saves(editor)
+
+        text_format = editor.property("text_format") or DEFAULT_FORMAT
+        if path != editor.property("file_path"):
+            # Saved under a new name: compressed if, and as, the name says
+            text_format = text_format._replace(compression=suffix_compression(path))
+        level = self.compression_levels.get(text_format.compression) if text_format.compression else None
+        job = AtomicFileWriter(path, editor.toPlainText(), text_format, level)
+        snapshot_seq = editor.property("edit_seq")
+        job.signals.finished.connect(lambda: self._on_save_finished(editor, job, snapshot_seq))
+        job.signals.failed.connect(lambda message: self._on_save_failed(editor, job, message, wait))
+        editor.setProperty("save_job", job)
+        editor.setProperty("save_again", None)
+        editor.property("tab_state").saving = True
+        self.schedule_refresh(editor)
+        if wait:
+            job.run()
+            return job.error is None or job.retried
+        writer_pool().start(job)
+        return True
+
+    def _on_save_finished(self, editor, job, snapshot_seq):
+        editor.setProperty("save_job", None)
+        editor.property("tab_state").saving = False
+        editor.setProperty("text_format", job.text_format)
+        self.set_file_path(editor, job.path)
+        # Our own write is not an outside change
+        editor.setProperty("disk_state", disk_state(job.path))
+        editor.setProperty("tail_decoder", None)
+        file_watcher().watch(job.path)
+        # Edits made while the write was running are still unsaved
+        if editor.property("edit_seq") == snapshot_seq:
+            editor.document().setModified(False)
+            if autosave_journal:
+                autosave_journal.mark_saved(editor)
+        elif autosave_journal:
+            # The file the journal was based on has been replaced; rebase on the current text
+            autosave_journal.attach(editor, self, text=editor.toPlainText())
+        again = editor.property("save_again")
+        if again is not None:
+            self._save_to_path(again, editor)
+
+    def _on_save_failed(self, editor, job, message, wait=False):
+        editor.setProperty("save_job", None)
+        editor.setProperty("save_again", None)
+        editor.property("tab_state").saving = False
+        self.schedule_refresh(editor)
+        if job.unencodable is not None:
+            # Typed text the file's encoding cannot hold; never leave the tab unsavable
+            text_format = self._choose_encoding(job)
+            if text_format is not None:
+                editor.setProperty("text_format", text_format)
+                job.retried = self._save_to_path(job.path, editor, wait)
+            return
+        QMessageBox.warning(self, "오류", f"파일을 저장할 수 없습니다: {message}")
+
+    def _choose_encoding(self, job):
+        """Ask which encoding to save in instead; returns the new format, or None if cancelled."""
+        fmt = job.text_format
+        box = QMessageBox(QMessageBox.Warning, "메모장",
+                          f"'{job.unencodable}' 문자는 {encoding_name(fmt.encoding)} 인코딩으로 저장할 수 없습니다.\n"
+                          f"UTF-8로 저장하시겠습니까?", parent=self)
+        utf8_button = box.addButton("UTF-8로 저장", QMessageBox.AcceptRole)
+        other_button = box.addButton("다른 인코딩...", QMessageBox.ActionRole)
+        box.addButton(QMessageBox.Cancel)
+        box.setDefaultButton(utf8_button)
+        box.exec_()
+        if box.clickedButton() is utf8_button:
+            encoding = 'utf-8'
+        elif box.clickedButton() is other_button:
+            names = [encoding_name(encoding) for encoding in SAVE_ENCODINGS]
+            name, ok = QInputDialog.getItem(self, "인코딩", "저장할 인코딩:", names, 0, False)
+            if not ok:
+                return None
+            encoding = SAVE_ENCODINGS[names.index(name)]
         else:
-            editor.setProperty("file_path", path)
-            editor.document().setModified(False) # This will trigger on_modification_changed
-            current_index = self.tab_widget.currentIndex()
-            self.tab_widget.setTabText(current_index, os.path.basename(path)) # Update tab text
-            self.update_window_title()
-            return True
+            return None
+        # UTF-16/32 are only recognised again by their BOM
+        return fmt._replace(encoding=encoding, bom=not is_ascii_compatible(encoding), lossy=False)
+
+    def _wait_for_saves(self, editor):
+        job = editor.property("save_job")
+        while job is not None:
+            job.wait()
+            QApplication.processEvents()
+            job = editor.property("save_job")
 
     def maybe_save(self):
         editor = self.get_current_editor()
-        if not editor or not editor.document().isModified():
+        # A tab that is still loading holds a partial copy of the file, never save it
+        if not editor or editor.property("loader") is not None or not editor.document().isModified():
             return True
         
-        tab_name = self.tab_widget.tabText(self.tab_widget.currentIndex()).replace('*','')
+        tab_name = editor.property("tab_state").display_name
         ret = QMessageBox.question(self, "메모장",
                                    f"'{tab_name}'의 내용을 저장하시겠습니까?",
                                    QMessageBox.Save | QMessageBox.Discard | QMessageBox.Cancel)
 
         if ret == QMessageBox.Save:
-            return self.save_file()
+            return self.save_file(wait=True)
         elif ret == QMessageBox.Cancel:
             return False
         return True
 
     def close_tab(self, index):
+        widget = self.tab_widget.widget(index)
+        if is_viewer(widget) or isinstance(widget, TabPlaceholder):
+            if self.tab_widget.count() == 1:
+                self.close()
+            else:
+                self.tab_widget.removeTab(index)
+                if is_viewer(widget):
+                    widget.close_file()
+                elif autosave_journal:
+                    autosave_journal.detach(widget)
+                widget.deleteLater()
+            return
         self.tab_widget.setCurrentIndex(index)
-        if not self.maybe_save():
+        # Closing a tab that is still loading simply cancels the load
+        if not self._cancel_loading(self.tab_widget.widget(index)) and not self.maybe_save():
             return
 
         # If it's the last tab, close the window.
@@ -218,22 +1269,46 @@ class Notepad(QMainWindow):
             self.close()
         else:
             self.tab_widget.removeTab(index)
+            if autosave_journal:
+                autosave_journal.detach(widget)
 
     def closeEvent(self, event):
-        reply = QMessageBox.question(self, '메모장',
-                                     "정말로 닫으시겠습니까?",
-                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        # quit_application has already asked once for all windows
+        reply = QMessageBox.Yes if _quit_session is not None else \
+            QMessageBox.question(self, '메모장',
+                                 "정말로 닫으시겠습니까?",
+                                 QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
 
         if reply == QMessageBox.Yes:
+            # The save prompts below switch tabs; the session keeps the one the user was on
+            current_widget = self.tab_widget.currentWidget()
             # Iterate through all tabs and ask to save if modified
             # We must iterate backwards when removing items
             for i in range(self.tab_widget.count() - 1, -1, -1):
+                # Only editors can hold unsaved changes; don't wake placeholders up
+                if not isinstance(self.tab_widget.widget(i), EditorMixin):
+                    continue
                 self.tab_widget.setCurrentIndex(i)
                 if not self.maybe_save():
                     event.ignore()
                     return
                 # No need to remove tab here, as the whole window is closing
-            
+
+            # Recorded before the loads below are cancelled, so their positions survive
+            if _quit_session is not None:
+                _quit_session.append(self.session_state(current_widget))
+            elif notepad_instances == [self]:
+                write_session([self.session_state(current_widget)])
+
+            for i in range(self.tab_widget.count()):
+                widget = self.tab_widget.widget(i)
+                if is_viewer(widget):
+                    widget.close_file()
+                else:
+                    self._cancel_loading(widget)
+                    self._wait_for_saves(widget)
+                    if autosave_journal:
+                        autosave_journal.detach(widget)
             event.accept()
             # Remove the instance from the global list to allow Python to exit
             if self in notepad_instances:
@@ -242,40 +1317,229 @@ class Notepad(QMainWindow):
             event.ignore()
 
     def update_window_title(self):
+        widget = self.tab_widget.currentWidget()
+        text_format = widget.property("text_format") if widget is not None else None
+        self.format_label.setText(describe(text_format) if text_format else "")
+        if is_viewer(widget):
+            self.setWindowTitle(f"{os.path.basename(widget.path)} [읽기 전용] - 메모장")
+            return
         editor = self.get_current_editor()
         if not editor:
             self.setWindowTitle("메모장")
             return
 
-        path = editor.property("file_path")
-        title = "제목 없음"
-        if path:
-            title = os.path.basename(path)
-        
-        if editor.document().isModified():
+        state = editor.property("tab_state")
+        title = state.display_name
+        if state.modified:
             title += "*"
-            
         self.setWindowTitle(f"{title} - 메모장")
 
-    def zoom_in(self):
+    # --- Zoom ---
+    def zoom_level(self, editor):
+        """Font points `editor` shows on top of default_font."""
+        return editor.property("zoom") or 0
+
+    def set_zoom(self, editor, level):
+        level = max(self.min_zoom, min(self.max_zoom, level))
+        editor.setProperty("zoom", level)
+        # Every font change invalidates the layout of the whole document
+        if editor.font().pointSize() != self.default_font.pointSize() + level:
+            font = QFont(self.default_font)
+            font.setPointSize(self.default_font.pointSize() + level)
+            editor.setFont(font)
+
+    def zoom_by(self, points):
+        """Zoom the current editor. The first step is immediate, later ones at most every zoom_interval_ms."""
         editor = self.get_current_editor()
-        if editor:
-            editor.zoomIn(2)
+        if not editor:
+            return
+        if editor is not self._zoom_editor:
+            self._apply_pending_zoom()
+            self._zoom_target = self.zoom_level(editor)
+        self._zoom_target = max(self.min_zoom, min(self.max_zoom, self._zoom_target + points))
+        self._zoom_editor = editor
+        if not self._zoom_timer.isActive():
+            self._apply_pending_zoom()
+            self._zoom_timer.start()
 
-    def zoom_out(self):
+    def _apply_pending_zoom(self):
+        editor, self._zoom_editor = self._zoom_editor, None
+        # The tab may have been closed or evicted meanwhile
+        if editor is not None and self.tab_widget.indexOf(editor) != -1:
+            self.set_zoom(editor, self._zoom_target)
+
+    def _on_zoom_timeout(self):
+        if self._zoom_editor is not None:
+            self._apply_pending_zoom()
+            self._zoom_timer.start()
+
+    def show_editor_stats(self):
         editor = self.get_current_editor()
-        if editor:
-            editor.zoomOut(2)
+        if not editor:
+            return
+        stats = editor.stats()
+        QMessageBox.information(self, "편집기 통계",
+                                f"엔진: {stats['engine']}\n"
+                                f"문자 수: {stats['characters']:,}\n"
+                                f"블록(줄) 수: {stats['blocks']:,}\n"
+                                f"예상 메모리: {stats['memory_estimate'] / (1024 * 1024):,.1f} MB\n"
+                                f"불러오기/배치 시간: {stats['layout_ms']:,.1f} ms\n"
+                                f"그리기: {stats['paint_count']:,}회, {stats['paint_ms']:,.1f} ms")
+
+    def show_undo_stats(self):
+        mb = 1024 * 1024
+        lines = []
+        for number, window in enumerate(notepad_instances, 1):
+            for index in range(window.tab_widget.count()):
+                widget = window.tab_widget.widget(index)
+                if not isinstance(widget, EditorMixin) or widget.undo_history is None:
+                    continue
+                stats = widget.undo_history.stats()
+                lines.append(f"[창 {number}] {window.tab_widget.tabText(index)}: "
+                             f"메모리 {stats['memory'] / mb:,.1f} MB, "
+                             f"실행 취소 {stats['undo_steps']:,}단계, 다시 실행 {stats['redo_steps']:,}단계, "
+                             f"디스크 {stats['spilled_steps']:,}단계 {stats['spilled_bytes'] / mb:,.1f} MB "
+                             f"(파일 {stats['spill_file_bytes'] / mb:,.1f} MB), "
+                             f"버린 단계 {stats['evicted_steps']:,}")
+        budget = undo_budget()
+        lines.append(f"\n전체 메모리: {budget.total / mb:,.1f} MB / {budget.cap / mb:,.0f} MB "
+                     f"(탭당 {self.undo_memory_budget / mb:,.0f} MB, 디스크 탭당 {self.undo_spill_budget / mb:,.0f} MB)")
+        QMessageBox.information(self, "실행 취소 메모리", "\n".join(lines))
 
     def restore_zoom(self):
         editor = self.get_current_editor()
         if editor:
-            editor.setFont(self.default_font)
+            if editor is self._zoom_editor:
+                self._zoom_editor = None
+            self.set_zoom(editor, 0)
+
+def ask_to_recover(journal_dir):
+    """Offer to restore tabs left behind by a crashed session. Returns windows to restore."""
+    orphans = find_orphaned_journals(journal_dir)
+    if not orphans:
+        return []
+    windows = recover_tabs(orphans)
+    # Drop the old journals now: the new session journals whatever gets restored
+    discard_journals(orphans)
+    if not windows:
+        return []
+    tab_count = sum(len(tabs) for tabs in windows)
+    ret = QMessageBox.question(None, "메모장",
+                               f"이전 세션이 비정상적으로 종료되었습니다.\n"
+                               f"창 {len(windows)}개, 탭 {tab_count}개를 복구하시겠습니까?",
+                               QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
+    return windows if ret == QMessageBox.Yes else []
+
+
+def on_files_changed(paths):
+    """Hand watcher reports to the tabs showing those files; forget files no tab has open."""
+    unclaimed = set(paths)
+    for window in list(notepad_instances):
+        for i in range(window.tab_widget.count()):
+            editor = window.tab_widget.widget(i)
+            if isinstance(editor, EditorMixin) and editor.property("file_path") in paths:
+                unclaimed.discard(editor.property("file_path"))
+                window.check_file(editor)
+    for path in unclaimed:
+        file_watcher().unwatch(path)
+
+
+def write_session(windows):
+    if session_path is None:
+        return
+    try:
+        save_session(session_path, windows)
+    except OSError:
+        pass  # Losing the session must never keep the application from exiting
+
+
+def quit_application():
+    """Close every window after a single confirmation; all of them are restored next time."""
+    global _quit_session
+    ret = QMessageBox.question(QApplication.activeWindow(), "메모장",
+                               "모든 창을 닫고 메모장을 종료하시겠습니까?",
+                               QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+    if ret != QMessageBox.Yes:
+        return
+    _quit_session = []
+    try:
+        for window in list(notepad_instances):
+            if not window.close():
+                return  # Cancelled in a save prompt; the remaining windows stay open
+        write_session(_quit_session)
+    finally:
+        _quit_session = None
+
+
+def open_forwarded_paths(paths):
+    """Files from a later launch open in the active window; a bare launch gets a new window."""
+    window = QApplication.activeWindow()
+    if not isinstance(window, Notepad):
+        window = notepad_instances[-1] if notepad_instances else None
+    if window is None or not paths:
+        window = Notepad()
+        notepad_instances.append(window)
+        window.show()
+    if paths:
+        window.open_paths(paths)
+    if window.isMinimized():
+        window.showNormal()
+    window.raise_()
+    window.activateWindow()
+
 
 if __name__ == '__main__':
+    startup_profile.mark('imports')
     app = QApplication(sys.argv)
+    app.setApplicationName("notepad")
+    startup_profile.mark('qapplication')
+    # Claim the socket before the slow startup work below, so a launch racing
+    # this one finds us. A profiling run may sit next to a real instance, so
+    # it leaves the socket alone.
+    instance_server = None
+    if not startup_profile.enabled:
+        instance_server = InstanceServer()
+        if not instance_server.is_listening() and \
+                forward_to_running_instance([arg for arg in sys.argv[1:] if not arg.startswith('-')]):
+            # Another copy started between our first check and now; it takes our files
+            sys.exit(0)
+        # A modal dialog below may run the event loop; hold requests until there are windows
+        early_requests = []
+        instance_server.open_requested.connect(early_requests.append)
+    data_dir = QStandardPaths.writableLocation(QStandardPaths.AppLocalDataLocation)
+    journal_dir = os.path.join(data_dir, "journal")
+    recovered_windows = ask_to_recover(journal_dir)
+    autosave_journal = AutosaveJournal(journal_dir)
+    startup_profile.mark('journal')
+    session_path = os.path.join(data_dir, "session.json")
+    # After a crash the journal is the newer record of what was open
+    session_windows = [] if recovered_windows else load_session(session_path)
+    startup_profile.mark('session')
+
     # Keep a reference to the window to prevent it from being garbage collected
-    main_window = Notepad()
-    notepad_instances.append(main_window)
-    main_window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    for index in range(max(len(recovered_windows), len(session_windows), 1)):
+        main_window = Notepad()
+        notepad_instances.append(main_window)
+        if recovered_windows:
+            main_window.restore_recovered_tabs(recovered_windows[index])
+        elif session_windows:
+            main_window.restore_session(session_windows[index])
+        if main_window is notepad_instances[0]:
+            startup_profile.mark('init_ui')
+            startup_profile.watch_first_paint(main_window)
+        main_window.show()
+    file_args = [os.path.abspath(arg) for arg in sys.argv[1:] if not arg.startswith('-')]
+    if file_args:
+        main_window.open_paths(file_args)
+
+    # Later launches forward their files here instead of starting a new process
+    if instance_server is not None:
+        instance_server.open_requested.disconnect()
+        instance_server.open_requested.connect(open_forwarded_paths)
+        for paths in early_requests:
+            open_forwarded_paths(paths)
+    exit_code = app.exec_()
+    # Let background saves land before the interpreter goes away
+    writer_pool().waitForDone()
+    autosave_journal.shutdown()
+    sys.exit(exit_code)
\ No newline at end of file
@@ -0,0 +1,93 @@
+import os
+import gzip
+
+# zstandard is optional and only imported once a .zst file is opened or saved
+
+# Compression is recognised by these leading bytes, whatever the file is called
+_MAGIC = [
+    (b'\x1f\x8b', 'gzip'),
+    (b'\x28\xb5\x2f\xfd', 'zstd'),
+]
+MAGIC_BYTES = max(len(magic) for magic, _ in _MAGIC)
+
+# Used by "save as" to pick a codec from the new file name
+_SUFFIXES = {'.gz': 'gzip', '.gzip': 'gzip', '.zst': 'zstd', '.zstd': 'zstd'}
+
+DEFAULT_LEVELS = {'gzip': 6, 'zstd': 3}
+
+# Compressed bytes read per call while decompressing
+READ_SIZE = 256 * 1024
+
+
+def sniff_compression(head):
+    """'gzip', 'zstd' or None, from the first MAGIC_BYTES of a file."""
+    for magic, compression in _MAGIC:
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def suffix_compression(path):
+    return _SUFFIXES.get(os.path.splitext(path)[1].lower())
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        raise OSError("zstd 압축 파일을 다루려면 zstandard 패키지가 필요합니다") from None
+    return zstandard
+
+
+def open_decompressed(f, compression):
+    """A binary stream of the decompressed contents of `f`, read from its current position.
+
+    Decompresses as it is read, so only a buffer's worth of either side is
+    in memory at a time. Concatenated gzip members and zstd frames are read
+    as one stream, like `zcat` does. Closing the stream leaves `f` open.
+    """
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=f, mode='rb')
+    if compression == 'zstd':
+        return _zstd().ZstdDecompressor().stream_reader(f, read_size=READ_SIZE, read_across_frames=True,
+                                                        closefd=False)
+    raise ValueError(f"unknown compression: {compression}")
+
+
+def open_compressed(f, compression, level=None, name=''):
+    """A binary stream that compresses what is written to it into `f`.
+
+    Closing the stream writes the trailer but leaves `f` open, to be
+    flushed and synced by the caller. `name` goes into the gzip header.
+    """
+    level = DEFAULT_LEVELS[compression] if level is None else level
+    if compression == 'gzip':
+        # mtime=0 keeps the output reproducible, as `gzip -n` does
+        return gzip.GzipFile(filename=name, fileobj=f, mode='wb', compresslevel=level, mtime=0)
+    if compression == 'zstd':
+        return _zstd().ZstdCompressor(level=level).stream_writer(f, closefd=False)
+    raise ValueError(f"unknown compression: {compression}")
+
+
+def decompressed_size(f, compression, size):
+    """Best guess at the decompressed size of the `size`-byte file `f`, or None.
+
+    gzip keeps the size (modulo 4 GB) of its last member in the trailer,
+    zstd the size of the first frame in its header, if the writer knew it.
+    Either can be off for files made of several members or frames.
+    """
+    try:
+        if compression == 'gzip' and size >= 18:
+            f.seek(size - 4)
+            return int.from_bytes(f.read(4), 'little')
+        if compression == 'zstd':
+            zstandard = _zstd()
+            f.seek(0)
+            try:
+                content_size = zstandard.frame_content_size(f.read(18))
+            except zstandard.ZstdError:
+                return None
+            return content_size if content_size >= 0 else None
+    except OSError:
+        pass
+    return None
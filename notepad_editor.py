@@ -0,0 +1,161 @@
+import time
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QTextEdit, QPlainTextEdit
+from PyQt5.QtGui import QTextCursor, QKeySequence
+
+from notepad_undo import EDIT_WINDOW, TYPING_WINDOW
+
+
+class EditorMixin:
+    """The small interface Notepad expects from an editor widget.
+
+    Beyond the QTextEdit/QPlainTextEdit API both implementations share
+    (document(), textCursor(), toPlainText(), zoomIn(), ...), an editor
+    offers set_text/append_text for bulk loads and per-tab counters.
+
+    With an `undo_history` (notepad_undo.UndoHistory) set, undo/redo go
+    through it, and every user event that may edit the text is bracketed
+    by begin_edit/end_edit so it can capture what the edit removes.
+    """
+    # Rough per-block bookkeeping in QTextDocument (fragment, block data, layout)
+    BLOCK_OVERHEAD = 200
+    undo_history = None
+
+    def init_stats(self):
+        self.layout_ns = 0
+        self.paint_ns = 0
+        self.paint_count = 0
+
+    def set_text(self, text):
+        started = time.perf_counter_ns()
+        self.setPlainText(text)
+        self.layout_ns += time.perf_counter_ns() - started
+
+    def append_text(self, text):
+        started = time.perf_counter_ns()
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
+        self.layout_ns += time.perf_counter_ns() - started
+
+    def memory_estimate(self):
+        doc = self.document()
+        return doc.characterCount() * 2 + doc.blockCount() * self.BLOCK_OVERHEAD
+
+    def stats(self):
+        doc = self.document()
+        return {
+            'engine': type(self).__name__,
+            'characters': doc.characterCount() - 1,
+            'blocks': doc.blockCount(),
+            'memory_estimate': self.memory_estimate(),
+            'layout_ms': self.layout_ns / 1e6,
+            'paint_ms': self.paint_ns / 1e6,
+            'paint_count': self.paint_count,
+        }
+
+    # --- Undo ---
+    def undo(self):
+        if self.undo_history is None:
+            super().undo()
+        elif not self.isReadOnly():
+            self.undo_history.undo()
+
+    def redo(self):
+        if self.undo_history is None:
+            super().redo()
+        elif not self.isReadOnly():
+            self.undo_history.redo()
+
+    def begin_edit(self, start=None, end=None, margin=EDIT_WINDOW):
+        """Call before changing the text programmatically; see UndoHistory.begin_edit."""
+        if self.undo_history is not None:
+            self.undo_history.begin_edit(start, end, margin)
+
+    def end_edit(self):
+        if self.undo_history is not None:
+            self.undo_history.end_edit()
+
+    def _as_edit(self, handler, *args, margin=EDIT_WINDOW):
+        self.begin_edit(margin=margin)
+        try:
+            return handler(*args)
+        finally:
+            self.end_edit()
+
+    def keyPressEvent(self, event):
+        if self.undo_history is not None:
+            if event.matches(QKeySequence.Undo):
+                self.undo()
+                return
+            if event.matches(QKeySequence.Redo):
+                self.redo()
+                return
+            # Navigation and copying never edit; skip reading the text around the cursor for them
+            if ((event.text() or event.key() in (Qt.Key_Backspace, Qt.Key_Delete))
+                    and not event.matches(QKeySequence.Copy) and not event.matches(QKeySequence.SelectAll)):
+                # Word and line deletes (Ctrl+Backspace, Ctrl+K) reach further than one character
+                wide = event.modifiers() & (Qt.ControlModifier | Qt.AltModifier | Qt.MetaModifier)
+                self._as_edit(super().keyPressEvent, event, margin=EDIT_WINDOW if wide else TYPING_WINDOW)
+                return
+        super().keyPressEvent(event)
+
+    def inputMethodEvent(self, event):
+        self._as_edit(super().inputMethodEvent, event)
+
+    def insertFromMimeData(self, source):
+        self._as_edit(super().insertFromMimeData, source)
+
+    def dropEvent(self, event):
+        self._as_edit(super().dropEvent, event)
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.MiddleButton:
+            # Pastes the X11 selection
+            self._as_edit(super().mouseReleaseEvent, event)
+        else:
+            super().mouseReleaseEvent(event)
+
+    def contextMenuEvent(self, event):
+        if self.undo_history is None:
+            super().contextMenuEvent(event)
+            return
+        menu = self.createStandardContextMenu(event.pos())
+        # Its undo/redo entries talk to the document's disabled undo stack
+        for action in menu.actions():
+            if action.objectName() == "edit-undo":
+                action.triggered.disconnect()
+                action.triggered.connect(self.undo)
+                action.setEnabled(self.undo_history.can_undo())
+            elif action.objectName() == "edit-redo":
+                action.triggered.disconnect()
+                action.triggered.connect(self.redo)
+                action.setEnabled(self.undo_history.can_redo())
+        self._as_edit(menu.exec_, event.globalPos())
+        menu.deleteLater()
+
+    def paintEvent(self, event):
+        started = time.perf_counter_ns()
+        super().paintEvent(event)
+        self.paint_ns += time.perf_counter_ns() - started
+        self.paint_count += 1
+
+
+class PlainTextEditor(EditorMixin, QPlainTextEdit):
+    """Default editor: plain-text document with block-lazy layout."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.init_stats()
+
+
+class RichTextEditor(EditorMixin, QTextEdit):
+    """The original QTextEdit-based editor, kept for comparison benchmarks."""
+    # Rich-text blocks also carry char/block format tables and full layouts
+    BLOCK_OVERHEAD = 400
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAcceptRichText(False)
+        self.init_stats()
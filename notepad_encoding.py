@@ -0,0 +1,170 @@
+import os
+import codecs
+from collections import namedtuple
+
+# encoding: Python codec name, bom: write a byte order mark, newline: '\n', '\r\n' or '\r',
+# compression: None, 'gzip' or 'zstd' (see notepad_compress)
+TextFormat = namedtuple('TextFormat', 'encoding bom newline lossy compression')
+TextFormat.__new__.__defaults__ = (False, None)
+
+DEFAULT_FORMAT = TextFormat('utf-8', False, os.linesep)
+
+# Only this much of a file is ever inspected to pick an encoding
+SNIFF_BYTES = 64 * 1024
+
+_BOMS = [
+    (codecs.BOM_UTF32_LE, 'utf-32-le'),
+    (codecs.BOM_UTF32_BE, 'utf-32-be'),
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+]
+
+# Tried in order when there is no BOM. CP949 is a superset of EUC-KR, so
+# EUC-KR files are decoded (and saved) with it; the label stays EUC-KR.
+_CANDIDATES = ['utf-8', 'euc-kr', 'cp949']
+_CODEC = {'euc-kr': 'cp949'}
+
+DISPLAY_NAMES = {
+    'utf-8': 'UTF-8', 'utf-16-le': 'UTF-16 LE', 'utf-16-be': 'UTF-16 BE',
+    'utf-32-le': 'UTF-32 LE', 'utf-32-be': 'UTF-32 BE', 'euc-kr': 'EUC-KR', 'cp949': 'CP949',
+}
+NEWLINE_NAMES = {'\n': 'LF', '\r\n': 'CRLF', '\r': 'CR'}
+# Offered when the text no longer fits the file's encoding; the Unicode ones hold anything
+SAVE_ENCODINGS = ['utf-8', 'utf-16-le', 'utf-16-be', 'cp949', 'euc-kr']
+
+
+def codec_name(encoding):
+    return _CODEC.get(encoding, encoding)
+
+
+def bom_bytes(fmt):
+    if not fmt.bom:
+        return b''
+    return next(bom for bom, encoding in _BOMS if encoding == fmt.encoding)
+
+
+def is_ascii_compatible(encoding):
+    """True if b'\\n' in the raw bytes always means a line break."""
+    return not encoding.startswith(('utf-16', 'utf-32'))
+
+
+def _decodes(sample, encoding, complete):
+    decoder = codecs.getincrementaldecoder(codec_name(encoding))('strict')
+    try:
+        # A multibyte sequence cut off at the end of the sample is not an error
+        decoder.decode(sample, final=complete)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def _guess_utf16(sample):
+    """UTF-16 without a BOM: mostly-ASCII text has NUL in every other byte."""
+    head = sample[:4096]
+    if len(head) < 16:
+        return None
+    even_zeros = head[0::2].count(0)
+    odd_zeros = head[1::2].count(0)
+    half = len(head) // 2
+    if odd_zeros > half * 0.3 and even_zeros < half * 0.05:
+        return 'utf-16-le'
+    if even_zeros > half * 0.3 and odd_zeros < half * 0.05:
+        return 'utf-16-be'
+    return None
+
+
+def detect_newline(text):
+    crlf = text.count('\r\n')
+    cr = text.count('\r') - crlf
+    lf = text.count('\n') - crlf
+    if crlf == cr == lf == 0:
+        return DEFAULT_FORMAT.newline
+    return max((crlf, '\r\n'), (lf, '\n'), (cr, '\r'))[1]
+
+
+def sniff_format(sample, complete=False):
+    """Pick a TextFormat from the first bytes of a file.
+
+    `sample` is truncated to SNIFF_BYTES; `complete` says whether it holds
+    the whole file. Returns (format, bom_length).
+    """
+    sample = sample[:SNIFF_BYTES]
+    complete = complete and len(sample) < SNIFF_BYTES
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            fmt = TextFormat(encoding, True, DEFAULT_FORMAT.newline)
+            return _with_newline(fmt, sample[len(bom):], complete), len(bom)
+    candidates = _CANDIDATES
+    utf16 = _guess_utf16(sample)
+    if utf16:
+        candidates = [utf16] + candidates
+    for encoding in candidates:
+        if _decodes(sample, encoding, complete):
+            return _with_newline(TextFormat(encoding, False, DEFAULT_FORMAT.newline), sample, complete), 0
+    # Nothing fits; decode as UTF-8 with replacement characters and say so
+    return _with_newline(TextFormat('utf-8', False, DEFAULT_FORMAT.newline, True), sample, complete), 0
+
+
+def _with_newline(fmt, sample, complete):
+    text = codecs.getincrementaldecoder(codec_name(fmt.encoding))('replace').decode(sample, final=complete)
+    return fmt._replace(newline=detect_newline(text))
+
+
+def fallback_formats(fmt):
+    """Formats to retry with, in order, if `fmt` fails to decode later in the file."""
+    if fmt.bom or fmt.lossy:
+        return [fmt._replace(lossy=True)]
+    later = _CANDIDATES[_CANDIDATES.index(fmt.encoding) + 1:] if fmt.encoding in _CANDIDATES else _CANDIDATES
+    return [fmt._replace(encoding=encoding) for encoding in later] + [fmt._replace(encoding='utf-8', lossy=True)]
+
+
+class StreamDecoder:
+    """Incremental bytes -> text decoding with newlines normalized to '\\n'."""
+
+    def __init__(self, fmt):
+        errors = 'replace' if fmt.lossy else 'strict'
+        self._decoder = codecs.getincrementaldecoder(codec_name(fmt.encoding))(errors)
+        self._held_cr = False
+
+    def decode(self, data, final=False):
+        text = self._decoder.decode(data, final)
+        if self._held_cr:
+            text = '\r' + text
+            self._held_cr = False
+        # A '\r' at the end may be the first half of a '\r\n' split across chunks
+        if text.endswith('\r') and not final:
+            text = text[:-1]
+            self._held_cr = True
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text
+
+
+def decode_bytes(data, fmt):
+    return StreamDecoder(fmt).decode(data[len(bom_bytes(fmt)):], final=True)
+
+
+def encode_chunks(text, fmt, chunk_chars=1024 * 1024):
+    """Yield the encoded file contents piece by piece, BOM first."""
+    codec = codec_name(fmt.encoding)
+    yield bom_bytes(fmt)
+    for start in range(0, len(text), chunk_chars):
+        part = text[start:start + chunk_chars]
+        if fmt.newline != '\n':
+            part = part.replace('\n', fmt.newline)
+        yield part.encode(codec)
+
+
+def encoding_name(encoding):
+    return DISPLAY_NAMES.get(encoding, encoding.upper())
+
+
+def describe(fmt):
+    name = encoding_name(fmt.encoding)
+    if fmt.bom:
+        name += " (BOM)"
+    name = f"{name} · {NEWLINE_NAMES[fmt.newline]}"
+    if fmt.compression:
+        name += f" · {fmt.compression}"
+    return name
@@ -0,0 +1,288 @@
+import os
+import re
+
+from PyQt5.QtCore import QObject, QCoreApplication, QEvent, QPoint, QPointF, QRect, QTimer
+from PyQt5.QtGui import QTextLayout, QTextCharFormat, QColor, QFont
+from PyQt5.QtWidgets import QPlainTextEdit
+
+from notepad_compress import suffix_compression
+
+# Block.userState() of a block whose formats match its current text
+HIGHLIGHTED = 1
+# Longer lines (minified JSON, binary junk) are left plain
+MAX_LINE_CHARS = 10000
+
+_ASTRAL = re.compile('[\U00010000-\U0010ffff]')
+
+# name: (file extensions, [(pattern, style)]). Earlier rules win: a match
+# overlapping one already taken is dropped, which keeps the number of format
+# runs (and so the layout and paint cost per line) low.
+_LANGUAGES = {
+    'log': (('.log', '.out'), [
+        (r'^\s*\[?\d{4}-\d\d-\d\d[ T]\d\d:\d\d:\d\d(?:[.,]\d+)?(?:Z|[+-]\d\d:?\d\d)?\]?', {'color': '#808080'}),
+        (r'\b(?:ERROR|FATAL|CRITICAL|SEVERE)\b', {'color': '#cd3131', 'bold': True}),
+        (r'\bWARN(?:ING)?\b', {'color': '#c27c0e', 'bold': True}),
+        (r'\bINFO\b', {'color': '#0451a5'}),
+        (r'\b(?:DEBUG|TRACE)\b', {'color': '#808080'}),
+        (r'"(?:[^"\\]|\\.)*"', {'color': '#a31515'}),
+        (r'\b[\w.-]+(?==)', {'color': '#795e26'}),
+        (r'\b\d+(?:\.\d+)?(?:ms|s)?\b', {'color': '#098658'}),
+    ]),
+    'ini': (('.ini', '.cfg', '.conf', '.properties'), [
+        (r'^\s*[;#].*', {'color': '#008000', 'italic': True}),
+        (r'^\s*\[[^\]]*\]', {'color': '#0000ff', 'bold': True}),
+        (r'^\s*[^=\s;#\[][^=]*?(?=\s*=)', {'color': '#795e26'}),
+        (r'(?<==).*', {'color': '#a31515'}),
+    ]),
+    'json': (('.json', '.jsonl', '.geojson'), [
+        (r'"(?:[^"\\]|\\.)*"(?=\s*:)', {'color': '#0451a5'}),
+        (r'"(?:[^"\\]|\\.)*"', {'color': '#a31515'}),
+        (r'\b(?:true|false|null)\b', {'color': '#0000ff'}),
+        (r'-?\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b', {'color': '#098658'}),
+    ]),
+}
+
+_compiled = {}
+
+
+class Language:
+    """A rule set compiled once and shared by every tab of every window that uses it.
+
+    Rules are line-local: a block's formats depend on nothing but its own
+    text, so an edit only ever invalidates the blocks it touched.
+    """
+    __slots__ = ('name', 'rules')
+
+    def __init__(self, name, rules):
+        self.name = name
+        self.rules = [(re.compile(pattern), _char_format(style)) for pattern, style in rules]
+
+    def format_ranges(self, text):
+        """(start, end, format) of every rule match in one line, in UTF-16 units, none overlapping."""
+        if len(text) > MAX_LINE_CHARS:
+            return []
+        ranges = []
+        taken = bytearray(len(text))
+        for regex, char_format in self.rules:
+            for match in regex.finditer(text):
+                start, end = match.span()
+                if start < end and taken.find(1, start, end) == -1:
+                    taken[start:end] = b'\x01' * (end - start)
+                    ranges.append((start, end, char_format))
+        if ranges and _ASTRAL.search(text):
+            # QTextLayout counts UTF-16 units; characters outside the BMP take two
+            offsets = [0]
+            for char in text:
+                offsets.append(offsets[-1] + (2 if char > '\uffff' else 1))
+            ranges = [(offsets[start], offsets[end], char_format) for start, end, char_format in ranges]
+        return ranges
+
+
+def _char_format(style):
+    char_format = QTextCharFormat()
+    char_format.setForeground(QColor(style['color']))
+    if style.get('bold'):
+        char_format.setFontWeight(QFont.Bold)
+    if style.get('italic'):
+        char_format.setFontItalic(True)
+    return char_format
+
+
+def register_language(name, extensions, rules):
+    """Add or replace a language; `rules` are (regex, style) pairs as in _LANGUAGES."""
+    _LANGUAGES[name] = (tuple(extensions), rules)
+    _compiled.pop(name, None)
+
+
+def language(name):
+    if name not in _compiled:
+        _compiled[name] = Language(name, _LANGUAGES[name][1])
+    return _compiled[name]
+
+
+def language_for_path(path):
+    if not path:
+        return None
+    root, extension = os.path.splitext(path)
+    if suffix_compression(path):
+        extension = os.path.splitext(root)[1]  # app.log.gz is a log
+    extension = extension.lower()
+    for name, (extensions, _) in _LANGUAGES.items():
+        if extension in extensions:
+            return language(name)
+    return None
+
+
+class ViewportHighlighter(QObject):
+    """Highlights only the blocks on screen plus LOOKAHEAD blocks below them.
+
+    Unlike QSyntaxHighlighter, attaching to a big document or loading more
+    text into it costs nothing up front. A block's formats are set on its
+    layout directly and remembered through its userState, so scrolling back
+    over highlighted text is free and an edit redoes just the edited blocks.
+
+    Formats are applied from a posted event, which Qt delivers before the
+    (low priority) repaint the edit or scroll scheduled, so stale formats
+    are never shown. The document layout's signals are blocked meanwhile:
+    it would otherwise repaint the whole viewport for every block whose
+    formats changed, and only those blocks are repainted instead.
+
+    The lines an edit touches lose their formats at once and are highlighted
+    again when typing pauses for TYPING_PAUSE_MS. Re-formatting the line
+    being typed on every keystroke would lay it out and paint it with all its
+    format runs each time, which took longer than the keystroke itself.
+    """
+    LOOKAHEAD = 50
+    TYPING_PAUSE_MS = 300
+    _HIGHLIGHT_EVENT = QEvent.Type(QEvent.registerEventType())
+
+    def __init__(self, editor, language):
+        super().__init__(editor)
+        self.editor = editor
+        self.language = language
+        self.document = editor.document()
+        self.highlighted_blocks = 0  # Blocks formatted so far (statistics)
+        self._posted = False
+        self._scan = True   # Check every block in view, not just the edited ones
+        self._edited = []
+        self._pause = QTimer(self)
+        self._pause.setSingleShot(True)
+        self._pause.setInterval(self.TYPING_PAUSE_MS)
+        self._pause.timeout.connect(self.schedule)
+
+        self.document.contentsChange.connect(self._on_contents_change)
+        editor.verticalScrollBar().valueChanged.connect(self.schedule)
+        editor.viewport().installEventFilter(self)
+        self.schedule()
+
+    def detach(self):
+        """Stop highlighting and drop the formats set so far."""
+        self._pause.stop()
+        self.document.contentsChange.disconnect(self._on_contents_change)
+        self.editor.verticalScrollBar().valueChanged.disconnect(self.schedule)
+        self.editor.viewport().removeEventFilter(self)
+        block = self.document.firstBlock()
+        while block.isValid():
+            if block.userState() == HIGHLIGHTED:
+                block.setUserState(-1)
+                block.layout().clearFormats()
+                self.document.markContentsDirty(block.position(), 1)
+            block = block.next()
+        self.editor.viewport().update()
+        self.setParent(None)
+
+    def schedule(self, scan=True):
+        self._scan = self._scan or scan
+        if not self._posted:
+            self._posted = True
+            QCoreApplication.postEvent(self, QEvent(self._HIGHLIGHT_EVENT))
+
+    def event(self, event):
+        if event.type() == self._HIGHLIGHT_EVENT:
+            self._posted = False
+            edited, self._edited = self._edited, []
+            if self._scan:
+                self._scan = False
+                self.highlight_visible()
+            else:
+                self.clear_edited(edited)
+            return True
+        return super().event(event)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Resize:
+            self.schedule()
+        return False
+
+    def _on_contents_change(self, position, removed, added):
+        # Blocks created by the edit start out unhighlighted; only the ones it
+        # began and ended in still carry formats for their old text
+        first = self.document.findBlock(position)
+        last = self.document.findBlock(position + added)
+        for block in (first, last):
+            if block.isValid():
+                block.setUserState(-1)
+        if last.blockNumber() - first.blockNumber() <= 1:
+            # Typing: nothing but these two hold formats for other text
+            self._edited += [first, last]
+            self.schedule(scan=False)
+        else:
+            self.schedule()
+
+    def visible_blocks(self):
+        """The first block on screen and how many blocks from it to highlight."""
+        if isinstance(self.editor, QPlainTextEdit):
+            first = self.editor.firstVisibleBlock()
+        else:
+            first = self.editor.cursorForPosition(QPoint(0, 0)).block()
+        # Wrapped blocks take several lines, so this errs on the side of more
+        lines = self.editor.viewport().height() // self.editor.fontMetrics().lineSpacing() + 1
+        return first, lines + self.LOOKAHEAD
+
+    def clear_edited(self, blocks):
+        """Drop the formats the edited `blocks` kept for their old text, and wait for a pause to redo them."""
+        layout = self.document.documentLayout()
+        layout.blockSignals(True)
+        try:
+            for block in blocks:
+                if block.isValid() and block.layout().formats():
+                    block.layout().clearFormats()
+                    self.document.markContentsDirty(block.position(), 1)
+        finally:
+            layout.blockSignals(False)
+        # No repaint of our own: the edit scheduled one for these blocks, which comes after this
+        self._pause.start()
+
+    def highlight_visible(self):
+        """Highlight the blocks in view that are not highlighted yet."""
+        first, count = self.visible_blocks()
+        candidates = []
+        block = first
+        for _ in range(count):
+            if not block.isValid():
+                break
+            candidates.append(block)
+            block = block.next()
+        changed = []
+        layout = self.document.documentLayout()
+        layout.blockSignals(True)
+        try:
+            for block in candidates:
+                if block.userState() != HIGHLIGHTED and self.highlight_block(block):
+                    changed.append(block)
+        finally:
+            layout.blockSignals(False)
+        if changed:
+            self.editor.viewport().update(self._blocks_rect(changed))
+
+    def highlight_block(self, block):
+        """Set the block's formats; returns whether anything on screen changed."""
+        ranges = []
+        for start, end, char_format in self.language.format_ranges(block.text()):
+            format_range = QTextLayout.FormatRange()
+            format_range.start = start
+            format_range.length = end - start
+            format_range.format = char_format
+            ranges.append(format_range)
+        block.setUserState(HIGHLIGHTED)
+        self.highlighted_blocks += 1
+        layout = block.layout()
+        if not ranges and not layout.formats():
+            return False
+        layout.setFormats(ranges)
+        # Makes the document layout pick up the new formats; emits no contentsChange
+        self.document.markContentsDirty(block.position(), 1)
+        return True
+
+    def _blocks_rect(self, blocks):
+        rect = QRect()
+        if isinstance(self.editor, QPlainTextEdit):
+            offset = self.editor.contentOffset()
+            for block in blocks:
+                rect |= self.editor.blockBoundingGeometry(block).translated(offset).toAlignedRect()
+        else:
+            layout = self.document.documentLayout()
+            offset = QPointF(-self.editor.horizontalScrollBar().value(), -self.editor.verticalScrollBar().value())
+            for block in blocks:
+                rect |= layout.blockBoundingRect(block).translated(offset).toAlignedRect()
+        return rect
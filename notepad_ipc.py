@@ -0,0 +1,97 @@
+import os
+import json
+import getpass
+
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtNetwork import QLocalServer, QLocalSocket
+
+CONNECT_TIMEOUT_MS = 200
+WRITE_TIMEOUT_MS = 1000
+MAX_MESSAGE_BYTES = 1024 * 1024
+
+
+def server_name():
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = str(os.getuid()) if hasattr(os, 'getuid') else "user"
+    return "notepad-" + ''.join(c if c.isalnum() else '_' for c in user)
+
+
+def forward_to_running_instance(args):
+    """Hand our file arguments to a running Notepad. Returns False if there is none.
+
+    Only QtCore and QtNetwork are needed here, so a second launch never
+    pays for QtWidgets or a QApplication.
+    """
+    socket = QLocalSocket()
+    socket.connectToServer(server_name())
+    if not socket.waitForConnected(CONNECT_TIMEOUT_MS):
+        return False
+    message = json.dumps({'paths': [os.path.abspath(arg) for arg in args]})
+    socket.write(message.encode('utf-8') + b'\n')
+    sent = socket.waitForBytesWritten(WRITE_TIMEOUT_MS)
+    socket.disconnectFromServer()
+    if socket.state() != QLocalSocket.UnconnectedState:
+        socket.waitForDisconnected(WRITE_TIMEOUT_MS)
+    return sent
+
+
+def is_answering(name):
+    """True if a running instance accepts connections on `name`."""
+    socket = QLocalSocket()
+    socket.connectToServer(name)
+    if not socket.waitForConnected(CONNECT_TIMEOUT_MS):
+        return False
+    socket.abort()
+    return True
+
+
+class InstanceServer(QObject):
+    """Listens for later launches and re-emits the files they were asked to open.
+
+    If another instance already owns the name, this one does not listen;
+    see is_listening().
+    """
+    open_requested = pyqtSignal(list)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)
+        self.server.newConnection.connect(self.on_new_connection)
+        name = server_name()
+        # Asked first: with socket options set, listen() on Unix replaces a
+        # live socket by renaming over it instead of failing
+        if is_answering(name):
+            return
+        if not self.server.listen(name):
+            # Nobody answered on this name, so whatever is left there is stale
+            QLocalServer.removeServer(name)
+            self.server.listen(name)
+
+    def is_listening(self):
+        return self.server.isListening()
+
+    def on_new_connection(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            buffer = bytearray()
+            socket.readyRead.connect(lambda s=socket, b=buffer: self.on_ready_read(s, b))
+            socket.disconnected.connect(socket.deleteLater)
+
+    def on_ready_read(self, socket, buffer):
+        buffer += bytes(socket.readAll())
+        if len(buffer) > MAX_MESSAGE_BYTES:
+            socket.abort()
+            return
+        if not buffer.endswith(b'\n'):
+            return
+        try:
+            message = json.loads(buffer.decode('utf-8'))
+            paths = [str(path) for path in message.get('paths', [])]
+        except (ValueError, AttributeError, TypeError):
+            paths = None
+        socket.disconnectFromServer()
+        if paths is not None:
+            self.open_requested.emit(paths)
@@ -0,0 +1,323 @@
+import os
+import re
+import json
+import glob
+import queue
+import threading
+from collections import deque
+
+from PyQt5.QtCore import QObject, QTimer, QLockFile
+from PyQt5.QtGui import QTextCursor
+
+from notepad_encoding import TextFormat, decode_bytes
+from notepad_compress import open_decompressed
+
+# Characters outside the BMP take two UTF-16 units in a QTextDocument
+_ASTRAL = re.compile('[\U00010000-\U0010ffff]')
+
+
+def utf16_len(text):
+    if text.isascii():
+        return len(text)
+    return len(text) + len(_ASTRAL.findall(text))
+
+
+def apply_edit(buf, pos, removed, added):
+    """Apply one journal edit to a UTF-16-LE bytearray (positions are UTF-16 units)."""
+    buf[pos * 2:(pos + removed) * 2] = added.encode('utf-16-le')
+
+
+class JournalWriter(threading.Thread):
+    """Serializes and appends journal batches in order, off the GUI thread."""
+
+    def __init__(self, path):
+        super().__init__(daemon=True)
+        self.path = path
+        self.queue = queue.Queue()
+
+    def run(self):
+        f = open(self.path, 'a', encoding='utf-8')
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            if isinstance(item, str):
+                # Rotation: continue in a fresh file and drop the old one
+                f.close()
+                old_path, self.path = self.path, item
+                f = open(self.path, 'a', encoding='utf-8')
+                os.remove(old_path)
+                continue
+            for record in item:
+                f.write(json.dumps(record, ensure_ascii=False))
+                f.write('\n')
+            f.flush()
+            os.fsync(f.fileno())
+        f.close()
+
+
+class AutosaveJournal(QObject):
+    """Append-only crash-recovery journal for every open Notepad tab.
+
+    Edits are captured from QTextDocument.contentsChange as (position,
+    removed, added) records, merged while typing, and flushed by a single
+    writer thread every `interval_ms`, at most `max_bytes` of text per tick.
+    """
+
+    def __init__(self, directory, interval_ms=2000, max_bytes=1024 * 1024,
+                 compact_bytes=64 * 1024 * 1024, parent=None):
+        super().__init__(parent)
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.compact_bytes = compact_bytes
+        self._generation = 0
+        self._lock = QLockFile(os.path.join(directory, f"journal-{os.getpid()}.lock"))
+        self._lock.tryLock(0)
+        self._writer = JournalWriter(self._journal_path())
+        self._writer.start()
+
+        self._tabs = {}       # editor -> tab record
+        self._windows = {}    # window -> window id
+        self._next_id = 0
+        self._pending = deque()
+        self._written = 0
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+        self._timer.start()
+
+    def _journal_path(self):
+        return os.path.join(self.directory, f"journal-{os.getpid()}.{self._generation}.jsonl")
+
+    def _new_id(self):
+        self._next_id += 1
+        return self._next_id
+
+    # --- Tab tracking ---
+    def attach(self, editor, window, text=None):
+        """Start journaling a tab. Without `text` the base is the file on disk (or empty)."""
+        self.detach(editor)
+        if window not in self._windows:
+            self._windows[window] = self._new_id()
+        doc = editor.document()
+        tab = {'id': self._new_id(), 'win': self._windows[window], 'editor': editor, 'doc': doc,
+               'length': doc.characterCount() - 1}
+        self._tabs[editor] = tab
+        self._pending.append(self._base_record(editor, tab, text))
+        tab['slot'] = lambda pos, removed, added: self._on_contents_change(tab, pos, removed, added)
+        doc.contentsChange.connect(tab['slot'])
+
+    def attach_placeholder(self, placeholder, window):
+        """Track a tab whose file is not loaded yet, so recovery can reopen it."""
+        self.detach(placeholder)
+        if window not in self._windows:
+            self._windows[window] = self._new_id()
+        tab = {'id': self._new_id(), 'win': self._windows[window], 'editor': placeholder, 'doc': None}
+        self._tabs[placeholder] = tab
+        self._pending.append(self._base_record(placeholder, tab, None))
+
+    def detach(self, editor):
+        tab = self._tabs.pop(editor, None)
+        if tab is None:
+            return
+        if tab['doc'] is not None:
+            tab['doc'].contentsChange.disconnect(tab['slot'])
+        self._pending.append({'op': 'close', 'tab': tab['id']})
+
+    def mark_saved(self, editor):
+        """The document now matches its file on disk; older edits are obsolete."""
+        tab = self._tabs.get(editor)
+        if tab is not None:
+            self._pending.append(self._base_record(editor, tab, None))
+
+    def _base_record(self, editor, tab, text):
+        path = editor.property("file_path")
+        record = {'op': 'open', 'tab': tab['id'], 'win': tab['win'], 'path': path}
+        if text is not None:
+            record['text'] = text
+        elif path is not None:
+            try:
+                st = os.stat(path)
+                record['mtime'] = st.st_mtime_ns
+                record['size'] = st.st_size
+                text_format = editor.property("text_format")
+                if text_format is not None:
+                    record['format'] = list(text_format)
+            except OSError:
+                if tab['doc'] is not None:
+                    record['text'] = tab['doc'].toPlainText()
+        return record
+
+    def _on_contents_change(self, tab, pos, removed, added):
+        doc = tab['doc']
+        length = doc.characterCount() - 1
+        # Qt sometimes over-reports both counts; trust the length delta instead
+        removed = min(removed, tab['length'] - pos)
+        added = length - tab['length'] + removed
+        tab['length'] = length
+        if added < 0 or removed < 0:
+            self._pending.append(self._base_record(tab['editor'], tab, doc.toPlainText()))
+            return
+        text = ''
+        if added:
+            cursor = QTextCursor(doc)
+            cursor.setPosition(pos)
+            cursor.setPosition(pos + added, QTextCursor.KeepAnchor)
+            text = cursor.selectedText().replace('\u2029', '\n')
+
+        last = self._pending[-1] if self._pending else None
+        if last is not None and last['op'] == 'edit' and last['tab'] == tab['id']:
+            # Merge plain typing and backspacing into the previous record
+            if removed == 0 and pos == last['p'] + last['n']:
+                last['a'] += text
+                last['n'] += added
+                return
+            if added == 0 and last['n'] == 0 and pos in (last['p'], last['p'] - removed):
+                # Delete keeps the position, backspace walks it backwards
+                last['p'] = pos
+                last['r'] += removed
+                return
+        self._pending.append({'op': 'edit', 'tab': tab['id'], 'p': pos, 'r': removed, 'a': text, 'n': added})
+
+    # --- Flushing ---
+    def flush(self, budget=None):
+        budget = self.max_bytes if budget is None else budget
+        batch = []
+        size = 0
+        while self._pending and size < budget:
+            record = self._pending[0]
+            text_size = len(record.get('a', '')) + len(record.get('text', ''))
+            if record['op'] == 'edit' and size + text_size > budget:
+                if batch:
+                    break
+                # Split a huge insert so one paste cannot blow the per-tick budget
+                head = record['a'][:budget]
+                head_len = utf16_len(head)
+                batch.append({'op': 'edit', 'tab': record['tab'], 'p': record['p'], 'r': record['r'], 'a': head})
+                record['a'] = record['a'][budget:]
+                record['p'] += head_len
+                record['r'] = 0
+                record['n'] -= head_len
+                size = budget
+                break
+            batch.append(self._pending.popleft())
+            size += text_size
+        if not batch:
+            return
+        for record in batch:
+            record.pop('n', None)
+        self._writer.queue.put(batch)
+        self._written += size
+        if self._written > self.compact_bytes and not self._pending:
+            self._compact()
+
+    def _compact(self):
+        """Start a new journal holding only the current base of each tab."""
+        self._generation += 1
+        self._written = 0
+        self._writer.queue.put(self._journal_path())
+        records = []
+        for editor, tab in self._tabs.items():
+            text = editor.toPlainText() if tab['doc'] is not None and tab['doc'].isModified() else None
+            records.append(self._base_record(editor, tab, text))
+        self._writer.queue.put(records)
+
+    def shutdown(self):
+        """Flush everything; remove the journal if no tab is left open."""
+        self._timer.stop()
+        while self._pending:
+            self.flush(budget=float('inf'))
+        self._writer.queue.put(None)
+        self._writer.join()
+        if not self._tabs:
+            os.remove(self._writer.path)
+        self._lock.unlock()
+
+
+def _journal_order(path):
+    # journal-PID.GENERATION.jsonl: compare numerically so .10 replays after .9
+    pid, generation = os.path.basename(path)[len("journal-"):-len(".jsonl")].split('.')
+    return int(pid), int(generation)
+
+
+def find_orphaned_journals(directory):
+    """Journals whose owning process is gone (its lock file is stale or missing).
+
+    Returned oldest generation first, the order recover_tabs replays them in.
+    """
+    orphans = []
+    for path in sorted(glob.glob(os.path.join(directory, "journal-*.*.jsonl")), key=_journal_order):
+        pid = os.path.basename(path).split('-', 1)[1].split('.', 1)[0]
+        lock = QLockFile(os.path.join(directory, f"journal-{pid}.lock"))
+        if lock.tryLock(0):
+            lock.unlock()
+            orphans.append(path)
+    return orphans
+
+
+def recover_tabs(paths):
+    """Replay orphaned journals.
+
+    Returns a list of windows, each a list of tabs (path, text) in the order
+    they were opened. `text` is None for tabs that match their file on disk.
+    """
+    tabs = {}
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # Torn final write
+                op = record['op']
+                if op == 'open':
+                    tabs.pop(record['tab'], None)
+                    tabs[record['tab']] = {'win': record['win'], 'path': record['path'], 'base': record,
+                                           'edits': []}
+                elif op == 'edit' and record['tab'] in tabs:
+                    tabs[record['tab']]['edits'].append(record)
+                elif op == 'close':
+                    tabs.pop(record['tab'], None)
+
+    windows = {}
+    for tab in tabs.values():
+        text = _replay(tab)
+        if text is False:
+            continue
+        windows.setdefault(tab['win'], []).append((tab['path'], text))
+    return list(windows.values())
+
+
+def _replay(tab):
+    base = tab['base']
+    if not tab['edits'] and 'text' not in base:
+        return None
+    if 'text' in base:
+        text = base['text']
+    elif base['path'] is None:
+        text = ''
+    else:
+        try:
+            st = os.stat(base['path'])
+            if st.st_mtime_ns != base.get('mtime') or st.st_size != base.get('size'):
+                return False  # The file changed since; the edits no longer apply
+            fmt = TextFormat(*base['format']) if 'format' in base else None
+            with open(base['path'], 'rb') as f:
+                data = open_decompressed(f, fmt.compression).read() if fmt and fmt.compression else f.read()
+            text = decode_bytes(data, fmt) if fmt else data.decode('utf-8')
+        except (OSError, EOFError, UnicodeDecodeError):
+            return False
+    buf = bytearray(text.encode('utf-16-le'))
+    for edit in tab['edits']:
+        apply_edit(buf, edit['p'], edit['r'], edit['a'])
+    return buf.decode('utf-16-le')
+
+
+def discard_journals(paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,629 @@
+import re
+import weakref
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+from PyQt5.QtWidgets import (QDialog, QGridLayout, QHBoxLayout, QVBoxLayout, QLabel, QLineEdit,
+                             QCheckBox, QPushButton, QDockWidget, QListWidget, QListWidgetItem,
+                             QTextEdit)
+from PyQt5.QtCore import Qt, QObject, QPoint, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QColor, QTextCharFormat, QTextCursor
+
+from notepad_encoding import sniff_format, fallback_formats, decode_bytes
+from notepad_compress import MAGIC_BYTES, sniff_compression, open_decompressed
+
+SearchOptions = namedtuple('SearchOptions', 'text regex case_sensitive whole_word')
+
+# Characters outside the BMP take two UTF-16 units in a QTextDocument
+_ASTRAL = re.compile('[\U00010000-\U0010ffff]')
+
+
+def compile_search(options):
+    """Return (literal, pattern): a plain substring for the str.find fast path, or a regex.
+
+    Raises re.error for an invalid regular expression.
+    """
+    if not options.regex and options.case_sensitive and not options.whole_word:
+        return options.text, None
+    source = options.text if options.regex else re.escape(options.text)
+    if options.whole_word:
+        source = rf'\b(?:{source})\b'
+    flags = re.MULTILINE if options.case_sensitive else re.MULTILINE | re.IGNORECASE
+    return None, re.compile(source, flags)
+
+
+def iter_matches(text, literal, pattern):
+    """Yield (start, end) code-point spans of non-empty matches."""
+    if literal is not None:
+        step = len(literal)
+        pos = text.find(literal)
+        while pos != -1:
+            yield pos, pos + step
+            pos = text.find(literal, pos + step)
+    else:
+        for match in pattern.finditer(text):
+            if match.end() > match.start():
+                yield match.span()
+
+
+def read_text(path):
+    """The text an editor tab would show for `path`: decompressed, decoded, newlines as '\\n'."""
+    with open(path, 'rb') as raw:
+        compression = sniff_compression(raw.read(MAGIC_BYTES))
+        raw.seek(0)
+        data = open_decompressed(raw, compression).read() if compression else raw.read()
+    fmt, _ = sniff_format(data, complete=True)
+    for fmt in [fmt] + fallback_formats(fmt):
+        try:
+            return decode_bytes(data, fmt)
+        except UnicodeDecodeError:
+            pass  # The last fallback replaces what it cannot decode, so this ends
+
+
+class Utf16Positions:
+    """Maps str indices of a snapshot to QTextDocument (UTF-16) positions."""
+
+    def __init__(self, text):
+        self._astral = None if text.isascii() else [m.start() for m in _ASTRAL.finditer(text)]
+
+    def __call__(self, pos):
+        if not self._astral:
+            return pos
+        return pos + bisect_left(self._astral, pos)
+
+
+class SearchSignals(QObject):
+    matches = pyqtSignal(list)
+    finished = pyqtSignal(int)
+    failed = pyqtSignal(str)
+
+
+class SearchWorker(QRunnable):
+    """Finds all matches in a text snapshot and streams them back in batches.
+
+    Each batch item is (start, end) in document positions, or with
+    `with_lines` (start, end, line_number, line_text). With `path` instead
+    of a text, the file is read on the worker thread; if that fails,
+    `failed` is emitted instead of `finished`.
+    """
+    BATCH = 2000
+
+    def __init__(self, text, literal, pattern, limit=None, with_lines=False, path=None):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.text = text
+        self.path = path
+        self.literal = literal
+        self.pattern = pattern
+        self.limit = limit
+        self.with_lines = with_lines
+        self.signals = SearchSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def run(self):
+        if self.text is None:
+            try:
+                self.text = read_text(self.path)
+            except Exception as e:
+                self.signals.failed.emit(str(e))
+                return
+        text = self.text
+        to_utf16 = Utf16Positions(text)
+        batch = []
+        count = 0
+        line = 1
+        last = 0
+        for start, end in iter_matches(text, self.literal, self.pattern):
+            if self._cancelled.is_set():
+                return
+            if self.with_lines:
+                line += text.count('\n', last, start)
+                last = start
+                line_start = text.rfind('\n', 0, start) + 1
+                line_end = text.find('\n', start)
+                if line_end == -1 or line_end - line_start > 200:
+                    line_end = line_start + 200
+                batch.append((to_utf16(start), to_utf16(end), line, text[line_start:line_end]))
+            else:
+                batch.append((to_utf16(start), to_utf16(end)))
+            count += 1
+            if len(batch) >= self.BATCH:
+                self.signals.matches.emit(batch)
+                batch = []
+            if self.limit is not None and count >= self.limit:
+                break
+        if batch:
+            self.signals.matches.emit(batch)
+        self.text = None
+        self.signals.finished.emit(count)
+
+
+class ReplaceSignals(QObject):
+    finished = pyqtSignal(object, int)
+    failed = pyqtSignal(str)
+
+
+class ReplaceWorker(QRunnable):
+    """Computes a replace-all on a snapshot.
+
+    For a modest number of matches the result is a list of (start, end,
+    replacement) edits in document positions; past EDIT_LIMIT it is the
+    whole new text, which is cheaper to swap in than many small edits.
+    """
+    EDIT_LIMIT = 10000
+
+    def __init__(self, text, literal, pattern, replacement):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.text = text
+        self.literal = literal
+        self.pattern = pattern
+        self.replacement = replacement
+        self.signals = ReplaceSignals()
+
+    def run(self):
+        text = self.text
+        self.text = None
+        try:
+            if self.literal is not None:
+                spans = [(start, end, self.replacement) for start, end in iter_matches(text, self.literal, None)]
+            else:
+                spans = [(m.start(), m.end(), m.expand(self.replacement))
+                         for m in self.pattern.finditer(text) if m.end() > m.start()]
+        except (re.error, IndexError) as e:
+            self.signals.failed.emit(str(e))
+            return
+        if len(spans) <= self.EDIT_LIMIT:
+            to_utf16 = Utf16Positions(text)
+            edits = [(to_utf16(start), to_utf16(end), rep) for start, end, rep in spans]
+            self.signals.finished.emit(edits, len(spans))
+            return
+        parts = []
+        last = 0
+        for start, end, rep in spans:
+            parts.append(text[last:start])
+            parts.append(rep)
+            last = end
+        parts.append(text[last:])
+        self.signals.finished.emit(''.join(parts), len(spans))
+
+
+class EditorSearch(QObject):
+    """Per-editor match list with highlighting limited to the visible region."""
+    updated = pyqtSignal()
+    MAX_HIGHLIGHTS = 2000
+
+    def __init__(self, editor):
+        super().__init__(editor)
+        self.editor = editor
+        self.options = None
+        self.seq = None
+        self.complete = False
+        self.starts = array('q')
+        self.ends = array('q')
+        self.worker = None
+        self.match_format = QTextCharFormat()
+        self.match_format.setBackground(QColor(255, 230, 120))
+        editor.verticalScrollBar().valueChanged.connect(self.refresh_highlights)
+        editor.horizontalScrollBar().valueChanged.connect(self.refresh_highlights)
+        editor.document().contentsChanged.connect(self.invalidate)
+
+    @classmethod
+    def for_editor(cls, editor):
+        search = editor.property("search")
+        if search is None:
+            search = cls(editor)
+            editor.setProperty("search", search)
+        return search
+
+    def is_current(self, options):
+        return self.options == options and self.seq == self.editor.property("edit_seq")
+
+    def start(self, options, literal, pattern):
+        self.cancel()
+        self.options = options
+        self.seq = self.editor.property("edit_seq")
+        self.complete = False
+        self.starts = array('q')
+        self.ends = array('q')
+        self.worker = SearchWorker(self.editor.toPlainText(), literal, pattern)
+        self.worker.signals.matches.connect(self._on_matches)
+        self.worker.signals.finished.connect(self._on_finished)
+        QThreadPool.globalInstance().start(self.worker)
+
+    def cancel(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+
+    def invalidate(self):
+        if self.options is None:
+            return
+        self.cancel()
+        self.options = None
+        self.starts = array('q')
+        self.ends = array('q')
+        self.editor.setExtraSelections([])
+        self.updated.emit()
+
+    def _on_matches(self, batch):
+        if self.sender() is not (self.worker and self.worker.signals):
+            return
+        for start, end in batch:
+            self.starts.append(start)
+            self.ends.append(end)
+        self.refresh_highlights()
+        self.updated.emit()
+
+    def _on_finished(self, count):
+        if self.sender() is not (self.worker and self.worker.signals):
+            return
+        self.worker = None
+        self.complete = True
+        self.updated.emit()
+
+    def refresh_highlights(self):
+        if not self.starts:
+            return
+        viewport = self.editor.viewport()
+        top = self.editor.cursorForPosition(QPoint(0, 0)).position()
+        bottom = self.editor.cursorForPosition(QPoint(viewport.width() - 1, viewport.height() - 1)).position()
+        first = bisect_left(self.ends, top)
+        last = min(bisect_right(self.starts, bottom), first + self.MAX_HIGHLIGHTS)
+        doc = self.editor.document()
+        selections = []
+        for i in range(first, last):
+            selection = QTextEdit.ExtraSelection()
+            selection.cursor = QTextCursor(doc)
+            selection.cursor.setPosition(self.starts[i])
+            selection.cursor.setPosition(self.ends[i], QTextCursor.KeepAnchor)
+            selection.format = self.match_format
+            selections.append(selection)
+        self.editor.setExtraSelections(selections)
+
+    def match_after(self, pos, backward=False):
+        """Index of the next (or previous) match relative to pos, wrapping around."""
+        if not self.starts:
+            return None
+        if backward:
+            index = bisect_left(self.starts, pos) - 1
+            return index if index >= 0 else len(self.starts) - 1
+        index = bisect_left(self.starts, pos)
+        return index if index < len(self.starts) else 0
+
+
+class FindReplaceDialog(QDialog):
+    """Find/replace for the current tab of one Notepad window."""
+    find_in_all_tabs_requested = pyqtSignal(object)
+
+    def __init__(self, window):
+        super().__init__(window)
+        self.window = window
+        self._pending_jump = None
+        self._connected = weakref.WeakSet()    # EditorSearches whose `updated` reaches this dialog
+        self.setWindowTitle("찾기/바꾸기")
+
+        self.find_edit = QLineEdit()
+        self.replace_edit = QLineEdit()
+        self.case_box = QCheckBox("대/소문자 구분")
+        self.word_box = QCheckBox("단어 단위로")
+        self.regex_box = QCheckBox("정규식")
+        self.status_label = QLabel()
+
+        find_next_btn = QPushButton("다음 찾기")
+        find_prev_btn = QPushButton("이전 찾기")
+        find_all_btn = QPushButton("모두 찾기")
+        replace_btn = QPushButton("바꾸기")
+        replace_all_btn = QPushButton("모두 바꾸기")
+        all_tabs_btn = QPushButton("모든 탭에서 찾기")
+        find_next_btn.setDefault(True)
+
+        grid = QGridLayout()
+        grid.addWidget(QLabel("찾을 내용:"), 0, 0)
+        grid.addWidget(self.find_edit, 0, 1)
+        grid.addWidget(QLabel("바꿀 내용:"), 1, 0)
+        grid.addWidget(self.replace_edit, 1, 1)
+        options_hbox = QHBoxLayout()
+        options_hbox.addWidget(self.case_box)
+        options_hbox.addWidget(self.word_box)
+        options_hbox.addWidget(self.regex_box)
+        buttons_vbox = QVBoxLayout()
+        for btn in (find_next_btn, find_prev_btn, find_all_btn, replace_btn, replace_all_btn, all_tabs_btn):
+            buttons_vbox.addWidget(btn)
+        buttons_vbox.addStretch()
+
+        left_vbox = QVBoxLayout()
+        left_vbox.addLayout(grid)
+        left_vbox.addLayout(options_hbox)
+        left_vbox.addStretch()
+        left_vbox.addWidget(self.status_label)
+        main_hbox = QHBoxLayout(self)
+        main_hbox.addLayout(left_vbox)
+        main_hbox.addLayout(buttons_vbox)
+
+        find_next_btn.clicked.connect(lambda: self.find_next())
+        find_prev_btn.clicked.connect(lambda: self.find_next(backward=True))
+        find_all_btn.clicked.connect(self.find_all)
+        replace_btn.clicked.connect(self.replace)
+        replace_all_btn.clicked.connect(self.replace_all)
+        all_tabs_btn.clicked.connect(self.find_in_all_tabs)
+
+    def show_for(self, replace=False):
+        editor = self.window.get_current_editor()
+        if editor and editor.textCursor().hasSelection():
+            selected = editor.textCursor().selectedText()
+            if '\u2029' not in selected:
+                self.find_edit.setText(selected)
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        (self.replace_edit if replace else self.find_edit).setFocus()
+        self.find_edit.selectAll()
+
+    def options(self):
+        return SearchOptions(self.find_edit.text(), self.regex_box.isChecked(),
+                             self.case_box.isChecked(), self.word_box.isChecked())
+
+    def _compile(self, options):
+        if not options.text:
+            return None
+        try:
+            return compile_search(options)
+        except re.error as e:
+            self.status_label.setText(f"잘못된 정규식: {e}")
+            return None
+
+    def _search(self, editor, options):
+        """Return the editor's search state, starting a background search if it is stale."""
+        search = EditorSearch.for_editor(editor)
+        if not search.is_current(options):
+            compiled = self._compile(options)
+            if compiled is None:
+                return None
+            search.start(options, *compiled)
+            if search not in self._connected:
+                # Every edit restarts the search on the same object; connect it only once
+                search.updated.connect(self._on_search_updated)
+                self._connected.add(search)
+            self.status_label.setText("검색 중...")
+        return search
+
+    def _on_search_updated(self):
+        search = self.sender()
+        if search.options is None:
+            return
+        suffix = "" if search.complete else "..."
+        self.status_label.setText(f"일치 항목 {len(search.starts):,}개{suffix}")
+        if search.complete and self._pending_jump is not None:
+            editor, backward = self._pending_jump
+            self._pending_jump = None
+            if editor is search.editor:
+                self._jump(search, backward)
+
+    def find_next(self, backward=False):
+        editor = self.window.get_current_editor()
+        options = self.options()
+        if editor is None or not options.text:
+            return
+        search = self._search(editor, options)
+        if search is None:
+            return
+        if search.complete:
+            self._jump(search, backward)
+        else:
+            self._pending_jump = (editor, backward)
+
+    def _jump(self, search, backward):
+        editor = search.editor
+        cursor = editor.textCursor()
+        index = search.match_after(cursor.selectionStart() if backward else cursor.selectionEnd(), backward)
+        if index is None:
+            self.status_label.setText("찾을 수 없습니다.")
+            return
+        cursor.setPosition(search.starts[index])
+        cursor.setPosition(search.ends[index], QTextCursor.KeepAnchor)
+        editor.setTextCursor(cursor)
+        editor.ensureCursorVisible()
+        search.refresh_highlights()
+        self.status_label.setText(f"{index + 1:,} / {len(search.starts):,}")
+
+    def find_all(self):
+        editor = self.window.get_current_editor()
+        options = self.options()
+        if editor is not None and options.text:
+            self._search(editor, options)
+
+    def replace(self):
+        editor = self.window.get_current_editor()
+        options = self.options()
+        compiled = self._compile(options)
+        if editor is None or compiled is None:
+            return
+        literal, pattern = compiled
+        cursor = editor.textCursor()
+        selected = cursor.selectedText()
+        if selected:
+            if literal is not None:
+                replacement = self.replace_edit.text() if selected == literal else None
+            else:
+                match = pattern.fullmatch(selected)
+                replacement = match.expand(self.replace_edit.text()) if match else None
+            if replacement is not None:
+                editor.begin_edit()
+                cursor.insertText(replacement)
+                editor.end_edit()
+        self.find_next()
+
+    def replace_all(self):
+        editor = self.window.get_current_editor()
+        options = self.options()
+        compiled = self._compile(options)
+        if editor is None or compiled is None:
+            return
+        seq = editor.property("edit_seq")
+        worker = ReplaceWorker(editor.toPlainText(), *compiled, self.replace_edit.text())
+        worker.signals.finished.connect(lambda result, count: self._apply_replace_all(editor, seq, result, count))
+        worker.signals.failed.connect(lambda message: self.status_label.setText(f"바꿀 수 없습니다: {message}"))
+        self._replace_worker = worker
+        self.status_label.setText("바꾸는 중...")
+        QThreadPool.globalInstance().start(worker)
+
+    def _apply_replace_all(self, editor, seq, result, count):
+        self._replace_worker = None
+        if editor.property("edit_seq") != seq:
+            self.status_label.setText("문서가 변경되었습니다. 다시 시도하세요.")
+            return
+        if count == 0:
+            self.status_label.setText("찾을 수 없습니다.")
+            return
+        cursor = QTextCursor(editor.document())
+        if isinstance(result, str):
+            editor.begin_edit(0, editor.document().characterCount() - 1)
+        else:
+            editor.begin_edit(result[0][0], result[-1][1])
+        # One edit block, so a single undo reverts the whole replace-all
+        cursor.beginEditBlock()
+        if isinstance(result, str):
+            cursor.select(QTextCursor.Document)
+            cursor.insertText(result)
+        else:
+            for start, end, replacement in reversed(result):
+                cursor.setPosition(start)
+                cursor.setPosition(end, QTextCursor.KeepAnchor)
+                cursor.insertText(replacement)
+        cursor.endEditBlock()
+        editor.end_edit()
+        self.status_label.setText(f"{count:,}개 항목을 바꿨습니다.")
+
+    def find_in_all_tabs(self):
+        options = self.options()
+        if self._compile(options) is not None:
+            self.find_in_all_tabs_requested.emit(options)
+
+
+class SearchResultsDock(QDockWidget):
+    """Streams "find in all tabs" results; activating one jumps to its window and tab."""
+    MAX_RESULTS_PER_TAB = 10000
+
+    def __init__(self, parent=None):
+        super().__init__("검색 결과", parent)
+        self.list_widget = QListWidget()
+        self.list_widget.setUniformItemSizes(True)
+        self.list_widget.itemActivated.connect(self.on_item_activated)
+        self.setWidget(self.list_widget)
+        self.workers = []
+        self.total = 0
+        self.skipped = 0
+
+    def search(self, targets, options, skipped=()):
+        """targets: (window, widget, label, path, on_disk) for every tab to search.
+
+        With on_disk the tab is searched in its file (it is a placeholder
+        or still loading), otherwise in the editor's text. `path` is the
+        tab's file either way, so a result can find its tab again once the
+        widget has been replaced by loading or eviction.
+        skipped: (label, reason) for tabs that cannot be searched at all.
+        """
+        for worker in self.workers:
+            worker.cancel()
+        self.workers = []
+        self.total = 0
+        self.skipped = 0
+        self.list_widget.clear()
+        literal, pattern = compile_search(options)
+        for window, widget, label, path, on_disk in targets:
+            if not on_disk:
+                worker = SearchWorker(widget.toPlainText(), literal, pattern,
+                                      limit=self.MAX_RESULTS_PER_TAB, with_lines=True)
+                seq = widget.property("edit_seq")
+            else:
+                worker = SearchWorker(None, literal, pattern, limit=self.MAX_RESULTS_PER_TAB, with_lines=True,
+                                      path=path)
+                seq = None
+            worker.signals.matches.connect(
+                lambda batch, w=window, e=widget, l=label, p=path, s=seq: self.add_results(w, e, l, p, s, batch))
+            worker.signals.finished.connect(self.on_worker_finished)
+            worker.signals.failed.connect(lambda message, l=label: self.add_skipped(l, message))
+            worker.signals.failed.connect(self.on_worker_finished)
+            self.workers.append(worker)
+            QThreadPool.globalInstance().start(worker)
+        for label, reason in skipped:
+            self.add_skipped(label, reason)
+        self.update_title()
+        self.show()
+
+    def add_results(self, window, widget, label, path, seq, batch):
+        self.list_widget.setUpdatesEnabled(False)
+        for start, end, line, text in batch:
+            item = QListWidgetItem(f"{label}:{line}: {text.strip()}")
+            item.setData(Qt.UserRole, (window, widget, path, seq, start, end, line))
+            self.list_widget.addItem(item)
+        self.list_widget.setUpdatesEnabled(True)
+        self.total += len(batch)
+        self.update_title()
+
+    def add_skipped(self, label, reason):
+        """Say which tab was not searched, so missing results are not mistaken for none."""
+        item = QListWidgetItem(f"{label}: 검색하지 못함 ({reason})")
+        item.setForeground(QColor('#b00000'))
+        self.list_widget.insertItem(self.skipped, item)
+        self.skipped += 1
+        self.update_title()
+
+    def on_worker_finished(self):
+        self.workers = [w for w in self.workers if w.signals is not self.sender()]
+        self.update_title()
+
+    def update_title(self):
+        suffix = f", 탭 {self.skipped}개 건너뜀" if self.skipped else ""
+        if self.workers:
+            suffix += " (검색 중...)"
+        self.setWindowTitle(f"검색 결과 {self.total:,}개{suffix}")
+
+    def on_item_activated(self, item):
+        data = item.data(Qt.UserRole)
+        if data is None:
+            return  # A skipped tab
+        window, widget, path, seq, start, end, line = data
+        index = window.tab_widget.indexOf(widget)
+        if index == -1 and path is not None:
+            # The placeholder has been loaded since, or the editor evicted; find the tab by its file
+            index = next((i for i in range(window.tab_widget.count())
+                          if window.tab_widget.widget(i).property("file_path") == path), -1)
+        if index == -1:
+            return
+        # Activating a placeholder loads it
+        window.tab_widget.setCurrentIndex(index)
+        window.activateWindow()
+        window.raise_()
+        window.when_loaded(window.tab_widget.widget(index),
+                           lambda editor: self._select(editor, widget, seq, start, end, line))
+
+    def _select(self, editor, searched, seq, start, end, line):
+        cursor = editor.textCursor()
+        if seq is None:
+            # Found on disk: still holds while the loaded tab is unedited
+            unchanged = not editor.document().isModified()
+        else:
+            # Found in the text of `searched`: holds while that same editor is unedited since
+            unchanged = editor is searched and editor.property("edit_seq") == seq
+        if unchanged:
+            cursor.setPosition(start)
+            cursor.setPosition(end, QTextCursor.KeepAnchor)
+        else:
+            # The tab was edited since; the line number is the best remaining guess
+            block = editor.document().findBlockByNumber(line - 1)
+            if not block.isValid():
+                return
+            cursor = QTextCursor(block)
+        editor.setTextCursor(cursor)
+        editor.ensureCursorVisible()
+        editor.setFocus()
@@ -0,0 +1,43 @@
+import os
+import json
+import tempfile
+
+SESSION_VERSION = 1
+
+
+def load_session(path):
+    """Read the saved windows, each {'geometry', 'current', 'tabs'}. A missing or bad file is an empty session."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            session = json.load(f)
+    except (OSError, ValueError):
+        return []
+    if not isinstance(session, dict) or session.get('version') != SESSION_VERSION:
+        return []
+    windows = []
+    for window in session.get('windows', []):
+        tabs = [tab for tab in window.get('tabs', []) if isinstance(tab.get('path'), str)]
+        if tabs:
+            windows.append({'geometry': window.get('geometry'), 'current': window.get('current', 0), 'tabs': tabs})
+    return windows
+
+
+def save_session(path, windows):
+    """Replace the session file atomically, so a crash mid-write keeps the previous session."""
+    data = json.dumps({'version': SESSION_VERSION, 'windows': windows}, ensure_ascii=False, separators=(',', ':'))
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".session.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
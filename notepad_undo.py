@@ -0,0 +1,390 @@
+import os
+import re
+import zlib
+import time
+import tempfile
+import itertools
+
+from PyQt5.QtCore import QObject
+from PyQt5.QtGui import QTextCursor
+
+from notepad_journal import utf16_len
+
+# Typing or deleting merges into the previous step unless paused this long
+COALESCE_SECONDS = 1.0
+# Text read on each side of the cursor or selection before a user edit. An
+# edit removing text beyond it (rare: a huge Ctrl+Backspace) clears the history.
+EDIT_WINDOW = 4096
+# The window for keys that can remove at most a character or the selection
+# (typing, Backspace, Delete without Ctrl/Alt); reading 8 KB per keystroke
+# would cost more than Qt's own handling of the key
+TYPING_WINDOW = 16
+# Rough bookkeeping cost of one step, in memory or spilled
+STEP_OVERHEAD = 120
+# Characters encoded and compressed at a time when spilling
+SPILL_CHUNK = 1024 * 1024
+# The spill file is rewritten once its dropped records outweigh the live ones and this
+COMPACT_BYTES = 1024 * 1024
+
+# Orders steps across all tabs, oldest first
+_sequence = itertools.count()
+
+_ASTRAL = re.compile('[\U00010000-\U0010ffff]')
+
+
+def _slice16(text, start, end):
+    """text[start:end] with offsets in UTF-16 units, as QTextDocument counts them."""
+    if text.isascii() or not _ASTRAL.search(text):
+        return text[start:end]
+    return text.encode('utf-16-le', 'surrogatepass')[start * 2:end * 2].decode('utf-16-le', 'surrogatepass')
+
+
+class UndoStep:
+    """Replacing `length` units at `position` with `text` takes the document one step back (or forward).
+
+    While the step is spilled, `text` is None and `spilled` is the
+    (offset, size) of its compressed text in the history's spill file.
+    """
+    __slots__ = ('position', 'length', 'text', 'spilled', 'seq', 'time')
+
+    def __init__(self, position, length, text, when=0.0):
+        self.position = position
+        self.length = length
+        self.text = text
+        self.spilled = None
+        self.seq = next(_sequence)
+        self.time = when
+
+    def cost(self):
+        return STEP_OVERHEAD + (2 * len(self.text) if self.text is not None else 0)
+
+
+class UndoBudget:
+    """Caps the undo memory of all tabs of all windows together.
+
+    Over the cap, the oldest steps still in memory are spilled first,
+    whichever tab they belong to.
+    """
+
+    def __init__(self, cap):
+        self.cap = cap
+        self.total = 0
+        self.histories = []
+
+    def enforce(self):
+        while self.total > self.cap:
+            candidates = [history for history in self.histories if history.oldest_in_memory() is not None]
+            if not candidates:
+                break
+            min(candidates, key=UndoHistory.oldest_in_memory).spill_oldest()
+
+
+class UndoHistory(QObject):
+    """Undo/redo for one editor, within a memory budget, in place of QTextDocument's unbounded stack.
+
+    The document's own undo stays disabled. A step keeps only the text an
+    edit removed and the length it inserted; the inserted text is read back
+    when the step is undone. Removed text is captured from a window read
+    just before each user edit (see EditorMixin), or before programmatic
+    edits wrapped in begin_edit/end_edit. Changes outside such a bracket
+    are loads: appending to the end keeps the history, anything else
+    clears it, as setPlainText() clears Qt's.
+
+    Consecutive typing or deleting merges into one step. When the tab's
+    steps take more than `memory_budget` (or all tabs more than the
+    UndoBudget's cap), the oldest are compressed into a temporary spill
+    file; past `spill_budget` on disk, the oldest are dropped.
+    """
+
+    def __init__(self, editor, memory_budget, spill_budget, budget=None):
+        super().__init__(editor)
+        self.editor = editor
+        self.document = editor.document()
+        self.memory_budget = memory_budget
+        self.spill_budget = spill_budget
+        self.budget = budget
+        self.memory = 0
+        self._undo = []
+        self._redo = []         # Nearest step last
+        self._spilled = 0       # _undo[:_spilled] are in the spill file, the rest in memory
+        self._evicted = 0       # Steps dropped from the bottom of _undo
+        self._clean = 0         # _depth() at which the document was last saved or loaded, None if unreachable
+        self._window = None     # (start, end, text) read before the current edit
+        self._margin = EDIT_WINDOW
+        self._edit_depth = 0
+        self._applying = False
+        self._spill_file = None
+        self._live = 0          # Spill file bytes of steps still on a stack
+        self._dead = 0
+
+        self.document.setUndoRedoEnabled(False)
+        self.document.contentsChange.connect(self._on_contents_change)
+        self.document.modificationChanged.connect(self._on_modification_changed)
+        if budget is not None:
+            budget.histories.append(self)
+        editor.destroyed.connect(self._dispose)
+
+    def _dispose(self):
+        self._add_memory(-self.memory)
+        if self.budget is not None and self in self.budget.histories:
+            self.budget.histories.remove(self)
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def can_undo(self):
+        return bool(self._undo)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def stats(self):
+        return {
+            'undo_steps': len(self._undo),
+            'redo_steps': len(self._redo),
+            'spilled_steps': self._spilled + sum(step.text is None for step in self._redo),
+            'evicted_steps': self._evicted,
+            'memory': self.memory,
+            'spilled_bytes': self._live,
+            'spill_file_bytes': self._live + self._dead,
+        }
+
+    # --- Recording ---
+    def begin_edit(self, start=None, end=None, margin=EDIT_WINDOW):
+        """Before changing the document: `start`..`end` (default: the selection) is what the edit may remove.
+
+        The edit may also reach up to `margin` characters beyond it.
+        """
+        self._edit_depth += 1
+        if self._edit_depth == 1:
+            if start is None:
+                cursor = self.editor.textCursor()
+                start, end = cursor.selectionStart(), cursor.selectionEnd()
+            self._margin = margin
+            self._read_window(start, end)
+
+    def end_edit(self):
+        self._edit_depth -= 1
+        if self._edit_depth == 0:
+            self._window = None
+
+    def _read_window(self, start, end):
+        length = self.document.characterCount() - 1
+        start = max(0, start - self._margin)
+        end = min(length, end + self._margin)
+        self._window = (start, end, self._text(start, end))
+
+    def _text(self, start, end):
+        if start == end:
+            return ''
+        cursor = QTextCursor(self.document)
+        cursor.setPosition(start)
+        cursor.setPosition(end, QTextCursor.KeepAnchor)
+        return cursor.selectedText().replace('\u2029', '\n')
+
+    def _on_contents_change(self, position, removed, added):
+        if self._applying:
+            return
+        if self._window is None:
+            # Not an edit: a load, a reload, or text appended from disk
+            if removed or position + added != self.document.characterCount() - 1:
+                self.clear()
+            return
+        start, end, text = self._window
+        if position < start or position + removed > end:
+            # The edit reached past what was read before it; its removed text is unknown
+            self.clear()
+        else:
+            self._record(position, removed, _slice16(text, position - start, position - start + removed), added)
+        # A second change within the same edit (a drag-move) starts from the new text
+        self._read_window(position, position + added)
+
+    def _record(self, position, removed, removed_text, added):
+        now = time.monotonic()
+        self._clear_redo()
+        if self._clean is not None and self._clean > self._depth():
+            self._clean = None
+        top = self._undo[-1] if len(self._undo) > self._spilled else None
+        cost = top.cost() if top is not None else 0
+        if (top is not None and self._clean != self._depth() and now - top.time < COALESCE_SECONDS
+                and self._merge(top, position, removed, removed_text, added)):
+            top.time = now
+            self._add_memory(top.cost() - cost)
+            if not top.length and not top.text:
+                # Typed and then deleted again: nothing left to undo
+                self._add_memory(-top.cost())
+                self._undo.pop()
+        else:
+            step = UndoStep(position, added, removed_text, now)
+            self._undo.append(step)
+            self._add_memory(step.cost())
+        self._enforce()
+
+    def _merge(self, top, position, removed, removed_text, added):
+        if not removed and added == 1:
+            # Typing on; Enter starts a new step
+            if position != top.position + top.length or self.document.characterAt(position) == '\u2029':
+                return False
+            top.length += 1
+            return True
+        if added or removed > 2:
+            return False
+        if top.length and top.position <= position and position + removed == top.position + top.length:
+            # Backspace over text typed in this step
+            top.length -= removed
+            return True
+        if not top.length and position + removed == top.position:
+            # Backspace
+            top.text = removed_text + top.text
+            top.position = position
+            return True
+        if not top.length and position == top.position:
+            # Delete
+            top.text += removed_text
+            return True
+        return False
+
+    def _on_modification_changed(self, modified):
+        if not modified:
+            self._clean = self._depth()
+
+    def _depth(self):
+        return self._evicted + len(self._undo)
+
+    def clear(self):
+        self._clear_redo()
+        for step in self._undo:
+            self._discard(step)
+        self._undo.clear()
+        self._spilled = 0
+        self._evicted = 0
+        self._clean = None if self.document.isModified() else 0
+        self._compact()
+
+    # --- Undo and redo ---
+    def undo(self):
+        return self._move(self._undo, self._redo)
+
+    def redo(self):
+        return self._move(self._redo, self._undo)
+
+    def _move(self, source, target):
+        if not source:
+            return False
+        step = source.pop()
+        self._spilled = min(self._spilled, len(self._undo))
+        self._add_memory(-step.cost())
+        text = self._load(step)
+
+        cursor = QTextCursor(self.document)
+        cursor.setPosition(step.position)
+        cursor.setPosition(step.position + step.length, QTextCursor.KeepAnchor)
+        inverse = UndoStep(step.position, utf16_len(text), self._text(step.position, step.position + step.length))
+        self._applying = True
+        try:
+            if text:
+                cursor.insertText(text)
+            else:
+                cursor.removeSelectedText()
+        finally:
+            self._applying = False
+        self.editor.setTextCursor(cursor)
+
+        target.append(inverse)
+        self._add_memory(inverse.cost())
+        self.document.setModified(self._depth() != self._clean)
+        self._enforce()
+        return True
+
+    # --- Memory ---
+    def _add_memory(self, delta):
+        self.memory += delta
+        if self.budget is not None:
+            self.budget.total += delta
+
+    def oldest_in_memory(self):
+        """Sequence number of the oldest undo step not yet spilled, or None."""
+        return self._undo[self._spilled].seq if self._spilled < len(self._undo) else None
+
+    def spill_oldest(self):
+        self._spill(self._undo[self._spilled])
+        self._spilled += 1
+        self._forget()
+
+    def _enforce(self):
+        while self.memory > self.memory_budget and self._spilled < len(self._undo):
+            self._spill(self._undo[self._spilled])
+            self._spilled += 1
+        for step in self._redo:
+            if self.memory <= self.memory_budget:
+                break
+            if step.text is not None:
+                self._spill(step)
+        self._forget()
+        if self.budget is not None:
+            self.budget.enforce()
+
+    def _forget(self):
+        # What is left is bookkeeping, or the disk is full too: drop the oldest steps
+        while self._undo and (self.memory > self.memory_budget or self._live > self.spill_budget):
+            self._discard(self._undo.pop(0))
+            self._evicted += 1
+            self._spilled = max(0, self._spilled - 1)
+        while self._redo and self._live > self.spill_budget:
+            self._discard(self._redo.pop(0))
+        self._compact()
+
+    def _spill(self, step):
+        if self._spill_file is None:
+            self._spill_file = tempfile.TemporaryFile(prefix="notepad-undo-")
+        f = self._spill_file
+        offset = f.seek(0, os.SEEK_END)
+        compressor = zlib.compressobj(1)
+        text = step.text
+        for i in range(0, len(text), SPILL_CHUNK):
+            f.write(compressor.compress(text[i:i + SPILL_CHUNK].encode('utf-8', 'surrogatepass')))
+        f.write(compressor.flush())
+        step.spilled = (offset, f.tell() - offset)
+        step.text = None
+        self._live += step.spilled[1]
+        self._add_memory(-2 * len(text))
+
+    def _load(self, step):
+        """The step's text, read back from the spill file if needed (which frees its record)."""
+        if step.text is not None:
+            return step.text
+        offset, size = step.spilled
+        self._spill_file.seek(offset)
+        text = zlib.decompress(self._spill_file.read(size)).decode('utf-8', 'surrogatepass')
+        self._release(step)
+        return text
+
+    def _discard(self, step):
+        self._add_memory(-step.cost())
+        if step.spilled is not None:
+            self._release(step)
+
+    def _release(self, step):
+        self._live -= step.spilled[1]
+        self._dead += step.spilled[1]
+        step.spilled = None
+
+    def _clear_redo(self):
+        for step in self._redo:
+            self._discard(step)
+        self._redo.clear()
+
+    def _compact(self):
+        if self._spill_file is None or (self._live and self._dead < max(self._live, COMPACT_BYTES)):
+            return
+        old, self._spill_file = self._spill_file, None
+        if self._live:
+            self._spill_file = tempfile.TemporaryFile(prefix="notepad-undo-")
+            for step in self._undo[:self._spilled] + self._redo:
+                if step.spilled is not None:
+                    offset, size = step.spilled
+                    old.seek(offset)
+                    step.spilled = (self._spill_file.tell(), size)
+                    self._spill_file.write(old.read(size))
+        old.close()
+        self._dead = 0
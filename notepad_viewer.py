@@ -0,0 +1,231 @@
+import mmap
+import threading
+from array import array
+from itertools import accumulate, islice
+
+from PyQt5.QtWidgets import (QAbstractScrollArea, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+                             QPushButton)
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QPainter, QPalette
+
+
+class LineIndex:
+    """Sparse line-offset index over a memory-mapped file.
+
+    Only every STRIDE-th line start is stored, so the index stays a few
+    hundred KB even for files with hundreds of millions of lines.
+    """
+    STRIDE = 1024
+    CHUNK_SIZE = 4 * 1024 * 1024
+
+    def __init__(self, mm):
+        self.mm = mm
+        self.checkpoints = array('Q', [0])
+        self.line_count = 1
+        self.indexed_bytes = 0
+        self.complete = len(mm) == 0
+
+    def index_next_chunk(self):
+        """Index one more chunk. Returns False once the whole file is indexed."""
+        if self.complete:
+            return False
+        start = self.indexed_bytes
+        chunk = self.mm[start:start + self.CHUNK_SIZE]
+        count = chunk.count(b'\n')
+        if count:
+            # Line numbers starting in this chunk are line_count .. line_count + count - 1
+            first = -self.line_count % self.STRIDE
+            if first < count:
+                ends = accumulate(len(part) + 1 for part in chunk.split(b'\n')[:-1])
+                self.checkpoints.extend(start + end for end in islice(ends, first, None, self.STRIDE))
+            self.line_count += count
+        self.indexed_bytes = start + len(chunk)
+        self.complete = self.indexed_bytes >= len(self.mm)
+        return not self.complete
+
+    def line_offset(self, line):
+        pos = self.checkpoints[line // self.STRIDE]
+        for _ in range(line % self.STRIDE):
+            pos = self.mm.find(b'\n', pos) + 1
+        return pos
+
+    def read_lines(self, first, count, max_bytes):
+        """Return up to `count` raw lines starting at `first`, each truncated to max_bytes."""
+        mm = self.mm
+        size = len(mm)
+        pos = self.line_offset(first)
+        lines = []
+        for _ in range(min(count, self.line_count - first)):
+            end = mm.find(b'\n', pos)
+            if end == -1:
+                end = size
+            lines.append(mm[pos:min(end, pos + max_bytes)].rstrip(b'\r'))
+            pos = end + 1
+            if pos > size:
+                break
+        return lines
+
+
+class IndexerSignals(QObject):
+    progress = pyqtSignal()
+    finished = pyqtSignal()
+
+
+class LineIndexer(QRunnable):
+    def __init__(self, index):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.index = index
+        self.signals = IndexerSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def run(self):
+        try:
+            while not self._cancelled.is_set() and self.index.index_next_chunk():
+                self.signals.progress.emit()
+        except ValueError:
+            # The map was closed underneath us because the tab went away
+            return
+        if not self._cancelled.is_set():
+            self.signals.finished.emit()
+
+
+class LargeFileView(QAbstractScrollArea):
+    """Read-only viewport that decodes and paints only the visible lines."""
+    edit_requested = pyqtSignal()
+    MAX_LINE_BYTES = 4096
+
+    def __init__(self, index, encoding='utf-8', parent=None):
+        super().__init__(parent)
+        self.index = index
+        self.encoding = encoding
+        self.max_width = 0
+        self.verticalScrollBar().setSingleStep(1)
+        self.horizontalScrollBar().setSingleStep(20)
+        self.update_scroll_range()
+
+    def line_height(self):
+        return self.fontMetrics().lineSpacing()
+
+    def visible_line_count(self):
+        return max(1, self.viewport().height() // self.line_height())
+
+    def update_scroll_range(self):
+        bar = self.verticalScrollBar()
+        bar.setPageStep(self.visible_line_count())
+        bar.setRange(0, max(0, self.index.line_count - self.visible_line_count()))
+        self.horizontalScrollBar().setRange(0, max(0, self.max_width - self.viewport().width()))
+
+    def goto_line(self, line):
+        self.verticalScrollBar().setValue(max(0, line - 1))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_scroll_range()
+
+    def scrollContentsBy(self, dx, dy):
+        self.viewport().update()
+
+    def keyPressEvent(self, event):
+        if event.text() and event.text().isprintable() and not event.modifiers() & Qt.ControlModifier:
+            self.edit_requested.emit()
+            return
+        if event.key() == Qt.Key_Home and event.modifiers() & Qt.ControlModifier:
+            self.verticalScrollBar().setValue(0)
+        elif event.key() == Qt.Key_End and event.modifiers() & Qt.ControlModifier:
+            self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+        else:
+            super().keyPressEvent(event)
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        painter.fillRect(event.rect(), self.palette().base())
+        painter.setPen(self.palette().color(QPalette.Text))
+        metrics = self.fontMetrics()
+        line_height = self.line_height()
+        first = self.verticalScrollBar().value()
+        count = self.visible_line_count() + 1
+
+        # The gutter is sized for the highest line number that can be on screen
+        gutter = metrics.horizontalAdvance(str(first + count)) + 12
+        x = gutter - self.horizontalScrollBar().value()
+        y = metrics.ascent()
+        widest = self.max_width
+        for raw in self.index.read_lines(first, count, self.MAX_LINE_BYTES):
+            text = raw.decode(self.encoding, errors='replace').expandtabs(4)
+            painter.drawText(x, y, text)
+            widest = max(widest, gutter + metrics.horizontalAdvance(text))
+            y += line_height
+
+        painter.fillRect(0, 0, gutter - 6, self.viewport().height(), self.palette().alternateBase())
+        painter.setPen(self.palette().color(QPalette.Mid))
+        y = metrics.ascent()
+        for number in range(first + 1, min(first + count, self.index.line_count) + 1):
+            painter.drawText(4, y, str(number))
+            y += line_height
+        painter.end()
+
+        if widest != self.max_width:
+            self.max_width = widest
+            self.update_scroll_range()
+
+
+class LargeFileViewer(QWidget):
+    """Read-only tab for files too large to load into an editor document."""
+    edit_requested = pyqtSignal()
+
+    def __init__(self, path, font, encoding='utf-8', parent=None):
+        super().__init__(parent)
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.index = LineIndex(self._mm)
+
+        self.info_label = QLabel()
+        self.edit_button = QPushButton("편집기로 열기")
+        self.edit_button.clicked.connect(self.edit_requested)
+        info_hbox = QHBoxLayout()
+        info_hbox.setContentsMargins(6, 2, 6, 2)
+        info_hbox.addWidget(self.info_label)
+        info_hbox.addStretch()
+        info_hbox.addWidget(self.edit_button)
+
+        self.view = LargeFileView(self.index, encoding)
+        self.view.setFont(font)
+        self.view.edit_requested.connect(self.edit_requested)
+
+        vbox = QVBoxLayout(self)
+        vbox.setContentsMargins(0, 0, 0, 0)
+        vbox.setSpacing(0)
+        vbox.addLayout(info_hbox)
+        vbox.addWidget(self.view)
+        self.setFocusProxy(self.view)
+
+        self.indexer = LineIndexer(self.index)
+        self.indexer.signals.progress.connect(self.on_index_progress)
+        self.indexer.signals.finished.connect(self.on_index_progress)
+        self.on_index_progress()
+        QThreadPool.globalInstance().start(self.indexer)
+
+    def on_index_progress(self):
+        self.view.update_scroll_range()
+        self.view.viewport().update()
+        size = len(self._mm)
+        if self.index.complete:
+            status = f"{self.index.line_count:,}줄"
+        else:
+            status = f"색인 중 {self.index.indexed_bytes * 100 // size}%"
+        self.info_label.setText(f"읽기 전용 보기 ({size / (1024 * 1024):,.0f} MB, {status})")
+
+    def goto_line(self, line):
+        self.view.goto_line(line)
+
+    def close_file(self):
+        self.indexer.cancel()
+        self.indexer.signals.progress.disconnect(self.on_index_progress)
+        self.indexer.signals.finished.disconnect(self.on_index_progress)
+        self._mm.close()
+        self._file.close()
@@ -0,0 +1,100 @@
+import os
+from collections import namedtuple
+
+from PyQt5.QtCore import QObject, QTimer, QFileSystemWatcher, pyqtSignal
+
+# size: bytes of the file an editor holds, mtime: st_mtime_ns, tail: the last TAIL_BYTES of them
+DiskState = namedtuple('DiskState', 'size mtime tail')
+
+# Compared on every change; a file whose old end still matches only grew
+TAIL_BYTES = 64
+
+
+def snapshot_file(f):
+    """DiskState of an open binary file, up to its current position."""
+    size = f.tell()
+    mtime = os.fstat(f.fileno()).st_mtime_ns
+    start = max(0, size - TAIL_BYTES)
+    f.seek(start)
+    tail = f.read(size - start)
+    f.seek(size)
+    return DiskState(size, mtime, tail)
+
+
+def disk_state(path):
+    try:
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            return snapshot_file(f)
+    except OSError:
+        return None
+
+
+def read_appended(path, state, max_bytes):
+    """Bytes appended to `path` since `state`, with the new state.
+
+    Returns (b'', state) if nothing was added, and None if the file was
+    truncated, rewritten, removed, or grew by more than `max_bytes`.
+    """
+    try:
+        st = os.stat(path)
+        if st.st_size == state.size and st.st_mtime_ns == state.mtime:
+            return b'', state
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < state.size or size - state.size > max_bytes:
+                return None
+            f.seek(state.size - len(state.tail))
+            if f.read(len(state.tail)) != state.tail:
+                return None
+            data = f.read(size - state.size)
+            return data, snapshot_file(f)
+    except OSError:
+        return None
+
+
+class FileWatcher(QObject):
+    """QFileSystemWatcher with change events coalesced per path.
+
+    However often a file is written, each watched path is reported at most
+    once per `interval_ms`, all due paths together in one `changed` signal.
+    """
+    changed = pyqtSignal(list)
+
+    def __init__(self, interval_ms=100, parent=None):
+        super().__init__(parent)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._watched = set()
+        self._dirty = set()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._flush)
+
+    def watch(self, path):
+        if path in self._watched:
+            return
+        self._watched.add(path)
+        self._watcher.addPath(path)
+
+    def unwatch(self, path):
+        self._watched.discard(path)
+        self._dirty.discard(path)
+        self._watcher.removePath(path)
+
+    def _on_file_changed(self, path):
+        self._dirty.add(path)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _flush(self):
+        dirty, self._dirty = self._dirty, set()
+        watched = set(self._watcher.files())
+        for path in dirty:
+            # Replacing a file (an atomic save, log rotation) drops it from the watch list
+            if path in self._watched and path not in watched and os.path.exists(path):
+                self._watcher.addPath(path)
+        dirty &= self._watched
+        if dirty:
+            self.changed.emit(sorted(dirty))
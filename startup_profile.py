@@ -0,0 +1,73 @@
+"""Optional startup timing for the entry-point scripts.
+
+Import this first and call mark() at each milestone. Nothing is recorded
+unless the script was started with --profile-startup[=out.json] or the
+STARTUP_PROFILE environment variable names an output file. Timestamps are
+milliseconds since this module was imported; the first paint of the
+watched window writes the JSON file. With STARTUP_PROFILE_EXIT=1 the
+application quits right after that, which is handy for repeated runs.
+"""
+import os
+import sys
+import json
+import time
+
+_started = time.perf_counter()
+_marks = []
+_output = os.environ.get('STARTUP_PROFILE') or None
+
+for _arg in sys.argv[1:]:
+    if _arg == '--profile-startup' or _arg.startswith('--profile-startup='):
+        sys.argv.remove(_arg)
+        _output = _arg.partition('=')[2] or _output or 'startup-profile.json'
+        break
+
+enabled = _output is not None
+
+
+def mark(name):
+    if enabled:
+        _marks.append((name, (time.perf_counter() - _started) * 1000))
+
+
+def write():
+    if not enabled:
+        return
+    script = os.path.splitext(os.path.basename(sys.argv[0] or 'python'))[0]
+    report = {
+        'script': script,
+        'python': sys.version.split()[0],
+        'modules': len(sys.modules),
+        'marks': {name: round(ms, 3) for name, ms in _marks},
+    }
+    with open(_output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+        f.write('\n')
+
+
+def watch_first_paint(widget):
+    """Record 'first_show' and 'first_paint' for `widget`, then write the report."""
+    if not enabled:
+        return
+    from PyQt5.QtCore import QObject, QEvent, QTimer
+    from PyQt5.QtWidgets import QApplication
+
+    class FirstPaintFilter(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Show and obj is widget:
+                mark('first_show')
+            elif event.type() == QEvent.Paint:
+                mark('first_paint')
+                widget.removeEventFilter(self)
+                # The paint just started; report once it has reached the screen
+                QTimer.singleShot(0, self.finish)
+            return False
+
+        def finish(self):
+            mark('first_frame')
+            write()
+            if os.environ.get('STARTUP_PROFILE_EXIT') == '1':
+                QApplication.quit()
+
+    widget._first_paint_filter = FirstPaintFilter(widget)
+    widget.installEventFilter(widget._first_paint_filter)
@@ -0,0 +1,42 @@
+import os
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from PyQt5.QtWidgets import QApplication
+
+from notepad import Notepad, notepad_instances
+
+# Kept for the whole session; widgets must never outlive it
+app = QApplication.instance() or QApplication(sys.argv[:1])
+
+
+@pytest.fixture
+def window():
+    window = Notepad()
+    notepad_instances.append(window)
+    window.show()
+    yield window
+    notepad_instances.remove(window)
+    window.hide()
+    window.deleteLater()
+    app.processEvents()
+
+
+@pytest.fixture
+def slot_errors(monkeypatch):
+    """Exceptions raised in Qt slots; PyQt5 aborts on them with the default excepthook."""
+    errors = []
+    monkeypatch.setattr(sys, 'excepthook', lambda kind, value, tb: errors.append(value))
+    return errors
+
+
+def wait_until(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        QApplication.processEvents()
+        time.sleep(0.001)
@@ -0,0 +1,22 @@
+"""Find/replace dialog, run offscreen against a real Notepad window."""
+from conftest import wait_until
+
+
+def test_find_next_after_an_edit(window, slot_errors):
+    editor = window.get_current_editor()
+    editor.setPlainText("foo one\nfoo two\n")
+    window.show_find_dialog()
+    dialog = window.find_dialog
+
+    dialog.find_edit.setText("foo")
+    dialog.find_next()
+    wait_until(lambda: editor.textCursor().selectedText() == "foo")
+
+    # The edit invalidates the search; the next Find Next starts another one on the same editor
+    editor.setPlainText("bar one\nbar two\n")
+    dialog.find_edit.setText("bar")
+    dialog.find_next()
+    wait_until(lambda: editor.textCursor().selectedText() == "bar")
+
+    assert slot_errors == []
+    assert dialog.status_label.text() == "1 / 2"
@@ -0,0 +1,24 @@
+"""Autosave journal recovery."""
+import json
+import os
+
+from notepad_journal import find_orphaned_journals, recover_tabs
+
+
+def write_journal(path, records):
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+
+
+def test_generations_replay_in_numeric_order(tmp_path):
+    # A crash between compactions can leave two generations behind; the newer one must win
+    old = str(tmp_path / "journal-4321.9.jsonl")
+    new = str(tmp_path / "journal-4321.10.jsonl")
+    write_journal(old, [{'op': 'open', 'tab': 1, 'win': 1, 'path': None, 'text': 'old'}])
+    write_journal(new, [{'op': 'open', 'tab': 1, 'win': 1, 'path': None, 'text': 'new'}])
+
+    orphans = find_orphaned_journals(str(tmp_path))
+
+    assert [os.path.basename(p) for p in orphans] == ["journal-4321.9.jsonl", "journal-4321.10.jsonl"]
+    assert recover_tabs(orphans) == [[(None, 'new')]]
@@ -0,0 +1,52 @@
+"""Search in all tabs: results in tabs that were not loaded when searched."""
+from PyQt5.QtWidgets import QApplication
+
+from conftest import wait_until
+from notepad import TabPlaceholder
+from notepad_search import SearchOptions
+
+
+def open_files(window, tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"g{i}.txt"
+        path.write_text(f"a\nneedle {i}\nb\n")
+        paths.append(str(path))
+    window.open_paths(paths)
+    return paths
+
+
+def activate(window, prefix):
+    dock = window.results_dock
+    wait_until(lambda: not dock.workers)
+    items = [dock.list_widget.item(i) for i in range(dock.list_widget.count())]
+    dock.on_item_activated(next(item for item in items if item.text().startswith(prefix)))
+    editor = window.tab_widget.currentWidget()
+    wait_until(lambda: editor.property("loader") is None)
+    for _ in range(10):
+        QApplication.processEvents()
+    return editor
+
+
+def test_result_in_a_small_unloaded_file_is_selected(window, tmp_path):
+    open_files(window, tmp_path, 3)
+    assert isinstance(window.tab_widget.widget(1), TabPlaceholder)
+    window.find_in_all_tabs(SearchOptions("needle", False, True, False))
+
+    # The load finishes almost at once; the selection must not miss it
+    editor = activate(window, "g0.txt:2")
+    assert editor.textCursor().selectedText() == "needle"
+    assert editor.textCursor().blockNumber() == 1
+
+
+def test_result_in_an_editor_evicted_since_is_found_by_path(window, tmp_path):
+    open_files(window, tmp_path, 2)
+    window.tab_widget.setCurrentIndex(1)
+    wait_until(lambda: window.tab_widget.widget(1).property("loader") is None)
+    window.tab_widget.setCurrentIndex(2)
+    window.find_in_all_tabs(SearchOptions("needle", False, True, False))
+    window.evict_tab(window.tab_widget.widget(1))
+
+    editor = activate(window, "g0.txt:2")
+    assert window.tab_widget.currentIndex() == 1
+    assert editor.textCursor().blockNumber() == 1
@@ -0,0 +1,31 @@
+"""TimerHistory: today's in-memory total against what reaches the database."""
+import time
+
+from PyQt5.QtWidgets import QApplication
+
+from conftest import wait_until
+from timer_history import TimerHistory, connect, total_seconds
+
+
+def test_failed_write_is_taken_back_out_of_the_total(tmp_path):
+    path = str(tmp_path / "history.sqlite3")
+    history = TimerHistory(path, batch_seconds=0.01)
+    messages = []
+    history.failed.connect(messages.append)
+    now = time.time()
+    try:
+        history.record('work', now, 60)
+        wait_until(lambda: total_seconds(connect(path)) == 60)
+
+        conn = connect(path)
+        conn.execute('DROP TABLE laps')  # The next batch fails halfway and is rolled back
+        conn.close()
+        history.record('work', now, 30, laps=[10])
+        assert history.today_seconds() == 90
+        wait_until(lambda: messages)
+    finally:
+        history.close()
+    QApplication.processEvents()
+
+    assert history.today_seconds() == 60
+    assert total_seconds(connect(path)) == 60
@@ -0,0 +1,267 @@
+import time
+import heapq
+import itertools
+
+from PyQt5.QtCore import QObject, QTimer, QEvent, Qt, pyqtSignal
+
+NS_PER_MS = 1000 * 1000
+NS_PER_SEC = 1000 * NS_PER_MS
+
+
+class TimingEngine(QObject):
+    """단조 시계(monotonic clock)로 경과/남은 시간을 계산하는 타이머 엔진
+
+    QTimer의 timeout 횟수를 세지 않고, 매번 시계에서 시간을 다시 읽습니다.
+    틱은 화면을 다시 그리라는 신호일 뿐이라 늦게 오거나 몇 개를 건너뛰어도
+    시간은 틀어지지 않습니다. 이벤트 루프가 밀려 여러 초가 지나갔다면 틱은
+    하나로 합쳐지고, 다음 틱은 다음 초 경계에 맞춰 예약됩니다.
+    clock은 나노초를 돌려주는 함수로, 테스트에서는 가짜 시계를 넣을 수 있습니다.
+
+    창이 보이지 않는 동안에는 set_ticks_suspended(True)로 매초 틱을 멈춥니다.
+    카운트다운은 끝나는 순간에만 한 번 깨어나고, 다시 보이면 바로 한 번
+    틱을 내서 그동안 지난 시간을 정확히 따라잡습니다.
+    """
+    tick = pyqtSignal()      # 표시할 초가 바뀜
+    finished = pyqtSignal()  # 카운트다운이 0에 도달
+
+    def __init__(self, parent=None, clock=time.monotonic_ns):
+        super().__init__(parent)
+        self.clock = clock
+        self.duration_ns = None     # 카운트다운 길이, 스톱워치면 None
+        self.accumulated_ns = 0     # 일시정지 전까지 쌓인 경과 시간
+        self.started_ns = None      # 마지막으로 시작한 시각, 멈춰 있으면 None
+        self.shown_seconds = 0      # 마지막 틱에서 표시한 초
+        self.coalesced_ticks = 0    # 밀려서 합쳐진 틱 수 (통계용)
+        self.ticks_suspended = False
+
+        self._tick_timer = QTimer(self)
+        self._tick_timer.setSingleShot(True)
+        self._tick_timer.setTimerType(Qt.PreciseTimer)
+        self._tick_timer.timeout.connect(self.on_timeout)
+
+    # --- 설정 ---
+    def set_countdown(self, ms):
+        self.stop_ticks()
+        self.duration_ns = ms * NS_PER_MS
+        self.accumulated_ns = 0
+        self.started_ns = None
+        self.shown_seconds = self.display_seconds()
+
+    def set_stopwatch(self):
+        self.set_countdown(0)
+        self.duration_ns = None
+        self.shown_seconds = 0
+
+    # --- 제어 ---
+    @property
+    def is_running(self):
+        return self.started_ns is not None
+
+    def start(self):
+        if self.is_running:
+            return
+        self.started_ns = self.clock()
+        self.schedule_next_tick()
+
+    def pause(self):
+        if not self.is_running:
+            return
+        self.accumulated_ns = self.elapsed_ns()
+        self.started_ns = None
+        self.stop_ticks()
+
+    def reset(self):
+        self.stop_ticks()
+        self.accumulated_ns = 0
+        self.started_ns = None
+        self.shown_seconds = self.display_seconds()
+
+    def stop_ticks(self):
+        self._tick_timer.stop()
+
+    def set_ticks_suspended(self, suspended):
+        if suspended == self.ticks_suspended:
+            return
+        self.ticks_suspended = suspended
+        if not self.is_running:
+            return
+        if suspended:
+            self.schedule_next_tick()
+        else:
+            # 멈춰 있던 동안의 변화를 한 번의 틱으로 반영하고 다시 매초 예약
+            self.on_timeout()
+
+    # --- 시간 계산 ---
+    def elapsed_ns(self):
+        if self.started_ns is None:
+            return self.accumulated_ns
+        elapsed = self.accumulated_ns + self.clock() - self.started_ns
+        if self.duration_ns is not None:
+            elapsed = min(elapsed, self.duration_ns)
+        return elapsed
+
+    def elapsed_ms(self):
+        return self.elapsed_ns() / NS_PER_MS
+
+    def remaining_ms(self):
+        if self.duration_ns is None:
+            return None
+        return (self.duration_ns - self.elapsed_ns()) / NS_PER_MS
+
+    def display_seconds(self):
+        """화면에 보일 초: 스톱워치는 내림, 카운트다운은 올림 (0이 되는 순간 끝)"""
+        if self.duration_ns is None:
+            return self.elapsed_ns() // NS_PER_SEC
+        remaining = self.duration_ns - self.elapsed_ns()
+        return -(-remaining // NS_PER_SEC)
+
+    def ns_until_next_tick(self):
+        """다음 초 경계까지 남은 나노초"""
+        elapsed = self.elapsed_ns()
+        if self.duration_ns is None:
+            return NS_PER_SEC - elapsed % NS_PER_SEC
+        remaining = self.duration_ns - elapsed
+        return remaining % NS_PER_SEC or NS_PER_SEC
+
+    def schedule_next_tick(self):
+        if self.ticks_suspended:
+            if self.duration_ns is None:
+                self._tick_timer.stop()
+                return
+            # 보이지 않는 동안에는 카운트다운이 끝나는 순간에만 깨어남
+            wait_ns = self.duration_ns - self.elapsed_ns()
+        else:
+            wait_ns = self.ns_until_next_tick()
+        # 올림으로 예약해서 경계 직전에 깨어나 아무것도 바뀌지 않는 일이 없도록 함
+        self._tick_timer.start(-(-wait_ns // NS_PER_MS))
+
+    def on_timeout(self):
+        if not self.is_running:
+            return
+        seconds = self.display_seconds()
+        if abs(seconds - self.shown_seconds) > 1:
+            self.coalesced_ticks += abs(seconds - self.shown_seconds) - 1
+        if seconds != self.shown_seconds:
+            self.shown_seconds = seconds
+            self.tick.emit()
+        if self.duration_ns is not None and self.elapsed_ns() >= self.duration_ns:
+            self.accumulated_ns = self.duration_ns
+            self.started_ns = None
+            self.finished.emit()
+            return
+        self.schedule_next_tick()
+
+
+class DeadlineScheduler(QObject):
+    """여러 카운트다운의 마감 시각을 최소 힙에 두고 QTimer 하나로 처리
+
+    타이머가 몇 개든 가장 이른 마감 시각 하나에만 단발 QTimer를 겁니다.
+    취소하거나 다시 예약한 항목은 힙에서 바로 빼지 않고 꺼낼 때 건너뛰며,
+    쌓인 항목이 많아지면 힙을 새로 만듭니다.
+    """
+    expired = pyqtSignal(list)  # 마감된 키 목록
+
+    def __init__(self, parent=None, clock=time.monotonic_ns):
+        super().__init__(parent)
+        self.clock = clock
+        self._heap = []             # (마감 시각, 순번, 키)
+        self._deadlines = {}        # 키 -> 유효한 마감 시각
+        self._order = itertools.count()
+        self._armed_ns = None       # QTimer가 겨누고 있는 마감 시각
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self.on_timeout)
+
+    def __len__(self):
+        return len(self._deadlines)
+
+    def deadline(self, key):
+        return self._deadlines.get(key)
+
+    def schedule(self, key, deadline_ns):
+        self._deadlines[key] = deadline_ns
+        heapq.heappush(self._heap, (deadline_ns, next(self._order), key))
+        if self._armed_ns is None or deadline_ns < self._armed_ns:
+            self._arm()
+
+    def cancel(self, key):
+        if self._deadlines.pop(key, None) is None:
+            return
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._heap = [entry for entry in self._heap if self._deadlines.get(entry[2]) == entry[0]]
+            heapq.heapify(self._heap)
+        if not self._deadlines:
+            self._heap.clear()
+            self._arm()
+
+    def _drop_stale(self):
+        heap = self._heap
+        while heap and self._deadlines.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def _arm(self):
+        self._drop_stale()
+        if not self._heap:
+            self._armed_ns = None
+            self._timer.stop()
+            return
+        self._armed_ns = self._heap[0][0]
+        wait_ms = -(-(self._armed_ns - self.clock()) // NS_PER_MS)
+        self._timer.start(max(0, wait_ms))
+
+    def on_timeout(self):
+        now = self.clock()
+        due = []
+        heap = self._heap
+        self._drop_stale()
+        while heap and heap[0][0] <= now:
+            deadline, _, key = heapq.heappop(heap)
+            if self._deadlines.get(key) == deadline:
+                del self._deadlines[key]
+                due.append(key)
+            self._drop_stale()
+        self._arm()
+        if due:
+            self.expired.emit(due)
+
+
+class VisibilityWatcher(QObject):
+    """창이 실제로 화면에 보이는지 지켜보다가 바뀔 때마다 알려줌
+
+    숨김/표시, 최소화, 그리고 플랫폼이 알려주는 노출(expose) 상태를
+    함께 봅니다. 다른 창에 완전히 가려진 경우는 노출 이벤트를 보내주는
+    플랫폼에서만 잡힙니다.
+    """
+    changed = pyqtSignal(bool)  # True면 보임
+
+    def __init__(self, widget):
+        super().__init__(widget)
+        self.widget = widget
+        self.window_handle = None
+        self.visible = False
+        widget.installEventFilter(self)
+
+    def is_visible(self):
+        handle = self.widget.windowHandle()
+        return (self.widget.isVisible() and not self.widget.isMinimized()
+                and (handle is None or handle.isExposed()))
+
+    def eventFilter(self, obj, event):
+        kind = event.type()
+        if obj is self.widget and kind == QEvent.Show and self.window_handle is None:
+            # 네이티브 창은 처음 보일 때 생기고, 노출 이벤트는 그쪽으로만 옴
+            self.window_handle = self.widget.windowHandle()
+            if self.window_handle is not None:
+                self.window_handle.installEventFilter(self)
+        if kind in (QEvent.Show, QEvent.Hide, QEvent.WindowStateChange, QEvent.Expose):
+            # 이벤트가 처리된 뒤의 상태를 봐야 하므로 한 바퀴 미룸
+            QTimer.singleShot(0, self.refresh)
+        return False
+
+    def refresh(self):
+        visible = self.is_visible()
+        if visible != self.visible:
+            self.visible = visible
+            self.changed.emit(visible)
@@ -0,0 +1,247 @@
+import csv
+import time
+import queue
+import sqlite3
+import threading
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    label TEXT NOT NULL,
+    day TEXT NOT NULL,           -- 시작한 날 (현지 시각 YYYY-MM-DD)
+    started_at REAL NOT NULL,    -- 유닉스 시각(초)
+    ended_at REAL NOT NULL,
+    seconds REAL NOT NULL        -- 일시정지를 뺀 실제 경과 시간
+);
+CREATE INDEX IF NOT EXISTS runs_day ON runs (day);
+CREATE INDEX IF NOT EXISTS runs_label_day ON runs (label, day);
+
+CREATE TABLE IF NOT EXISTS laps (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    number INTEGER NOT NULL,
+    at_seconds REAL NOT NULL,    -- 기록 시작부터 이 랩까지의 경과 시간
+    PRIMARY KEY (run_id, number)
+) WITHOUT ROWID;
+
+-- 날짜/라벨별 합계. 기록을 넣는 트랜잭션 안에서 함께 갱신되므로
+-- 합계를 보려고 기록 전체를 다시 읽을 일이 없음
+CREATE TABLE IF NOT EXISTS totals (
+    day TEXT NOT NULL,
+    label TEXT NOT NULL,
+    runs INTEGER NOT NULL,
+    laps INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (day, label)
+) WITHOUT ROWID;
+"""
+
+_ADD_TOTAL = """
+INSERT INTO totals (day, label, runs, laps, seconds) VALUES (?, ?, 1, ?, ?)
+ON CONFLICT (day, label) DO UPDATE SET
+    runs = runs + 1, laps = laps + excluded.laps, seconds = seconds + excluded.seconds
+"""
+
+EXPORT_COLUMNS = ['run_id', 'label', 'day', 'started_at', 'ended_at', 'seconds', 'lap', 'lap_at_seconds']
+
+
+def day_of(timestamp):
+    return time.strftime('%Y-%m-%d', time.localtime(timestamp))
+
+
+def connect(path):
+    conn = sqlite3.connect(path, isolation_level=None)
+    # WAL: 기록하는 동안에도 다른 연결에서 읽을 수 있음
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    if version != SCHEMA_VERSION:
+        conn.executescript(_SCHEMA)
+        conn.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+    return conn
+
+
+def _where(first_day, last_day, label):
+    clauses, params = [], []
+    if label is not None:
+        clauses.append('label = ?')
+        params.append(label)
+    if first_day is not None:
+        clauses.append('day >= ?')
+        params.append(first_day)
+    if last_day is not None:
+        clauses.append('day <= ?')
+        params.append(last_day)
+    return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+
+def total_seconds(conn, first_day=None, last_day=None, label=None):
+    """기간/라벨의 합계 시간(초). totals 표만 읽으므로 기록이 몇 년 치여도 빠름"""
+    where, params = _where(first_day, last_day, label)
+    return conn.execute('SELECT COALESCE(SUM(seconds), 0) FROM totals' + where, params).fetchone()[0]
+
+
+def iter_runs(conn, first_day=None, last_day=None, label=None):
+    """기록과 랩을 한 줄씩 돌려주는 제너레이터 (EXPORT_COLUMNS 순서)
+
+    랩이 없는 기록은 lap 칸이 None인 한 줄이 됩니다. 커서를 그대로 넘겨서
+    결과 전체를 메모리에 올리지 않습니다.
+    """
+    where, params = _where(first_day, last_day, label)
+    query = ('SELECT runs.id, label, day, started_at, ended_at, seconds, laps.number, laps.at_seconds '
+             'FROM runs LEFT JOIN laps ON laps.run_id = runs.id' + where +
+             ' ORDER BY day, runs.id, laps.number')
+    yield from conn.execute(query, params)
+
+
+def export_csv(conn, out_path, first_day=None, last_day=None, label=None):
+    """조건에 맞는 기록을 CSV로 흘려 쓰고 쓴 줄 수를 돌려줌"""
+    rows = 0
+    run = None
+    with open(out_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_COLUMNS)
+        for run_id, label_, day, started_at, ended_at, seconds, lap, lap_at in iter_runs(conn, first_day, last_day, label):
+            if run is None or run[0] != run_id:
+                # 랩마다 같은 기록이 되풀이되므로 기록 칸은 한 번만 만듦
+                run = [run_id, label_, day, time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(started_at)),
+                       time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(ended_at)), f'{seconds:.3f}']
+            writer.writerow(run + ([lap, f'{lap_at:.3f}'] if lap is not None else ['', '']))
+            rows += 1
+    return rows
+
+
+class HistoryWriter(threading.Thread):
+    """큐에 쌓인 기록을 모아 트랜잭션 하나로 쓰는 스레드 (GUI 스레드 밖)
+
+    첫 항목이 들어오면 `batch_seconds` 동안 더 기다렸다가 모인 것을 한꺼번에
+    씁니다. 내보내기 요청도 같은 큐로 들어오므로 그보다 먼저 넣은 기록은
+    빠짐없이 내보내집니다.
+    """
+
+    def __init__(self, path, history, batch_seconds=0.2, max_batch=1000):
+        super().__init__(daemon=True)
+        self.path = path
+        self.history = history
+        self.batch_seconds = batch_seconds
+        self.max_batch = max_batch
+        self.queue = queue.Queue()
+
+    def run(self):
+        conn = connect(self.path)
+        stop = False
+        while not stop:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.batch_seconds
+            while batch[-1] is not None and not isinstance(batch[-1], tuple) and len(batch) < self.max_batch:
+                try:
+                    batch.append(self.queue.get(timeout=max(0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            # 기록, 그다음 내보내기나 종료 요청 하나 순서로 처리
+            runs = [item for item in batch if isinstance(item, dict)]
+            if runs:
+                self._write(conn, runs)
+            if batch[-1] is None:
+                stop = True
+            elif isinstance(batch[-1], tuple):
+                self._export(conn, *batch[-1])
+        conn.close()
+
+    def _write(self, conn, runs):
+        try:
+            conn.execute('BEGIN')
+            for run in runs:
+                run_id = conn.execute(
+                    'INSERT INTO runs (label, day, started_at, ended_at, seconds) VALUES (?, ?, ?, ?, ?)',
+                    (run['label'], run['day'], run['started_at'], run['ended_at'], run['seconds'])).lastrowid
+                conn.executemany('INSERT INTO laps (run_id, number, at_seconds) VALUES (?, ?, ?)',
+                                 [(run_id, number, at) for number, at in enumerate(run['laps'], 1)])
+                conn.execute(_ADD_TOTAL, (run['day'], run['label'], len(run['laps']), run['seconds']))
+            conn.execute('COMMIT')
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            # 메모리 합계에는 이미 더해져 있으므로 GUI 스레드에서 되돌림
+            self.history.write_failed.emit(runs, f"기록을 저장하지 못했습니다: {e}")
+
+    def _export(self, conn, out_path, first_day, last_day, label):
+        try:
+            rows = export_csv(conn, out_path, first_day, last_day, label)
+        except (OSError, sqlite3.Error) as e:
+            self.history.failed.emit(f"내보내지 못했습니다: {e}")
+            return
+        self.history.exported.emit(out_path, rows)
+
+
+class TimerHistory(QObject):
+    """타이머 기록 저장소: 기록과 랩을 SQLite에 쌓고 오늘 합계를 메모리에 유지
+
+    record()는 큐에 넣기만 하고 바로 돌아오며, 쓰기는 HistoryWriter가
+    모아서 합니다. 오늘 합계는 열 때 totals 표에서 한 번 읽고 그 뒤로는
+    기록할 때마다 더하기만 하므로, 매초 갱신해도 DB를 건드리지 않습니다.
+    쓰기가 실패하면 그 묶음만큼 합계에서 다시 빼고 failed를 보내므로
+    화면의 합계가 DB와 어긋난 채로 남지 않습니다. 기록은 시작한 날짜로
+    묶입니다.
+    """
+    exported = pyqtSignal(str, int)   # CSV 경로, 쓴 줄 수
+    failed = pyqtSignal(str)          # 사용자에게 보여줄 오류 메시지
+    write_failed = pyqtSignal(list, str)  # 쓰기 스레드 -> GUI 스레드: 저장 못 한 기록들, 오류 메시지
+
+    def __init__(self, path, parent=None, batch_seconds=0.2):
+        super().__init__(parent)
+        self.path = path
+        self.today = None
+        self._today_totals = {}
+        self._roll_day()
+        # 쓰기 스레드에서 보내므로 이 객체의 스레드(GUI)에서 차례로 처리됨
+        self.write_failed.connect(self._on_write_failed)
+        self._writer = HistoryWriter(path, self, batch_seconds)
+        self._writer.start()
+
+    def record(self, label, started_at, seconds, laps=(), ended_at=None):
+        """끝난 기록 하나를 저장. laps는 시작부터 각 랩까지의 경과 시간(초)"""
+        day = day_of(started_at)
+        self._roll_day()
+        if day == self.today:
+            self._today_totals[label] = self._today_totals.get(label, 0) + seconds
+        self._writer.queue.put({'label': label, 'day': day, 'started_at': started_at,
+                                'ended_at': time.time() if ended_at is None else ended_at,
+                                'seconds': seconds, 'laps': list(laps)})
+
+    def _on_write_failed(self, runs, message):
+        for run in runs:
+            # 자정을 넘겨 다시 읽은 합계에는 애초에 들어 있지 않음
+            if run['day'] == self.today and run['label'] in self._today_totals:
+                self._today_totals[run['label']] -= run['seconds']
+        self.failed.emit(message)
+
+    def today_seconds(self, label=None):
+        self._roll_day()
+        if label is not None:
+            return self._today_totals.get(label, 0)
+        return sum(self._today_totals.values())
+
+    def _roll_day(self):
+        today = day_of(time.time())
+        if today != self.today:
+            # 처음 열 때와 자정을 넘겼을 때만 DB에서 읽음
+            self.today = today
+            conn = connect(self.path)
+            try:
+                self._today_totals = dict(conn.execute('SELECT label, seconds FROM totals WHERE day = ?', (today,)))
+            finally:
+                conn.close()
+
+    def export_csv(self, out_path, first_day=None, last_day=None, label=None):
+        """백그라운드에서 CSV로 내보냄. 끝나면 exported, 실패하면 failed"""
+        self._writer.queue.put((out_path, first_day, last_day, label))
+
+    def close(self):
+        """남은 기록을 모두 쓰고 쓰기 스레드를 끝냄"""
+        if self._writer.is_alive():
+            self._writer.queue.put(None)
+            self._writer.join()
@@ -0,0 +1,111 @@
+from PyQt5.QtWidgets import QApplication
+
+# 테마별 색. 스타일시트 틀(_TEMPLATE)에 채워 넣음
+THEMES = {
+    'light': {
+        'background': '#fff',
+        'text': '#000',
+        'date': '#888',
+        'total': '#aaa',
+        'input': '#fff',
+        'input_border': '#ccc',
+        'start': '#4CAF50',
+        'start_hover': '#45a049',
+        'running': '#ff9800',
+        'running_hover': '#f08c00',
+        'lap': '#607d8b',
+        'lap_hover': '#546e7a',
+        'reset': '#f44336',
+        'reset_hover': '#da190b',
+    },
+    'dark': {
+        'background': '#1e1e1e',
+        'text': '#eee',
+        'date': '#999',
+        'total': '#777',
+        'input': '#2b2b2b',
+        'input_border': '#444',
+        'start': '#388e3c',
+        'start_hover': '#2e7d32',
+        'running': '#ef6c00',
+        'running_hover': '#e65100',
+        'lap': '#455a64',
+        'lap_hover': '#37474f',
+        'reset': '#d32f2f',
+        'reset_hover': '#c62828',
+    },
+}
+DEFAULT_THEME = 'light'
+
+# ModernTimer 안의 위젯만 고름. 버튼 색은 role/running 동적 속성으로 정해지므로
+# 상태가 바뀌어도 스타일시트 문자열은 그대로임
+_TEMPLATE = """
+ModernTimer { background-color: %(background)s; }
+ModernTimer QLabel#time { color: %(text)s; }
+ModernTimer QLabel#date { color: %(date)s; }
+ModernTimer QLabel#total { color: %(total)s; }
+ModernTimer QLineEdit {
+    background-color: %(input)s;
+    color: %(text)s;
+    border: 1px solid %(input_border)s;
+    border-radius: 3px;
+    padding: 3px;
+}
+ModernTimer QPushButton {
+    color: white;
+    font-size: 16px;
+    border-radius: 5px;
+    padding: 10px;
+}
+ModernTimer QPushButton[role="start"] { background-color: %(start)s; }
+ModernTimer QPushButton[role="start"]:hover { background-color: %(start_hover)s; }
+ModernTimer QPushButton[role="start"][running="true"] { background-color: %(running)s; }
+ModernTimer QPushButton[role="start"][running="true"]:hover { background-color: %(running_hover)s; }
+ModernTimer QPushButton[role="lap"] { background-color: %(lap)s; }
+ModernTimer QPushButton[role="lap"]:hover { background-color: %(lap_hover)s; }
+ModernTimer QPushButton[role="reset"] { background-color: %(reset)s; }
+ModernTimer QPushButton[role="reset"]:hover { background-color: %(reset_hover)s; }
+"""
+
+_compiled = {}      # 테마 이름 -> 완성된 스타일시트
+_applied = None     # 지금 애플리케이션에 걸린 테마 이름
+
+
+def stylesheet(name):
+    """테마의 스타일시트. 테마마다 한 번만 만들어 둠"""
+    if name not in _compiled:
+        _compiled[name] = _TEMPLATE % THEMES[name]
+    return _compiled[name]
+
+
+def apply_theme(name, app=None):
+    """애플리케이션 전체에 테마를 검
+
+    스타일시트는 QApplication에 한 번만 걸리므로 타이머 창이 몇 개든 한 번만
+    해석됩니다. 이미 걸린 테마면 아무것도 하지 않습니다.
+    """
+    global _applied
+    app = app or QApplication.instance()
+    if name == _applied and app.styleSheet() == _compiled.get(name):
+        return
+    app.setStyleSheet(stylesheet(name))
+    _applied = name
+
+
+def current_theme():
+    return _applied or DEFAULT_THEME
+
+
+def set_state(widget, name, value):
+    """동적 속성을 바꾸고 그 위젯만 다시 polish
+
+    스타일시트의 [name="value"] 선택자는 속성이 바뀌어도 저절로 다시
+    평가되지 않으므로 unpolish/polish가 필요합니다. 값이 같으면 건너뜁니다.
+    """
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()